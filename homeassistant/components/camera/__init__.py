@@ -8,6 +8,7 @@ import hashlib
 import logging
 import os
 from random import SystemRandom
+from time import monotonic
 
 from aiohttp import web
 import async_timeout
@@ -54,6 +55,7 @@ from .const import (
     DOMAIN,
     SERVICE_RECORD,
 )
+from .img_util import scale_jpeg_camera_image
 from .prefs import CameraPreferences
 
 # mypy: allow-untyped-calls, allow-untyped-defs
@@ -88,6 +90,21 @@ _RND = SystemRandom()
 
 MIN_STREAM_INTERVAL = 0.5  # seconds
 
+# Number of resized images kept per camera for the current snapshot
+MAX_SCALED_IMAGES = 8
+
+ATTR_WIDTH = "width"
+ATTR_HEIGHT = "height"
+ATTR_QUALITY = "quality"
+
+IMAGE_SIZE_SCHEMA = {
+    vol.Optional(ATTR_WIDTH): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional(ATTR_HEIGHT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional(ATTR_QUALITY): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+}
+
+IMAGE_QUERY_SCHEMA = vol.Schema(IMAGE_SIZE_SCHEMA, extra=vol.ALLOW_EXTRA)
+
 CAMERA_SERVICE_SCHEMA = vol.Schema({vol.Optional(ATTR_ENTITY_ID): cv.comp_entity_ids})
 
 CAMERA_SERVICE_SNAPSHOT = CAMERA_SERVICE_SCHEMA.extend(
@@ -114,6 +131,7 @@ SCHEMA_WS_CAMERA_THUMBNAIL = websocket_api.BASE_COMMAND_MESSAGE_SCHEMA.extend(
     {
         vol.Required("type"): WS_TYPE_CAMERA_THUMBNAIL,
         vol.Required("entity_id"): cv.entity_id,
+        **IMAGE_SIZE_SCHEMA,
     }
 )
 
@@ -134,13 +152,18 @@ async def async_request_stream(hass, entity_id, fmt):
 
 
 @bind_hass
-async def async_get_image(hass, entity_id, timeout=10):
-    """Fetch an image from a camera entity."""
+async def async_get_image(
+    hass, entity_id, timeout=10, width=None, height=None, quality=None
+):
+    """Fetch an image from a camera entity.
+
+    A JPEG image is scaled down, but not below the requested width and height.
+    """
     camera = _get_camera_from_entity_id(hass, entity_id)
 
     with suppress(asyncio.CancelledError, asyncio.TimeoutError):
         async with async_timeout.timeout(timeout):
-            image = await camera.async_camera_image()
+            image = await camera.async_camera_snapshot(width, height, quality)
 
             if image:
                 return Image(camera.content_type, image)
@@ -254,6 +277,7 @@ async def async_setup(hass, config):
             stream = await camera.create_stream()
             if not stream:
                 continue
+            stream.keepalive = True
             stream.add_provider("hls")
             stream.start()
 
@@ -315,6 +339,11 @@ class Camera(Entity):
         self.stream_options = {}
         self.content_type = DEFAULT_CONTENT_TYPE
         self.access_tokens: collections.deque = collections.deque([], 2)
+        self._snapshot = None
+        self._snapshot_time = 0.0
+        self._snapshot_task = None
+        self._scaled_source = None
+        self._scaled_images = {}
         self.async_update_token()
 
     @property
@@ -380,6 +409,77 @@ class Camera(Entity):
         """Return bytes of camera image."""
         return await self.hass.async_add_executor_job(self.camera_image)
 
+    async def async_camera_snapshot(self, width=None, height=None, quality=None):
+        """Return bytes of camera image shared between requests.
+
+        Concurrent requests share a single fetch, and the image is reused
+        for the snapshot_max_age camera preference. A JPEG image is resized
+        when a width, height or quality is requested.
+        """
+        image = await self._async_get_snapshot()
+
+        if (
+            not image
+            or self.content_type != DEFAULT_CONTENT_TYPE
+            or (width is None and height is None and quality is None)
+        ):
+            return image
+
+        return await self._async_scale_snapshot(image, (width, height, quality))
+
+    async def _async_get_snapshot(self):
+        """Return the current snapshot or fetch a new one."""
+        if self._snapshot is not None:
+            prefs = self.hass.data[DATA_CAMERA_PREFS].get(self.entity_id)
+            if monotonic() - self._snapshot_time < prefs.snapshot_max_age:
+                return self._snapshot
+
+        if self._snapshot_task is None:
+            self._snapshot_task = self.hass.async_create_task(
+                self._async_fetch_snapshot()
+            )
+
+        # A request that times out must not cancel the fetch of the others
+        return await asyncio.shield(self._snapshot_task)
+
+    async def _async_fetch_snapshot(self):
+        """Fetch an image from the running stream or the camera."""
+        try:
+            image = None
+            if self.stream is not None and self.content_type == DEFAULT_CONTENT_TYPE:
+                image = await self.stream.async_get_image()
+            if not image:
+                async with async_timeout.timeout(CAMERA_IMAGE_TIMEOUT):
+                    image = await self.async_camera_image()
+        finally:
+            self._snapshot_task = None
+
+        if image:
+            self._snapshot = image
+            self._snapshot_time = monotonic()
+        return image
+
+    async def _async_scale_snapshot(self, image, size):
+        """Return a resized snapshot, cached until the source image changes."""
+        if image != self._scaled_source:
+            self._scaled_source = image
+            self._scaled_images = {}
+
+        scaled = self._scaled_images.get(size)
+        if scaled is not None:
+            return scaled
+
+        scaled = await self.hass.async_add_executor_job(
+            scale_jpeg_camera_image, Image(self.content_type, image), *size
+        )
+
+        # The source image may have been replaced while resizing
+        if image == self._scaled_source:
+            if len(self._scaled_images) >= MAX_SCALED_IMAGES:
+                self._scaled_images.clear()
+            self._scaled_images[size] = scaled
+        return scaled
+
     async def handle_async_still_stream(self, request, interval):
         """Generate an HTTP MJPEG stream from camera images."""
         return await async_get_still_stream(
@@ -506,10 +606,17 @@ class CameraImageView(CameraView):
     name = "api:camera:image"
 
     async def handle(self, request: web.Request, camera: Camera) -> web.Response:
-        """Serve camera image."""
+        """Serve camera image, optionally resized."""
+        try:
+            size = IMAGE_QUERY_SCHEMA(dict(request.query))
+        except vol.Invalid as err:
+            raise web.HTTPBadRequest() from err
+
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             async with async_timeout.timeout(CAMERA_IMAGE_TIMEOUT):
-                image = await camera.async_camera_image()
+                image = await camera.async_camera_snapshot(
+                    size.get(ATTR_WIDTH), size.get(ATTR_HEIGHT), size.get(ATTR_QUALITY)
+                )
 
             if image:
                 return web.Response(body=image, content_type=camera.content_type)
@@ -547,7 +654,13 @@ async def websocket_camera_thumbnail(hass, connection, msg):
     """
     _LOGGER.warning("The websocket command 'camera_thumbnail' has been deprecated")
     try:
-        image = await async_get_image(hass, msg["entity_id"])
+        image = await async_get_image(
+            hass,
+            msg["entity_id"],
+            width=msg.get(ATTR_WIDTH),
+            height=msg.get(ATTR_HEIGHT),
+            quality=msg.get(ATTR_QUALITY),
+        )
         await connection.send_big_result(
             msg["id"],
             {
@@ -607,6 +720,7 @@ async def websocket_get_prefs(hass, connection, msg):
         vol.Required("type"): "camera/update_prefs",
         vol.Required("entity_id"): cv.entity_id,
         vol.Optional("preload_stream"): bool,
+        vol.Optional("snapshot_max_age"): vol.All(vol.Coerce(float), vol.Range(min=0)),
     }
 )
 async def websocket_update_prefs(hass, connection, msg):
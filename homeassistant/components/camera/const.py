@@ -4,6 +4,7 @@ DOMAIN = "camera"
 DATA_CAMERA_PREFS = "camera_prefs"
 
 PREF_PRELOAD_STREAM = "preload_stream"
+PREF_SNAPSHOT_MAX_AGE = "snapshot_max_age"
 
 SERVICE_RECORD = "record"
 
@@ -1,35 +1,47 @@
-"""Image processing for HomeKit component."""
+"""Image processing for cameras."""
 
 import logging
 
 SUPPORTED_SCALING_FACTORS = [(7, 8), (3, 4), (5, 8), (1, 2), (3, 8), (1, 4), (1, 8)]
 
+DEFAULT_QUALITY = 75
+
 _LOGGER = logging.getLogger(__name__)
 
 
-def scale_jpeg_camera_image(cam_image, width, height):
-    """Scale a camera image as close as possible to one of the supported scaling factors."""
+def scale_jpeg_camera_image(cam_image, width=None, height=None, quality=None):
+    """Scale a camera image as close as possible to one of the supported scaling factors.
+
+    The image is never scaled below the requested width and height. When
+    only a quality is requested, the image is re-encoded at its full size.
+    """
     turbo_jpeg = TurboJPEGSingleton.instance()
     if not turbo_jpeg:
         return cam_image.content
 
     (current_width, current_height, _, _) = turbo_jpeg.decode_header(cam_image.content)
 
-    if current_width <= width or current_height <= height:
-        return cam_image.content
-
-    ratio = width / current_width
-
-    scaling_factor = SUPPORTED_SCALING_FACTORS[-1]
-    for supported_sf in SUPPORTED_SCALING_FACTORS:
-        if ratio >= (supported_sf[0] / supported_sf[1]):
+    ratios = []
+    if width:
+        ratios.append(width / current_width)
+    if height:
+        ratios.append(height / current_height)
+    ratio = max(ratios, default=1)
+
+    # Keep the full size when no supported factor is large enough
+    scaling_factor = (1, 1)
+    for supported_sf in reversed(SUPPORTED_SCALING_FACTORS):
+        if ratio <= (supported_sf[0] / supported_sf[1]):
             scaling_factor = supported_sf
             break
 
+    if scaling_factor == (1, 1) and quality is None:
+        return cam_image.content
+
     return turbo_jpeg.scale_with_quality(
         cam_image.content,
         scaling_factor=scaling_factor,
-        quality=75,
+        quality=DEFAULT_QUALITY if quality is None else quality,
     )
 
 
@@ -63,6 +75,6 @@ class TurboJPEGSingleton:
             TurboJPEGSingleton.__instance = TurboJPEG()
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception(
-                "libturbojpeg is not installed, cameras may impact HomeKit performance"
+                "libturbojpeg is not installed, camera images will not be resized"
             )
             TurboJPEGSingleton.__instance = False
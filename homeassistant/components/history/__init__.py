@@ -1,9 +1,11 @@
 """Provide pre-made queries on top of the recorder component."""
+import asyncio
 from collections import defaultdict
 from datetime import datetime as dt, timedelta
 from itertools import groupby
 import json
 import logging
+import threading
 import time
 from typing import Iterable, Optional, cast
 
@@ -15,16 +17,23 @@ import voluptuous as vol
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
+    StateAttributes,
     States,
+    decode_shared_attrs,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
+from homeassistant.components.recorder.statistics import (
+    STATISTIC_PERIODS,
+    statistics_during_period,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     CONF_DOMAINS,
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     HTTP_BAD_REQUEST,
 )
 from homeassistant.core import Context, State, split_entity_id
@@ -33,6 +42,7 @@ from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
 )
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.helpers.typing import HomeAssistantType
 import homeassistant.util.dt as dt_util
 
@@ -80,12 +90,26 @@ QUERY_STATES = [
     States.entity_id,
     States.state,
     States.attributes,
+    StateAttributes.shared_attrs,
+    StateAttributes.hash.label("attributes_hash"),
     States.last_changed,
     States.last_updated,
 ]
 
 HISTORY_BAKERY = "history_bakery"
 
+# Rows fetched from the database at a time when streaming
+STREAM_BATCH_SIZE = 1000
+# Encoded entities waiting to be written to the client when streaming
+STREAM_QUEUE_SIZE = 16
+
+
+def _query_states(session):
+    """Query states joined with their shared attributes."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
+
 
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
@@ -113,10 +137,46 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+    states = execute(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
     )
 
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return the query for the significant states sorted by entity_id."""
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
+
     if significant_changes_only:
         baked_query += lambda q: q.filter(
             (
@@ -142,34 +202,15 @@ def _get_significant_states(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
-    )
-
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
-
-    return _sorted_states_to_json(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
+    return baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
     )
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -182,7 +223,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -203,13 +246,13 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -270,7 +313,7 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = _query_states(session)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -318,9 +361,7 @@ def _get_states_with_session(
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -377,51 +418,92 @@ def _sorted_states_to_json(
         elapsed = time.perf_counter() - timer_start
         _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
 
+    # Append all changes to it
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        _append_entity_states(result[ent_id], ent_id, group, minimal_response)
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _append_entity_states(ent_results, ent_id, group, minimal_response):
+    """Append the states of one entity sorted by last_updated to ent_results."""
     # Called in a tight loop so cache the function
     # here
     _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
 
-    # Append all changes to it
-    for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state) for db_state in group)
-
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(LazyState(next(group)))
-
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
-
-        for db_state in group:
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
-
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
-                    ),
-                }
-            )
-            prev_state = db_state
+    domain = split_entity_id(ent_id)[0]
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+        ent_results.extend(LazyState(db_state) for db_state in group)
+
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    if not ent_results:
+        ent_results.append(LazyState(next(group)))
+
+    prev_state = ent_results[-1]
+    initial_state_count = len(ent_results)
+
+    for db_state in group:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
+
+        ent_results.append(
+            {
+                STATE_KEY: db_state.state,
+                LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
+                    db_state.last_changed
+                ),
+            }
+        )
+        prev_state = db_state
 
-        if prev_state and len(ent_results) != initial_state_count:
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = LazyState(prev_state)
+    if prev_state and len(ent_results) != initial_state_count:
+        # There was at least one state change
+        # replace the last minimal state with
+        # a full state
+        ent_results[-1] = LazyState(prev_state)
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+
+def _stream_sorted_states_to_json(
+    hass,
+    session,
+    states,
+    start_time,
+    entity_ids,
+    filters=None,
+    include_start_time_state=True,
+    minimal_response=False,
+):
+    """Yield the JSON friendly list of states of one entity at a time.
+
+    This is the streaming counterpart of _sorted_states_to_json which only
+    holds the states of a single entity in memory. Entities with changes
+    are yielded in the order of states, followed by the entities that
+    only have a state at start_time.
+    """
+    start_states = {}
+    if include_start_time_state:
+        run = recorder.run_information_from_instance(hass, start_time)
+        for state in _get_states_with_session(
+            hass, session, start_time, entity_ids, run=run, filters=filters
+        ):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_states[state.entity_id] = state
+
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        start_state = start_states.pop(ent_id, None)
+        ent_results = [] if start_state is None else [start_state]
+        _append_entity_states(ent_results, ent_id, group, minimal_response)
+        yield ent_results
+
+    for start_state in start_states.values():
+        yield [start_state]
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -462,7 +544,7 @@ class HistoryPeriodView(HomeAssistantView):
 
     async def get(
         self, request: web.Request, datetime: Optional[str] = None
-    ) -> web.Response:
+    ) -> web.StreamResponse:
         """Return history over a period of time."""
         datetime_ = None
         if datetime:
@@ -504,6 +586,22 @@ class HistoryPeriodView(HomeAssistantView):
 
         hass = request.app["hass"]
 
+        statistics_period = request.query.get("statistics")
+        if statistics_period is not None:
+            if statistics_period not in STATISTIC_PERIODS:
+                return self.json_message("Invalid statistics", HTTP_BAD_REQUEST)
+            return cast(
+                web.Response,
+                await hass.async_add_executor_job(
+                    self._statistics_json,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    statistics_period,
+                ),
+            )
+
         if (
             not include_start_time_state
             and entity_ids
@@ -511,6 +609,19 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
+        # Reordering by the include order needs the whole result
+        if "stream" in request.query and not (self.filters and self.use_include_order):
+            return await self._async_stream_significant_states_json(
+                request,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -525,6 +636,108 @@ class HistoryPeriodView(HomeAssistantView):
             ),
         )
 
+    def _statistics_json(self, hass, start_time, end_time, entity_ids, period):
+        """Fetch statistics rollups from the database as json."""
+        result = statistics_during_period(
+            hass, start_time, end_time, entity_ids, period
+        )
+        return self.json(list(result.values()))
+
+    async def _async_stream_significant_states_json(
+        self, request, hass, *args
+    ) -> web.StreamResponse:
+        """Stream significant states from the database as json.
+
+        The states are encoded one entity at a time in the executor and
+        handed over through a bounded queue, so memory use does not grow
+        with the length of the period.
+        """
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        cancel = threading.Event()
+
+        def put_chunk(chunk):
+            """Wait for room in the queue and add a chunk to it."""
+            asyncio.run_coroutine_threadsafe(chunks.put(chunk), hass.loop).result()
+
+        producer = hass.async_add_executor_job(
+            self._stream_significant_states_json, hass, put_chunk, cancel, *args
+        )
+
+        response = web.StreamResponse()
+        response.content_type = CONTENT_TYPE_JSON
+        response.enable_compression()
+        try:
+            await response.prepare(request)
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+                await response.write(chunk)
+        finally:
+            # Unblock the producer if the client went away
+            cancel.set()
+            while not chunks.empty():
+                chunks.get_nowait()
+            await producer
+
+        await response.write_eof()
+        return response
+
+    def _stream_significant_states_json(
+        self,
+        hass,
+        put_chunk,
+        cancel,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+    ):
+        """Fetch significant states from the database as json chunks."""
+        timer_start = time.perf_counter()
+        state_count = 0
+
+        try:
+            with session_scope(hass=hass) as session:
+                states = _significant_states_query(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    self.filters,
+                    significant_changes_only,
+                ).with_post_criteria(lambda q: q.yield_per(STREAM_BATCH_SIZE))
+
+                separator = "["
+                for ent_results in _stream_sorted_states_to_json(
+                    hass,
+                    session,
+                    states,
+                    start_time,
+                    entity_ids,
+                    self.filters,
+                    include_start_time_state,
+                    minimal_response,
+                ):
+                    if cancel.is_set():
+                        return
+                    encoded = json.dumps(ent_results, cls=JSONEncoder, allow_nan=False)
+                    put_chunk(f"{separator}{encoded}".encode("UTF-8"))
+                    separator = ","
+                    state_count += len(ent_results)
+
+                put_chunk(b"[]" if separator == "[" else b"]")
+        finally:
+            if not cancel.is_set():
+                put_chunk(None)
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Streamed %d states in %fs", state_count, elapsed)
+
     def _sorted_significant_states_json(
         self,
         hass,
@@ -710,7 +923,12 @@ class LazyState(State):
         """State attributes."""
         if not self._attributes:
             try:
-                self._attributes = json.loads(self._row.attributes)
+                if self._row.shared_attrs is not None:
+                    self._attributes = decode_shared_attrs(
+                        self._row.attributes_hash, self._row.shared_attrs
+                    )
+                else:
+                    self._attributes = json.loads(self._row.attributes)
             except ValueError:
                 # When json.loads fails
                 _LOGGER.exception("Error converting row to state: %s", self)
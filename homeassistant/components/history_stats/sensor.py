@@ -1,4 +1,5 @@
 """Component to make instant statistics about your history."""
+from collections import deque
 import datetime
 import logging
 import math
@@ -122,6 +123,11 @@ class HistoryStatsSensor(Entity):
         self.value = None
         self.count = None
 
+        # Loaded from the database once and then kept up to date
+        # with the state changes recorded by the event listener
+        self._tracker = None
+        self._changes = deque()
+
     async def async_added_to_hass(self):
         """Create listeners when the entity is added."""
 
@@ -134,10 +140,25 @@ class HistoryStatsSensor(Entity):
                 """Force the component to refresh."""
                 self.async_schedule_update_ha_state(True)
 
+            @callback
+            def record_change(event):
+                """Record the state change and refresh."""
+                new_state = event.data.get("new_state")
+                if new_state is None:
+                    self._changes.append((event.time_fired.timestamp(), False))
+                else:
+                    self._changes.append(
+                        (
+                            new_state.last_changed.timestamp(),
+                            new_state.state in self._entity_states,
+                        )
+                    )
+                force_refresh()
+
             force_refresh()
             self.async_on_remove(
                 async_track_state_change_event(
-                    self.hass, [self._entity_id], force_refresh
+                    self.hass, [self._entity_id], record_change
                 )
             )
 
@@ -191,6 +212,7 @@ class HistoryStatsSensor(Entity):
         """Get the latest data and updates the states."""
         # Get previous values of start and end
         p_start, p_end = self._period
+        now = datetime.datetime.now()
 
         # Parse templates
         self.update_period()
@@ -201,7 +223,6 @@ class HistoryStatsSensor(Entity):
         end = dt_util.as_utc(end)
         p_start = dt_util.as_utc(p_start)
         p_end = dt_util.as_utc(p_end)
-        now = datetime.datetime.now()
 
         # Compute integer timestamps
         start_timestamp = math.floor(dt_util.as_timestamp(start))
@@ -215,48 +236,63 @@ class HistoryStatsSensor(Entity):
             start_timestamp == p_start_timestamp
             and end_timestamp == p_end_timestamp
             and end_timestamp <= now_timestamp
+            and (self._tracker is None or not self._changes)
         ):
             # Don't compute anything as the value cannot have changed
+            self._changes.clear()
+            return
+
+        if end_timestamp < now_timestamp:
+            # The period is over, so state changes from now on don't matter
+            self._tracker = None
+            self._changes.clear()
+            tracker = self._load_tracker(start, end, start_timestamp)
+        else:
+            tracker = self._tracker
+            if tracker is None or start_timestamp < tracker.start:
+                # Only a start moving back needs history we don't have
+                tracker = self._tracker = self._load_tracker(
+                    start, end, start_timestamp
+                )
+
+            # Queued changes can be in the loaded history already, the ones
+            # that were not committed to the database yet are added here
+            while self._changes:
+                timestamp, matches = self._changes.popleft()
+                if timestamp > tracker.last_change:
+                    tracker.add_change(timestamp, matches)
+
+            tracker.move_start(start_timestamp)
+
+        if not tracker.has_changes:
             return
 
+        # Save value in hours
+        self.value = tracker.elapsed(min(end_timestamp, now_timestamp)) / 3600
+
+        # Save counter
+        self.count = tracker.count
+
+    def _load_tracker(self, start, end, start_timestamp):
+        """Load the state changes between start and end from history."""
         # Get history between start and end
         history_list = history.state_changes_during_period(
             self.hass, start, end, str(self._entity_id)
         )
 
-        if self._entity_id not in history_list:
-            return
-
         # Get the first state
-        last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = last_state is not None and last_state in self._entity_states
-        last_time = start_timestamp
-        elapsed = 0
-        count = 0
-
-        # Make calculations
-        for item in history_list.get(self._entity_id):
-            current_state = item.state in self._entity_states
-            current_time = item.last_changed.timestamp()
-
-            if last_state:
-                elapsed += current_time - last_time
-            if current_state and not last_state:
-                count += 1
-
-            last_state = current_state
-            last_time = current_time
-
-        # Count time elapsed between last history state and end of measure
-        if last_state:
-            measure_end = min(end_timestamp, now_timestamp)
-            elapsed += measure_end - last_time
+        first_state = history.get_state(self.hass, start, self._entity_id)
+        tracker = HistoryStatsTracker(
+            start_timestamp,
+            first_state is not None and first_state.state in self._entity_states,
+        )
 
-        # Save value in hours
-        self.value = elapsed / 3600
+        for item in history_list.get(self._entity_id, []):
+            tracker.add_change(
+                item.last_changed.timestamp(), item.state in self._entity_states
+            )
 
-        # Save counter
-        self.count = count
+        return tracker
 
     def update_period(self):
         """Parse the templates and store a datetime tuple in _period."""
@@ -319,6 +355,70 @@ class HistoryStatsSensor(Entity):
         self._period = start, end
 
 
+class HistoryStatsTracker:
+    """Keep a running on time and count of the matching states of an entity.
+
+    The changes are kept from start on, so start can move forward
+    without going back to the database.
+    """
+
+    def __init__(self, start, matches):
+        """Initialize the tracker with the state at start."""
+        self.changes = deque([(start, matches)])
+        # Time spent matching between the first and the last change
+        self.on_time = 0
+        self.count = 0
+
+    @property
+    def start(self):
+        """Return the timestamp the changes are kept from."""
+        return self.changes[0][0]
+
+    @property
+    def last_change(self):
+        """Return the timestamp of the last change."""
+        return self.changes[-1][0]
+
+    @property
+    def has_changes(self):
+        """Return if the state changed after start."""
+        return len(self.changes) > 1
+
+    def add_change(self, timestamp, matches):
+        """Add a state change after the last one."""
+        last_time, last_matches = self.changes[-1]
+        if last_matches:
+            self.on_time += timestamp - last_time
+        if matches and not last_matches:
+            self.count += 1
+        self.changes.append((timestamp, matches))
+
+    def move_start(self, start):
+        """Forget about the changes before start."""
+        changes = self.changes
+        while len(changes) > 1 and changes[1][0] <= start:
+            first_time, first_matches = changes.popleft()
+            next_time, next_matches = changes[0]
+            if first_matches:
+                self.on_time -= next_time - first_time
+            if next_matches and not first_matches:
+                self.count -= 1
+
+        first_time, first_matches = changes[0]
+        if first_time < start:
+            # The time after the last change is not part of on_time
+            if first_matches and len(changes) > 1:
+                self.on_time -= start - first_time
+            changes[0] = (start, first_matches)
+
+    def elapsed(self, end):
+        """Return the time spent matching from start until end."""
+        last_time, last_matches = self.changes[-1]
+        if last_matches and end > last_time:
+            return self.on_time + end - last_time
+        return self.on_time
+
+
 class HistoryStatsHelper:
     """Static methods to make the HistoryStatsSensor code lighter."""
 
@@ -11,6 +11,9 @@ CONF_EVENT_TYPE = "event_type"
 CONF_EVENT_DATA = "event_data"
 CONF_EVENT_CONTEXT = "context"
 
+# Event data values that are compared by equality by the event data schema
+FILTER_VALUE_TYPES = (str, int, float, type(None))
+
 TRIGGER_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_PLATFORM): "event",
@@ -42,6 +45,7 @@ async def async_attach_trigger(
     )
     removes = []
 
+    event_data_filter = {}
     event_data_schema = None
     if CONF_EVENT_DATA in config:
         # Render the schema input
@@ -50,11 +54,23 @@ async def async_attach_trigger(
         event_data.update(
             template.render_complex(config[CONF_EVENT_DATA], variables, limited=True)
         )
-        # Build the schema
-        event_data_schema = vol.Schema(
-            {vol.Required(key): value for key, value in event_data.items()},
-            extra=vol.ALLOW_EXTRA,
-        )
+        # Plain values are matched by the event bus index, anything else
+        # is validated by a schema
+        event_data_filter = {
+            key: value
+            for key, value in event_data.items()
+            if isinstance(value, FILTER_VALUE_TYPES)
+        }
+        if len(event_data_filter) < len(event_data):
+            # Build the schema
+            event_data_schema = vol.Schema(
+                {
+                    vol.Required(key): value
+                    for key, value in event_data.items()
+                    if key not in event_data_filter
+                },
+                extra=vol.ALLOW_EXTRA,
+            )
 
     event_context_schema = None
     if CONF_EVENT_CONTEXT in config:
@@ -102,7 +118,8 @@ async def async_attach_trigger(
         )
 
     removes = [
-        hass.bus.async_listen(event_type, handle_event) for event_type in event_types
+        hass.bus.async_listen(event_type, handle_event, event_data_filter)
+        for event_type in event_types
     ]
 
     @callback
@@ -27,7 +27,11 @@ from homeassistant.const import (
     STATE_UNKNOWN,
 )
 from homeassistant.core import callback
-from homeassistant.helpers import event as event_helper, state as state_helper
+from homeassistant.helpers import (
+    discovery,
+    event as event_helper,
+    state as state_helper,
+)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_values import EntityValues
 from homeassistant.helpers.entityfilter import (
@@ -53,6 +57,7 @@ from .const import (
     CONF_DEFAULT_MEASUREMENT,
     CONF_HOST,
     CONF_IGNORE_ATTRIBUTES,
+    CONF_MAX_SIZE,
     CONF_MEASUREMENT_ATTR,
     CONF_ORG,
     CONF_OVERRIDE_MEASUREMENT,
@@ -60,7 +65,9 @@ from .const import (
     CONF_PATH,
     CONF_PORT,
     CONF_PRECISION,
+    CONF_REPLAY_RATE,
     CONF_RETRY_COUNT,
+    CONF_SPOOL,
     CONF_SSL,
     CONF_SSL_CA_CERT,
     CONF_TAGS,
@@ -72,6 +79,9 @@ from .const import (
     DEFAULT_API_VERSION,
     DEFAULT_HOST_V2,
     DEFAULT_MEASUREMENT_ATTR,
+    DEFAULT_REPLAY_RATE,
+    DEFAULT_SPOOL_MAX_SIZE,
+    DEFAULT_SPOOL_PATH,
     DEFAULT_SSL_V2,
     DOMAIN,
     EVENT_NEW_STATE,
@@ -90,12 +100,15 @@ from .const import (
     RETRY_DELAY,
     RETRY_INTERVAL,
     RETRY_MESSAGE,
+    SPOOL_REPLAYED_MESSAGE,
+    SPOOLING_MESSAGE,
     TEST_QUERY_V1,
     TEST_QUERY_V2,
     TIMEOUT,
     WRITE_ERROR,
     WROTE_MESSAGE,
 )
+from .spool import InfluxSpool
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -154,6 +167,18 @@ _CUSTOMIZE_ENTITY_SCHEMA = vol.Schema(
     }
 )
 
+_SPOOL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_PATH, default=DEFAULT_SPOOL_PATH): cv.string,
+        vol.Optional(CONF_MAX_SIZE, default=DEFAULT_SPOOL_MAX_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(CONF_REPLAY_RATE, default=DEFAULT_REPLAY_RATE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+
 _INFLUX_BASE_SCHEMA = INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
     {
         vol.Optional(CONF_RETRY_COUNT, default=0): cv.positive_int,
@@ -178,6 +203,7 @@ _INFLUX_BASE_SCHEMA = INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
         vol.Optional(CONF_COMPONENT_CONFIG_DOMAIN, default={}): vol.Schema(
             {cv.string: _CUSTOMIZE_ENTITY_SCHEMA}
         ),
+        vol.Optional(CONF_SPOOL): _SPOOL_SCHEMA,
     }
 )
 
@@ -478,9 +504,26 @@ def setup(hass, config):
         event_helper.call_later(hass, RETRY_INTERVAL, lambda _: setup(hass, config))
         return True
 
+    spool = None
+    replay_rate = DEFAULT_REPLAY_RATE
+    if CONF_SPOOL in conf:
+        spool_conf = conf[CONF_SPOOL]
+        replay_rate = spool_conf[CONF_REPLAY_RATE]
+        try:
+            spool = InfluxSpool(
+                hass.config.path(spool_conf[CONF_PATH]),
+                spool_conf[CONF_MAX_SIZE] * 1024 * 1024,
+            )
+        except OSError as exc:
+            _LOGGER.error("Unable to open the spool: %s", exc)
+            influx.close()
+            return False
+
     event_to_json = _generate_event_to_json(conf)
     max_tries = conf.get(CONF_RETRY_COUNT)
-    instance = hass.data[DOMAIN] = InfluxThread(hass, influx, event_to_json, max_tries)
+    instance = hass.data[DOMAIN] = InfluxThread(
+        hass, influx, event_to_json, max_tries, spool, replay_rate
+    )
     instance.start()
 
     def shutdown(event):
@@ -491,19 +534,33 @@ def setup(hass, config):
 
     hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, shutdown)
 
+    if spool is not None:
+        discovery.load_platform(hass, "sensor", DOMAIN, {}, config)
+
     return True
 
 
 class InfluxThread(threading.Thread):
     """A threaded event handler class."""
 
-    def __init__(self, hass, influx, event_to_json, max_tries):
+    def __init__(
+        self,
+        hass,
+        influx,
+        event_to_json,
+        max_tries,
+        spool=None,
+        replay_rate=DEFAULT_REPLAY_RATE,
+    ):
         """Initialize the listener."""
         threading.Thread.__init__(self, name=DOMAIN)
         self.queue = queue.Queue()
         self.influx = influx
         self.event_to_json = event_to_json
         self.max_tries = max_tries
+        self.spool = spool
+        self.replay_rate = replay_rate
+        self.next_replay = 0
         self.write_errors = 0
         self.shutdown = False
         hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
@@ -522,6 +579,9 @@ class InfluxThread(threading.Thread):
     def get_events_json(self):
         """Return a batch of events formatted for writing."""
         queue_seconds = QUEUE_BACKLOG_SECONDS + self.max_tries * RETRY_DELAY
+        if self.spool is not None:
+            # Old events are spooled instead of dropped
+            queue_seconds = math.inf
 
         count = 0
         json = []
@@ -531,6 +591,9 @@ class InfluxThread(threading.Thread):
         try:
             while len(json) < BATCH_BUFFER_SIZE and not self.shutdown:
                 timeout = None if count == 0 else self.batch_timeout()
+                if count == 0 and self.spool is not None and self.spool.peek():
+                    # Wake up in time to replay the spool
+                    timeout = max(self.next_replay - time.monotonic(), 0)
                 item = self.queue.get(timeout=timeout)
                 count += 1
 
@@ -578,15 +641,58 @@ class InfluxThread(threading.Thread):
                         _LOGGER.error(err)
                     self.write_errors += len(json)
 
+    def spool_to_influxdb(self, json):
+        """Write preprocessed events to influxdb, spooling them while it is down."""
+        if json and not self.spool.peek():
+            try:
+                self.influx.write(json)
+                _LOGGER.debug(WROTE_MESSAGE, len(json))
+                return
+            except ValueError as err:
+                _LOGGER.error(err)
+                return
+            except ConnectionError as err:
+                _LOGGER.error(SPOOLING_MESSAGE, err)
+                self.next_replay = time.monotonic() + RETRY_DELAY
+
+        if json:
+            # Keep the order of events while the spool is replayed
+            self.spool.append(json)
+        self.replay_spool()
+
+    def replay_spool(self):
+        """Write spooled events to influxdb in order, at the replay rate."""
+        while self.spool.peek() and time.monotonic() >= self.next_replay:
+            json = self.spool.peek()
+            try:
+                self.influx.write(json)
+                _LOGGER.debug(WROTE_MESSAGE, len(json))
+            except ValueError as err:
+                _LOGGER.error(err)
+            except ConnectionError as err:
+                _LOGGER.debug(err)
+                self.next_replay = time.monotonic() + RETRY_DELAY
+                return
+            self.spool.pop()
+            self.next_replay = time.monotonic() + len(json) / self.replay_rate
+
+            if not self.spool.peek():
+                _LOGGER.info(SPOOL_REPLAYED_MESSAGE)
+
     def run(self):
         """Process incoming events."""
         while not self.shutdown:
             count, json = self.get_events_json()
-            if json:
+            if self.spool is not None:
+                self.spool_to_influxdb(json)
+            elif json:
                 self.write_to_influxdb(json)
             for _ in range(count):
                 self.queue.task_done()
 
+        if self.spool is not None:
+            self.spool.close()
+
     def block_till_done(self):
         """Block till all events processed."""
         self.queue.join()
@@ -32,6 +32,9 @@ CONF_RETRY_COUNT = "max_retries"
 CONF_IGNORE_ATTRIBUTES = "ignore_attributes"
 CONF_PRECISION = "precision"
 CONF_SSL_CA_CERT = "ssl_ca_cert"
+CONF_SPOOL = "spool"
+CONF_MAX_SIZE = "max_size"
+CONF_REPLAY_RATE = "replay_rate"
 
 CONF_LANGUAGE = "language"
 CONF_QUERIES = "queries"
@@ -59,6 +62,9 @@ DEFAULT_RANGE_START = "-15m"
 DEFAULT_RANGE_STOP = "now()"
 DEFAULT_FUNCTION_FLUX = "|> limit(n: 1)"
 DEFAULT_MEASUREMENT_ATTR = "unit_of_measurement"
+DEFAULT_SPOOL_PATH = "influxdb_spool"
+DEFAULT_SPOOL_MAX_SIZE = 100  # MB
+DEFAULT_REPLAY_RATE = 1000  # points per second
 
 INFLUX_CONF_MEASUREMENT = "measurement"
 INFLUX_CONF_TAGS = "tags"
@@ -78,6 +84,8 @@ QUEUE_BACKLOG_SECONDS = 30
 RETRY_INTERVAL = 60  # seconds
 BATCH_TIMEOUT = 1
 BATCH_BUFFER_SIZE = 100
+SPOOL_SEGMENTS = 16
+SPOOL_SEGMENT_SUFFIX = ".jsonl"
 LANGUAGE_INFLUXQL = "influxQL"
 LANGUAGE_FLUX = "flux"
 TEST_QUERY_V1 = "SHOW DATABASES;"
@@ -120,6 +128,10 @@ RETRY_MESSAGE = f"%s Retrying in {RETRY_INTERVAL} seconds."
 CATCHING_UP_MESSAGE = "Catching up, dropped %d old events."
 RESUMED_MESSAGE = "Resumed, lost %d events."
 WROTE_MESSAGE = "Wrote %d events."
+SPOOLING_MESSAGE = "%s Spooling events to disk until InfluxDB is back."
+SPOOL_FULL_MESSAGE = "Spool is full, dropped %d bytes of the oldest events."
+SPOOL_REPLAYED_MESSAGE = "Replayed all spooled events."
+SPOOL_INVALID_MESSAGE = "Skipping invalid spooled batch in %s."
 RUNNING_QUERY_MESSAGE = "Running query: %s."
 QUERY_NO_RESULTS_MESSAGE = "Query returned no results, sensor state set to UNKNOWN: %s."
 QUERY_MULTIPLE_RESULTS_MESSAGE = (
@@ -10,8 +10,10 @@ from homeassistant.const import (
     CONF_NAME,
     CONF_UNIT_OF_MEASUREMENT,
     CONF_VALUE_TEMPLATE,
+    DATA_MEGABYTES,
     EVENT_HOMEASSISTANT_STOP,
     STATE_UNKNOWN,
+    TIME_SECONDS,
 )
 from homeassistant.exceptions import PlatformNotReady, TemplateError
 import homeassistant.helpers.config_validation as cv
@@ -41,6 +43,7 @@ from .const import (
     DEFAULT_GROUP_FUNCTION,
     DEFAULT_RANGE_START,
     DEFAULT_RANGE_STOP,
+    DOMAIN,
     INFLUX_CONF_VALUE,
     INFLUX_CONF_VALUE_V2,
     LANGUAGE_FLUX,
@@ -143,6 +146,17 @@ PLATFORM_SCHEMA = vol.All(
 
 def setup_platform(hass, config, add_entities, discovery_info=None):
     """Set up the InfluxDB component."""
+    if discovery_info is not None:
+        spool = hass.data[DOMAIN].spool
+        add_entities(
+            [
+                InfluxSpoolSensor(spool, "size", DATA_MEGABYTES),
+                InfluxSpoolSensor(spool, "lag", TIME_SECONDS),
+            ],
+            update_before_add=True,
+        )
+        return
+
     try:
         influx = get_influx_connection(config, test_read=True)
     except ConnectionError as exc:
@@ -238,6 +252,39 @@ class InfluxSensor(Entity):
         self._state = value
 
 
+class InfluxSpoolSensor(Entity):
+    """Implementation of a sensor for the backlog of the InfluxDB spool."""
+
+    def __init__(self, spool, kind, unit_of_measurement):
+        """Initialize the sensor."""
+        self._spool = spool
+        self._kind = kind
+        self._unit_of_measurement = unit_of_measurement
+        self._state = None
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return f"InfluxDB spool {self._kind}"
+
+    @property
+    def state(self):
+        """Return the state of the sensor."""
+        return self._state
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement of this entity, if any."""
+        return self._unit_of_measurement
+
+    def update(self):
+        """Get the latest size or lag of the spool."""
+        if self._kind == "size":
+            self._state = round(self._spool.size / 1024 / 1024, 2)
+        else:
+            self._state = round(self._spool.lag)
+
+
 class InfluxFluxSensorData:
     """Class for handling the data retrieval from Influx with Flux query."""
 
@@ -0,0 +1,154 @@
+"""Spool batches of points that could not be written to InfluxDB to disk."""
+from collections import deque
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from homeassistant.helpers.json import JSONEncoder
+
+from .const import (
+    SPOOL_FULL_MESSAGE,
+    SPOOL_INVALID_MESSAGE,
+    SPOOL_SEGMENT_SUFFIX,
+    SPOOL_SEGMENTS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class InfluxSpool:
+    """Keep batches of points in segment files until they are written.
+
+    Batches are appended to the newest segment and read back in order from the
+    oldest one. Segments are removed once they have been read, or when the
+    spool grows over its maximum size, so disk use stays bounded. Segments
+    left over from a previous run are replayed from the start, which is safe
+    as InfluxDB overwrites points with the same series and timestamp.
+
+    Must only be used from the InfluxDB thread, except for the size and lag.
+    """
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        """Initialize the spool and pick up the segments of a previous run."""
+        self._path = path
+        self._max_bytes = max_bytes
+        self._segment_bytes = max(max_bytes // SPOOL_SEGMENTS, 1)
+        os.makedirs(path, exist_ok=True)
+        self._segments = deque(
+            sorted(
+                int(name[: -len(SPOOL_SEGMENT_SUFFIX)])
+                for name in os.listdir(path)
+                if name.endswith(SPOOL_SEGMENT_SUFFIX)
+                and name[: -len(SPOOL_SEGMENT_SUFFIX)].isdigit()
+            )
+        )
+        self.size = sum(
+            os.path.getsize(self._segment_path(segment)) for segment in self._segments
+        )
+        self._writer = None
+        self._reader = None
+        self._pending: Optional[Dict[str, Any]] = None
+
+    @property
+    def lag(self) -> float:
+        """Return how many seconds ago the oldest spooled batch was spooled."""
+        pending = self._pending
+        if pending is None:
+            return 0
+        return max(time.time() - pending["time"], 0)
+
+    def append(self, points: List[Dict[str, Any]]) -> None:
+        """Add a batch of points to the end of the spool."""
+        data = (
+            json.dumps({"time": time.time(), "points": points}, cls=JSONEncoder) + "\n"
+        ).encode()
+
+        if self._writer is None or self._writer.tell() >= self._segment_bytes:
+            self._roll()
+        self._writer.write(data)
+        self._writer.flush()
+        self.size += len(data)
+
+        dropped = 0
+        while self.size > self._max_bytes and len(self._segments) > 1:
+            dropped += self._remove_oldest()
+        if dropped:
+            _LOGGER.warning(SPOOL_FULL_MESSAGE, dropped)
+
+    def peek(self) -> Optional[List[Dict[str, Any]]]:
+        """Return the oldest batch of points, or None if the spool is empty."""
+        if self._pending is None:
+            self._pending = self._read()
+        if self._pending is None:
+            return None
+        return self._pending["points"]
+
+    def pop(self) -> None:
+        """Remove the oldest batch of points after it has been written."""
+        self._pending = None
+
+    def close(self) -> None:
+        """Close the segments, keeping their batches for the next run."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _segment_path(self, segment: int) -> str:
+        """Return the path of a segment file."""
+        return os.path.join(self._path, f"{segment}{SPOOL_SEGMENT_SUFFIX}")
+
+    def _roll(self) -> None:
+        """Start writing to a new segment."""
+        if self._writer is not None:
+            self._writer.close()
+        segment = self._segments[-1] + 1 if self._segments else 1
+        self._writer = open(self._segment_path(segment), "ab")
+        self._segments.append(segment)
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        """Read the next batch, removing the segments that have been read."""
+        while self._segments:
+            path = self._segment_path(self._segments[0])
+            if self._reader is None:
+                self._reader = open(path, "rb")
+            line = self._reader.readline()
+            if not line.endswith(b"\n"):
+                # The end of the oldest segment, which is either complete or
+                # was cut off when a previous run stopped.
+                if self._writer is not None and len(self._segments) == 1:
+                    if line:
+                        self._reader.seek(-len(line), os.SEEK_CUR)
+                        return None
+                    # Everything has been read, start over with a new segment
+                    self._writer.close()
+                    self._writer = None
+                self._remove_oldest()
+                continue
+            try:
+                batch = json.loads(line)
+                if isinstance(batch["points"], list):
+                    return {"time": float(batch["time"]), "points": batch["points"]}
+            except (ValueError, KeyError, TypeError):
+                pass
+            _LOGGER.warning(SPOOL_INVALID_MESSAGE, path)
+        return None
+
+    def _remove_oldest(self) -> int:
+        """Remove the oldest segment and return its size."""
+        path = self._segment_path(self._segments.popleft())
+        if self._reader is not None and self._reader.name == path:
+            self._reader.close()
+            self._reader = None
+            self._pending = None
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return 0
+        self.size -= size
+        return size
@@ -1,4 +1,5 @@
 """Event parser and human readable log generator."""
+from collections import deque
 from datetime import timedelta
 from itertools import groupby
 import json
@@ -9,12 +10,15 @@ from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import literal
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
     Events,
+    StateAttributes,
     States,
+    decode_shared_attrs,
     process_timestamp_to_utc_isoformat,
 )
 from homeassistant.components.recorder.util import session_scope
@@ -26,6 +30,7 @@ from homeassistant.const import (
     ATTR_ICON,
     ATTR_NAME,
     ATTR_SERVICE,
+    ATTR_UNIT_OF_MEASUREMENT,
     EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
@@ -47,7 +52,6 @@ from homeassistant.helpers.integration_platform import (
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
-ENTITY_ID_JSON_TEMPLATE = '"entity_id": "{}"'
 ENTITY_ID_JSON_EXTRACT = re.compile('"entity_id": "([^"]+)"')
 DOMAIN_JSON_EXTRACT = re.compile('"domain": "([^"]+)"')
 ICON_JSON_EXTRACT = re.compile('"icon": "([^"]+)"')
@@ -60,6 +64,13 @@ DOMAIN = "logbook"
 
 GROUP_BY_MINUTES = 15
 
+DATA_LIVE_LOGBOOK = f"{DOMAIN}.live"
+
+# Number of humanified entries kept in memory for the event stream
+LIVE_BUFFER_SIZE = 2048
+# Number of recent contexts kept to describe what caused live entries
+LIVE_CONTEXT_LOOKUP_SIZE = 1024
+
 EMPTY_JSON_OBJECT = "{}"
 UNIT_OF_MEASUREMENT_JSON = '"unit_of_measurement":'
 
@@ -161,6 +172,12 @@ async def async_setup(hass, config):
 
     hass.http.register_view(LogbookView(conf, filters, entities_filter))
 
+    live_logbook = hass.data[DATA_LIVE_LOGBOOK] = LiveLogbook(
+        hass, filters, entities_filter
+    )
+    live_logbook.async_start()
+    websocket_api.async_register_command(hass, websocket_event_stream)
+
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
 
     await async_process_integration_platforms(hass, DOMAIN, _process_logbook_platform)
@@ -175,6 +192,7 @@ async def _process_logbook_platform(hass, domain, platform):
     def _async_describe_event(domain, event_name, describe_callback):
         """Teach logbook how to describe a new event."""
         hass.data[DOMAIN][event_name] = (domain, describe_callback)
+        hass.data[DATA_LIVE_LOGBOOK].async_listen_event_type(event_name)
 
     platform.async_describe_events(hass, _async_describe_event)
 
@@ -249,6 +267,183 @@ class LogbookView(HomeAssistantView):
         return await hass.async_add_executor_job(json_events)
 
 
+@websocket_api.async_response
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "logbook/event_stream",
+        vol.Required("start_time"): str,
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+async def websocket_event_stream(hass, connection, msg):
+    """Handle logbook event stream websocket command.
+
+    Sends the entries since start_time as a first event, then the new
+    entries as they are logged.
+    """
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time is None:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+
+    start_time = dt_util.as_utc(start_time)
+    entity_ids = msg.get("entity_ids")
+    live_logbook = hass.data[DATA_LIVE_LOGBOOK]
+    pending_entries = []
+    streaming = False
+
+    @callback
+    def async_send_entries(entries):
+        """Send new entries or hold them until the history is sent."""
+        if entity_ids is not None:
+            entries = _entries_for_entity_ids(entries, entity_ids)
+        if not entries:
+            return
+        if not streaming:
+            pending_entries.extend(entries)
+            return
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"events": entries})
+        )
+
+    covered_since, entries, unsub = live_logbook.async_subscribe(
+        start_time, async_send_entries
+    )
+    connection.subscriptions[msg["id"]] = unsub
+    connection.send_result(msg["id"])
+
+    if entity_ids is not None:
+        entries = _entries_for_entity_ids(entries, entity_ids)
+
+    if start_time < covered_since:
+        # Only the entries older than the buffer are fetched from the database
+        entries = (
+            await hass.async_add_executor_job(
+                _get_events,
+                hass,
+                start_time,
+                covered_since,
+                entity_ids,
+                live_logbook.filters,
+                live_logbook.entities_filter,
+            )
+            + entries
+        )
+
+    if msg["id"] not in connection.subscriptions:
+        return
+
+    connection.send_message(
+        websocket_api.messages.message_to_json(
+            websocket_api.event_message(
+                msg["id"], {"events": entries + pending_entries}
+            )
+        )
+    )
+    streaming = True
+
+
+def _entries_for_entity_ids(entries, entity_ids):
+    """Return the entries about one of the entity_ids."""
+    return [entry for entry in entries if entry.get(ATTR_ENTITY_ID) in entity_ids]
+
+
+class LiveLogbook:
+    """Humanify logbook events as they are fired.
+
+    The latest entries are kept in a bounded buffer so recent periods
+    can be served to the event stream without querying the database.
+    """
+
+    def __init__(self, hass, filters, entities_filter):
+        """Initialize the live logbook."""
+        self.hass = hass
+        self.filters = filters
+        self.entities_filter = entities_filter
+        self.entries = deque(maxlen=LIVE_BUFFER_SIZE)
+        # All entries logged since this time are in the buffer
+        self.covered_since = None
+        self._context_lookup = {}
+        self._event_types = set()
+        self._subscribers = []
+
+    @callback
+    def async_start(self):
+        """Start humanifying events."""
+        self.covered_since = dt_util.utcnow()
+        for event_type in ALL_EVENT_TYPES:
+            self.async_listen_event_type(event_type)
+        for event_type in self.hass.data[DOMAIN]:
+            self.async_listen_event_type(event_type)
+
+    @callback
+    def async_listen_event_type(self, event_type):
+        """Humanify events of an event type."""
+        if event_type in self._event_types:
+            return
+        self._event_types.add(event_type)
+        self.hass.bus.async_listen(event_type, self._async_handle_event)
+
+    @callback
+    def async_subscribe(self, start_time, send_entries):
+        """Subscribe to new entries.
+
+        Returns the time since which the buffer holds all entries, the
+        buffered entries since start_time and a function to unsubscribe.
+        """
+        self._subscribers.append(send_entries)
+
+        @callback
+        def unsubscribe():
+            """Unsubscribe from new entries."""
+            self._subscribers.remove(send_entries)
+
+        entries = [
+            entry for time_fired, entry in self.entries if time_fired >= start_time
+        ]
+        return self.covered_since, entries, unsubscribe
+
+    @callback
+    def _async_handle_event(self, event):
+        """Humanify an event and send the entries to the subscribers."""
+        partial_event = LiveEventPartialState(event)
+
+        context_lookup = self._context_lookup
+        if partial_event.context_id not in context_lookup:
+            context_lookup[partial_event.context_id] = partial_event
+            if len(context_lookup) > LIVE_CONTEXT_LOOKUP_SIZE:
+                del context_lookup[next(iter(context_lookup))]
+
+        if event.event_type == EVENT_CALL_SERVICE:
+            return
+
+        if event.event_type == EVENT_STATE_CHANGED:
+            if not _keep_state_change(event, self.entities_filter):
+                return
+        elif not _keep_event(self.hass, partial_event, self.entities_filter):
+            return
+
+        entries = list(
+            humanify(
+                self.hass,
+                [partial_event],
+                EntityAttributeCache(self.hass),
+                context_lookup,
+            )
+        )
+        if not entries:
+            return
+
+        for entry in entries:
+            dropped = len(self.entries) == self.entries.maxlen
+            self.entries.append((event.time_fired, entry))
+            if dropped:
+                self.covered_since = self.entries[0][0]
+
+        for send_entries in list(self._subscribers):
+            send_entries(entries)
+
+
 def humanify(hass, events, entity_attr_cache, context_lookup):
     """Generate a converted list of events into Entry objects.
 
@@ -480,6 +675,8 @@ def _generate_events_query(session):
         States.entity_id,
         States.domain,
         States.attributes,
+        StateAttributes.shared_attrs,
+        StateAttributes.hash.label("attributes_hash"),
     )
 
 
@@ -490,6 +687,8 @@ def _generate_events_query_without_states(session):
         literal(None).label("entity_id"),
         literal(None).label("domain"),
         literal(None).label("attributes"),
+        literal(None).label("shared_attrs"),
+        literal(None).label("attributes_hash"),
     )
 
 
@@ -498,6 +697,9 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
         _generate_events_query(session)
         .outerjoin(Events, (States.event_id == Events.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
         .filter((States.last_updated > start_day) & (States.last_updated < end_day))
@@ -512,6 +714,9 @@ def _apply_events_types_and_states_filter(hass, query, old_state):
     events_query = (
         query.outerjoin(States, (Events.event_id == States.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(
             (Events.event_type != EVENT_STATE_CHANGED)
             | _missing_state_matcher(old_state)
@@ -541,7 +746,11 @@ def _continuous_entity_matcher():
     #
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
-        sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
+        sqlalchemy.not_(
+            sqlalchemy.func.coalesce(
+                StateAttributes.shared_attrs, States.attributes
+            ).contains(UNIT_OF_MEASUREMENT_JSON)
+        ),
     )
 
 
@@ -558,14 +767,26 @@ def _apply_event_types_filter(hass, query, event_types):
 
 
 def _apply_event_entity_id_matchers(events_query, entity_ids):
-    return events_query.filter(
-        sqlalchemy.or_(
-            *[
-                Events.event_data.contains(ENTITY_ID_JSON_TEMPLATE.format(entity_id))
-                for entity_id in entity_ids
-            ]
-        )
-    )
+    return events_query.filter(Events.entity_id.in_(entity_ids))
+
+
+def _keep_state_change(event, entities_filter):
+    """Return if a state changed event belongs in the logbook.
+
+    Mirrors the filtering the database queries do.
+    """
+    old_state = event.data.get("old_state")
+    new_state = event.data.get("new_state")
+    if old_state is None or new_state is None or old_state.state == new_state.state:
+        return False
+
+    if (
+        new_state.domain in CONTINUOUS_DOMAINS
+        and ATTR_UNIT_OF_MEASUREMENT in new_state.attributes
+    ):
+        return False
+
+    return entities_filter is None or entities_filter(new_state.entity_id)
 
 
 def _keep_event(hass, event, entities_filter):
@@ -701,7 +922,9 @@ class LazyEventPartialState:
         if self._attributes:
             return self._attributes.get(ATTR_ICON)
 
-        result = ICON_JSON_EXTRACT.search(self._row.attributes)
+        result = ICON_JSON_EXTRACT.search(
+            self._row.shared_attrs or self._row.attributes
+        )
         return result and result.group(1)
 
     @property
@@ -726,7 +949,11 @@ class LazyEventPartialState:
     def attributes(self):
         """State attributes."""
         if not self._attributes:
-            if (
+            if self._row.shared_attrs is not None:
+                self._attributes = decode_shared_attrs(
+                    self._row.attributes_hash, self._row.shared_attrs
+                )
+            elif (
                 self._row.attributes is None
                 or self._row.attributes == EMPTY_JSON_OBJECT
             ):
@@ -756,6 +983,78 @@ class LazyEventPartialState:
         return self._time_fired_isoformat
 
 
+class LiveEventPartialState:
+    """A core Event with the interface of LazyEventPartialState."""
+
+    __slots__ = [
+        "_event",
+        "_time_fired_isoformat",
+        "attributes",
+        "event_type",
+        "entity_id",
+        "state",
+        "domain",
+        "context_id",
+        "context_user_id",
+        "context_parent_id",
+        "time_fired_minute",
+    ]
+
+    def __init__(self, event):
+        """Init the live event."""
+        self._event = event
+        self._time_fired_isoformat = None
+        self.event_type = event.event_type
+        self.context_id = event.context.id
+        self.context_user_id = event.context.user_id
+        self.context_parent_id = event.context.parent_id
+        self.time_fired_minute = event.time_fired.minute
+
+        new_state = None
+        if event.event_type == EVENT_STATE_CHANGED:
+            new_state = event.data.get("new_state")
+        if new_state is None:
+            self.entity_id = None
+            self.state = None
+            self.domain = None
+            self.attributes = {}
+        else:
+            self.entity_id = new_state.entity_id
+            self.state = new_state.state
+            self.domain = new_state.domain
+            self.attributes = new_state.attributes
+
+    @property
+    def attributes_icon(self):
+        """Extract the icon from the attributes."""
+        return self.attributes.get(ATTR_ICON)
+
+    @property
+    def data_entity_id(self):
+        """Extract the entity id from the data."""
+        return self._event.data.get(ATTR_ENTITY_ID)
+
+    @property
+    def data_domain(self):
+        """Extract the domain from the data."""
+        return self._event.data.get(ATTR_DOMAIN)
+
+    @property
+    def data(self):
+        """Event data."""
+        return self._event.data
+
+    @property
+    def time_fired_isoformat(self):
+        """Time event was fired in utc isoformat."""
+        if not self._time_fired_isoformat:
+            self._time_fired_isoformat = process_timestamp_to_utc_isoformat(
+                self._event.time_fired
+            )
+
+        return self._time_fired_isoformat
+
+
 class EntityAttributeCache:
     """A cache to lookup static entity_id attribute.
 
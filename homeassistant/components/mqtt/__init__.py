@@ -2,13 +2,13 @@
 import asyncio
 from functools import lru_cache, partial, wraps
 import inspect
-from itertools import groupby
+from itertools import count, groupby
 import logging
 from operator import attrgetter
 import os
 import ssl
 import time
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 import uuid
 
 import attr
@@ -529,12 +529,111 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     job: HassJob = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str = attr.ib(default="utf-8")
 
 
+class SubscriptionTrie:
+    """Topic tree holding subscriptions, matched per topic level.
+
+    Looking up the subscriptions for a topic walks one node per topic level
+    (plus the ``+`` and ``#`` wildcard branches) instead of testing every
+    subscription.
+    """
+
+    __slots__ = ("_root", "_order", "_sequence")
+
+    def __init__(self) -> None:
+        """Initialize the subscription trie."""
+        self._root = _TrieNode()
+        # Insertion order of subscriptions, so matches keep subscribe order
+        self._order: Dict[Subscription, int] = {}
+        self._sequence = count()
+
+    def __len__(self) -> int:
+        """Return the number of subscriptions in the trie."""
+        return len(self._order)
+
+    def __contains__(self, subscription: object) -> bool:
+        """Return if the subscription is in the trie."""
+        return subscription in self._order
+
+    def __iter__(self) -> Iterator[Subscription]:
+        """Iterate over the subscriptions in subscribe order."""
+        return iter(self._order)
+
+    def add(self, subscription: Subscription) -> None:
+        """Add a subscription to the trie."""
+        node = self._root
+        for level in subscription.topic.split("/"):
+            node = node.children.setdefault(level, _TrieNode())
+        node.subscriptions.append(subscription)
+        self._order[subscription] = next(self._sequence)
+
+    def remove(self, subscription: Subscription) -> None:
+        """Remove a subscription from the trie, pruning empty nodes."""
+        del self._order[subscription]
+        path = []
+        node = self._root
+        for level in subscription.topic.split("/"):
+            path.append((node, level))
+            node = node.children[level]
+        node.subscriptions.remove(subscription)
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.subscriptions or child.children:
+                break
+            del parent.children[level]
+
+    def has_topic(self, topic: str) -> bool:
+        """Return if any subscription exists for the exact subscription topic."""
+        node = self._root
+        for level in topic.split("/"):
+            node = node.children.get(level)  # type: ignore[assignment]
+            if node is None:
+                return False
+        return bool(node.subscriptions)
+
+    def matches(self, topic: str) -> List[Subscription]:
+        """Return the subscriptions matching a topic, in subscribe order."""
+        levels = topic.split("/")
+        # Wildcards don't match topics starting with $ at the first level
+        wildcard_root = not topic.startswith("$")
+        found: List[Subscription] = []
+        num_levels = len(levels)
+
+        def _collect(node: _TrieNode, idx: int) -> None:
+            children = node.children
+            if idx == num_levels:
+                found.extend(node.subscriptions)
+            else:
+                child = children.get(levels[idx])
+                if child is not None:
+                    _collect(child, idx + 1)
+                if (wildcard_root or idx) and "+" in children:
+                    _collect(children["+"], idx + 1)
+            if (wildcard_root or idx) and "#" in children:
+                found.extend(children["#"].subscriptions)
+
+        _collect(self._root, 0)
+
+        if len(found) > 1:
+            found.sort(key=self._order.__getitem__)
+        return found
+
+
+class _TrieNode:
+    """Node of a subscription trie."""
+
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: Dict[str, _TrieNode] = {}
+        self.subscriptions: List[Subscription] = []
+
+
 class MQTT:
     """Home Assistant MQTT client."""
 
@@ -552,7 +651,7 @@ class MQTT:
         self.hass = hass
         self.config_entry = config_entry
         self.conf = conf
-        self.subscriptions: List[Subscription] = []
+        self.subscriptions = SubscriptionTrie()
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -739,10 +838,8 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), HassJob(msg_callback), qos, encoding
-        )
-        self.subscriptions.append(subscription)
+        subscription = Subscription(topic, HassJob(msg_callback), qos, encoding)
+        self.subscriptions.add(subscription)
         self._matching_subscriptions.cache_clear()
 
         # Only subscribe if currently connected.
@@ -758,7 +855,7 @@ class MQTT:
             self.subscriptions.remove(subscription)
             self._matching_subscriptions.cache_clear()
 
-            if any(other.topic == topic for other in self.subscriptions):
+            if self.subscriptions.has_topic(topic):
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
@@ -851,11 +948,7 @@ class MQTT:
 
     @lru_cache(2048)
     def _matching_subscriptions(self, topic):
-        subscriptions = []
-        for subscription in self.subscriptions:
-            if subscription.matcher(topic):
-                subscriptions.append(subscription)
-        return subscriptions
+        return self.subscriptions.matches(topic)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
@@ -967,16 +1060,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _matcher_for_topic(subscription: str) -> Any:
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
-
-
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/debug_info", vol.Required("device_id"): str}
 )
@@ -4,9 +4,9 @@ import string
 
 from aiohttp import web
 import prometheus_client
+from prometheus_client.core import GaugeMetricFamily
 import voluptuous as vol
 
-from homeassistant import core as hacore
 from homeassistant.components.climate.const import (
     ATTR_CURRENT_TEMPERATURE,
     ATTR_HVAC_ACTION,
@@ -25,6 +25,7 @@ from homeassistant.const import (
     ATTR_TEMPERATURE,
     ATTR_UNIT_OF_MEASUREMENT,
     CONTENT_TYPE_TEXT_PLAIN,
+    EVENT_HOMEASSISTANT_STOP,
     EVENT_STATE_CHANGED,
     PERCENTAGE,
     STATE_ON,
@@ -49,6 +50,7 @@ CONF_COMPONENT_CONFIG_GLOB = "component_config_glob"
 CONF_COMPONENT_CONFIG_DOMAIN = "component_config_domain"
 CONF_DEFAULT_METRIC = "default_metric"
 CONF_OVERRIDE_METRIC = "override_metric"
+CONF_COLLECT_ON_SCRAPE = "collect_on_scrape"
 COMPONENT_CONFIG_SCHEMA_ENTRY = vol.Schema(
     {vol.Optional(CONF_OVERRIDE_METRIC): cv.string}
 )
@@ -61,6 +63,7 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(CONF_PROM_NAMESPACE): cv.string,
                 vol.Optional(CONF_DEFAULT_METRIC): cv.string,
                 vol.Optional(CONF_OVERRIDE_METRIC): cv.string,
+                vol.Optional(CONF_COLLECT_ON_SCRAPE, default=False): cv.boolean,
                 vol.Optional(CONF_COMPONENT_CONFIG, default={}): vol.Schema(
                     {cv.entity_id: COMPONENT_CONFIG_SCHEMA_ENTRY}
                 ),
@@ -101,9 +104,21 @@ def setup(hass, config):
         component_config,
         override_metric,
         default_metric,
+        conf[CONF_COLLECT_ON_SCRAPE],
     )
 
     hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
+
+    if conf[CONF_COLLECT_ON_SCRAPE]:
+        collector = PrometheusCollector(hass, metrics)
+        prometheus_client.REGISTRY.register(collector)
+
+        def unregister_collector(event):
+            """Stop collecting the metrics of a stopped Home Assistant."""
+            prometheus_client.REGISTRY.unregister(collector)
+
+        hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, unregister_collector)
+
     return True
 
 
@@ -119,9 +134,11 @@ class PrometheusMetrics:
         component_config,
         override_metric,
         default_metric,
+        collect_on_scrape=False,
     ):
         """Initialize Prometheus Metrics."""
         self.prometheus_cli = prometheus_cli
+        self._collect_on_scrape = collect_on_scrape
         self._component_config = component_config
         self._override_metric = override_metric
         self._default_metric = default_metric
@@ -139,25 +156,27 @@ class PrometheusMetrics:
         else:
             self.metrics_prefix = ""
         self._metrics = {}
+        # Gauges built during a scrape, None outside of collect_states
+        self._scrape_gauges = None
+        self._domain_handlers = {}
+        self._label_cache = {}
         self._climate_units = climate_units
 
     def handle_event(self, event):
         """Listen for new messages on the bus, and add them to Prometheus."""
         state = event.data.get("new_state")
         if state is None:
+            self._label_cache.pop(event.data.get("entity_id"), None)
             return
 
         entity_id = state.entity_id
         _LOGGER.debug("Handling state update for %s", entity_id)
-        domain, _ = hacore.split_entity_id(entity_id)
 
         if not self._filter(state.entity_id):
             return
 
-        handler = f"_handle_{domain}"
-
-        if hasattr(self, handler) and state.state != STATE_UNAVAILABLE:
-            getattr(self, handler)(state)
+        if not self._collect_on_scrape:
+            self.handle_state(state)
 
         labels = self._labels(state)
         state_change = self._metric(
@@ -165,6 +184,37 @@ class PrometheusMetrics:
         )
         state_change.labels(**labels).inc()
 
+        if state.domain == "automation" and state.state != STATE_UNAVAILABLE:
+            self._count_automation(state)
+
+    def collect_states(self, states):
+        """Return the gauges of the states that pass the filter."""
+        self._scrape_gauges = {}
+        try:
+            for state in states:
+                if not self._filter(state.entity_id):
+                    continue
+                try:
+                    self.handle_state(state)
+                except ValueError:
+                    _LOGGER.debug("Could not collect metrics of %s", state.entity_id)
+            return [gauge.family for gauge in self._scrape_gauges.values()]
+        finally:
+            self._scrape_gauges = None
+
+    def handle_state(self, state):
+        """Set the gauges of an entity from its state."""
+        try:
+            handler = self._domain_handlers[state.domain]
+        except KeyError:
+            handler = self._domain_handlers[state.domain] = getattr(
+                self, f"_handle_{state.domain}", None
+            )
+
+        if handler is not None and state.state != STATE_UNAVAILABLE:
+            handler(state)
+
+        labels = self._labels(state)
         entity_available = self._metric(
             "entity_available",
             self.prometheus_cli.Gauge,
@@ -198,14 +248,19 @@ class PrometheusMetrics:
         if extra_labels is not None:
             labels.extend(extra_labels)
 
+        metrics = self._metrics
+        if self._scrape_gauges is not None and factory is self.prometheus_cli.Gauge:
+            metrics = self._scrape_gauges
+            factory = ScrapeGauge
+
         try:
-            return self._metrics[metric]
+            return metrics[metric]
         except KeyError:
             full_metric_name = self._sanitize_metric_name(
                 f"{self.metrics_prefix}{metric}"
             )
-            self._metrics[metric] = factory(full_metric_name, documentation, labels)
-            return self._metrics[metric]
+            metrics[metric] = factory(full_metric_name, documentation, labels)
+            return metrics[metric]
 
     @staticmethod
     def _sanitize_metric_name(metric: str) -> str:
@@ -231,13 +286,16 @@ class PrometheusMetrics:
             value = 0
         return value
 
-    @staticmethod
-    def _labels(state):
-        return {
-            "entity": state.entity_id,
-            "domain": state.domain,
-            "friendly_name": state.attributes.get(ATTR_FRIENDLY_NAME),
-        }
+    def _labels(self, state):
+        friendly_name = state.attributes.get(ATTR_FRIENDLY_NAME)
+        labels = self._label_cache.get(state.entity_id)
+        if labels is None or labels["friendly_name"] != friendly_name:
+            labels = self._label_cache[state.entity_id] = {
+                "entity": state.entity_id,
+                "domain": state.domain,
+                "friendly_name": friendly_name,
+            }
+        return labels
 
     def _battery(self, state):
         if "battery_level" in state.attributes:
@@ -463,7 +521,7 @@ class PrometheusMetrics:
     def _handle_zwave(self, state):
         self._battery(state)
 
-    def _handle_automation(self, state):
+    def _count_automation(self, state):
         metric = self._metric(
             "automation_triggered_count",
             self.prometheus_cli.Counter,
@@ -473,6 +531,55 @@ class PrometheusMetrics:
         metric.labels(**self._labels(state)).inc()
 
 
+class ScrapeGauge:
+    """Gauge whose samples are only kept for a single scrape."""
+
+    def __init__(self, name, documentation, labelnames):
+        """Initialize the gauge."""
+        self._labelnames = labelnames
+        self.family = GaugeMetricFamily(name, documentation, labels=labelnames)
+
+    def labels(self, **labels):
+        """Return the sample of the gauge with the labels."""
+        return ScrapeGaugeSample(
+            self.family, [str(labels[name]) for name in self._labelnames]
+        )
+
+
+class ScrapeGaugeSample:
+    """Sample of a gauge with a set of label values."""
+
+    def __init__(self, family, label_values):
+        """Initialize the sample."""
+        self._family = family
+        self._label_values = label_values
+
+    def set(self, value):
+        """Add the value to the gauge."""
+        self._family.add_metric(self._label_values, float(value))
+
+
+class PrometheusCollector:
+    """Build the gauges of all entities when Prometheus scrapes the metrics.
+
+    Only counters are updated on state changes, which keeps the work of busy
+    installations proportional to the scrape interval.
+    """
+
+    def __init__(self, hass, metrics):
+        """Initialize the collector."""
+        self._hass = hass
+        self._metrics = metrics
+
+    def describe(self):
+        """Return no metrics so registering the collector does not collect."""
+        return []
+
+    def collect(self):
+        """Return the gauges of the current states, called from the event loop."""
+        return self._metrics.collect_states(self._hass.states.async_all())
+
+
 class PrometheusView(HomeAssistantView):
     """Handle Prometheus requests."""
 
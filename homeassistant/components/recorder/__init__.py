@@ -9,7 +9,7 @@ import threading
 import time
 from typing import Any, Callable, List, Optional
 
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
+from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 import voluptuous as vol
@@ -34,9 +34,9 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
-from . import migration, purge
+from . import migration, purge, statistics
 from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .models import Base, Events, RecorderRuns, StateAttributes, States
 from .util import session_scope, validate_or_move_away_sqlite_database
 
 _LOGGER = logging.getLogger(__name__)
@@ -65,7 +65,18 @@ KEEPALIVE_TIME = 30
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# Max number of shared attributes ids to keep
+# in memory to avoid looking them up in the database
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+
+# Max number of events to hold before writing them
+# out when using bulk inserts
+BULK_INSERT_MAX_EVENTS = 1000
+
 CONF_AUTO_PURGE = "auto_purge"
+CONF_BULK_INSERT = "bulk_insert"
+CONF_INCREMENTAL_VACUUM = "incremental_vacuum"
+CONF_SHORT_TERM_STATISTICS = "short_term_statistics"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
@@ -106,6 +117,9 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_BULK_INSERT, default=False): cv.boolean,
+                    vol.Optional(CONF_INCREMENTAL_VACUUM, default=False): cv.boolean,
+                    vol.Optional(CONF_SHORT_TERM_STATISTICS, default=False): cv.boolean,
                 }
             ),
         )
@@ -164,6 +178,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_integrity_check = conf[CONF_DB_INTEGRITY_CHECK]
+    bulk_insert = conf[CONF_BULK_INSERT]
+    incremental_vacuum = conf[CONF_INCREMENTAL_VACUUM]
+    short_term_statistics = conf[CONF_SHORT_TERM_STATISTICS]
 
     db_url = conf.get(CONF_DB_URL)
     if not db_url:
@@ -181,6 +198,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_filter=entity_filter,
         exclude_t=exclude_t,
         db_integrity_check=db_integrity_check,
+        bulk_insert=bulk_insert,
+        incremental_vacuum=incremental_vacuum,
+        short_term_statistics=short_term_statistics,
     )
     instance.async_initialize()
     instance.start()
@@ -198,11 +218,17 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 PurgeTask = namedtuple("PurgeTask", ["keep_days", "repack"])
 
+IncrementalVacuumTask = namedtuple("IncrementalVacuumTask", ["repack"])
+
 
 class WaitTask:
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
 
 
+class StatisticsTask:
+    """An object to insert into the recorder queue to compile closed statistics periods."""
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -218,6 +244,9 @@ class Recorder(threading.Thread):
         entity_filter: Callable[[str], bool],
         exclude_t: List[str],
         db_integrity_check: bool,
+        bulk_insert: bool,
+        incremental_vacuum: bool,
+        short_term_statistics: bool,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -232,6 +261,10 @@ class Recorder(threading.Thread):
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
         self.db_integrity_check = db_integrity_check
+        self.bulk_insert = bulk_insert
+        self.incremental_vacuum = incremental_vacuum
+        self.short_term_statistics = short_term_statistics
+        self.statistics_compiled_until = {}
         self.async_db_ready = asyncio.Future()
         self._queue_watch = threading.Event()
         self.engine: Any = None
@@ -245,6 +278,13 @@ class Recorder(threading.Thread):
         self._keepalive_count = 0
         self._old_states = {}
         self._pending_expunge = []
+        self._state_attributes_ids = {}
+        self._pending_state_attributes = {}
+        self._old_state_ids = {}
+        self._last_ids = None
+        self._bulk_events = []
+        self._bulk_states = []
+        self._bulk_state_attributes = []
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = False
@@ -348,6 +388,16 @@ class Recorder(threading.Thread):
                 async_purge, hour=4, minute=12, second=0
             )
 
+        @callback
+        def async_periodic_statistics(now):
+            """Trigger compiling statistics of the closed periods."""
+            self.queue.put(StatisticsTask())
+
+        # Compile statistics shortly after every 5 minute period closes
+        self.hass.helpers.event.track_utc_time_change(
+            async_periodic_statistics, minute="/5", second=10
+        )
+
         self.event_session = self.get_session()
         self.event_session.expire_on_commit = False
         # Use a session for the event read loop
@@ -360,9 +410,30 @@ class Recorder(threading.Thread):
                 self._close_connection()
                 return
             if isinstance(event, PurgeTask):
+                # Commit pending states first so purge does not remove
+                # the shared attributes they reference
+                self._commit_event_session_or_retry()
                 # Schedule a new purge task if this one didn't finish
                 if not purge.purge_old_data(self, event.keep_days, event.repack):
                     self.queue.put(PurgeTask(event.keep_days, event.repack))
+                elif self.engine.driver == "pysqlite" and self.incremental_vacuum:
+                    self.queue.put(IncrementalVacuumTask(event.repack))
+                if self.bulk_insert:
+                    self._evict_purged_old_state_ids()
+                continue
+            if isinstance(event, IncrementalVacuumTask):
+                # Schedule a new vacuum task if there are pages left to free
+                if not purge.incremental_vacuum(self, event.repack):
+                    self.queue.put(event)
+                continue
+            if isinstance(event, StatisticsTask):
+                # Commit pending states first so they are included
+                self._commit_event_session_or_retry()
+                try:
+                    statistics.compile_missing_statistics(self, dt_util.utcnow())
+                except Exception as err:  # pylint: disable=broad-except
+                    # Must catch the exception to prevent the loop from collapsing
+                    _LOGGER.exception("Error compiling statistics: %s", err)
                 continue
             if isinstance(event, WaitTask):
                 self._queue_watch.set()
@@ -386,6 +457,16 @@ class Recorder(threading.Thread):
                 if not self.entity_filter(entity_id):
                     continue
 
+            if self.bulk_insert:
+                self._bulk_add_event(event)
+                # Write out once the queue is drained when there is no
+                # commit interval, or when the batch is full
+                if len(self._bulk_events) >= BULK_INSERT_MAX_EVENTS or (
+                    not self.commit_interval and self.queue.empty()
+                ):
+                    self._commit_event_session_or_retry()
+                continue
+
             try:
                 if event.event_type == EVENT_STATE_CHANGED:
                     dbevent = Events.from_event(event, event_data="{}")
@@ -411,6 +492,7 @@ class Recorder(threading.Thread):
                             dbstate.old_state = old_state
                     if not has_new_state:
                         dbstate.state = None
+                    self._link_state_attributes(dbstate)
                     dbstate.event = dbevent
                     dbstate.created = event.time_fired
                     self.event_session.add(dbstate)
@@ -431,6 +513,165 @@ class Recorder(threading.Thread):
             if not self.commit_interval:
                 self._commit_event_session_or_retry()
 
+    def _bulk_add_event(self, event):
+        """Add an event and its state change to the pending bulk inserts."""
+        try:
+            if event.event_type == EVENT_STATE_CHANGED:
+                event_values = Events.values_from_event(event, event_data="{}")
+            else:
+                event_values = Events.values_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+            return
+        event_values["event_id"] = event_id = self._allocate_id(Events.event_id)
+        event_values["created"] = event.time_fired
+        self._bulk_events.append(event_values)
+
+        if event.event_type != EVENT_STATE_CHANGED:
+            return
+
+        try:
+            state_values = States.values_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning(
+                "State is not JSON serializable: %s", event.data.get("new_state")
+            )
+            return
+
+        entity_id = state_values["entity_id"]
+        has_new_state = event.data.get("new_state")
+        state_values["state_id"] = state_id = self._allocate_id(States.state_id)
+        state_values["old_state_id"] = self._old_state_ids.pop(entity_id, None)
+        if not has_new_state:
+            state_values["state"] = None
+        shared_attrs = state_values.pop("attributes")
+        state_values["attributes"] = None
+        state_values["attributes_id"] = self._shared_attributes_id(shared_attrs)
+        if state_values["attributes_id"] is None:
+            attributes_id = self._allocate_id(StateAttributes.attributes_id)
+            self._bulk_state_attributes.append(
+                {
+                    "attributes_id": attributes_id,
+                    "hash": StateAttributes.hash_shared_attrs(shared_attrs),
+                    "shared_attrs": shared_attrs,
+                }
+            )
+            self._cache_state_attributes_id(shared_attrs, attributes_id)
+            state_values["attributes_id"] = attributes_id
+        state_values["event_id"] = event_id
+        state_values["created"] = event.time_fired
+        self._bulk_states.append(state_values)
+        if has_new_state:
+            self._old_state_ids[entity_id] = state_id
+
+    def _allocate_id(self, column):
+        """Return the next primary key for a bulk inserted row.
+
+        The recorder is the only writer of these tables so it can
+        hand out the keys itself instead of reading them back.
+        """
+        if self._last_ids is None:
+            self._last_ids = {
+                pk_column: self.event_session.query(func.max(pk_column)).scalar() or 0
+                for pk_column in (
+                    Events.event_id,
+                    States.state_id,
+                    StateAttributes.attributes_id,
+                )
+            }
+        self._last_ids[column] += 1
+        return self._last_ids[column]
+
+    def _flush_bulk_inserts(self):
+        """Insert the pending rows with one executemany per table."""
+        for table, rows in (
+            (StateAttributes.__table__, self._bulk_state_attributes),
+            (Events.__table__, self._bulk_events),
+            (States.__table__, self._bulk_states),
+        ):
+            if rows:
+                self.event_session.execute(table.insert(), rows)
+
+        if self.engine.dialect.name == "postgresql":
+            # Keep the sequences in step with the keys we handed out
+            for column, last_id in self._last_ids.items():
+                self.event_session.execute(
+                    select(
+                        [
+                            func.setval(
+                                func.pg_get_serial_sequence(
+                                    column.table.name, column.name
+                                ),
+                                last_id,
+                            )
+                        ]
+                    )
+                )
+
+    def _discard_bulk_inserts(self):
+        """Drop the pending rows and forget the keys handed out for them."""
+        self._bulk_events = []
+        self._bulk_states = []
+        self._bulk_state_attributes = []
+        self._last_ids = None
+        self._old_state_ids = {}
+        self._state_attributes_ids = {}
+
+    def _evict_purged_old_state_ids(self):
+        """Forget old state ids that purge has removed from the database."""
+        if not self._old_state_ids:
+            return
+        with session_scope(session=self.get_session()) as session:
+            first_state_id = session.query(func.min(States.state_id)).scalar()
+        self._old_state_ids = {
+            entity_id: state_id
+            for entity_id, state_id in self._old_state_ids.items()
+            if first_state_id is not None and state_id >= first_state_id
+        }
+
+    def _shared_attributes_id(self, shared_attrs):
+        """Return the id of a stored state_attributes row, if there is one."""
+        attributes_id = self._state_attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            return attributes_id
+
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        with self.event_session.no_autoflush:
+            attributes_id = (
+                self.event_session.query(StateAttributes.attributes_id)
+                .filter(StateAttributes.hash == attr_hash)
+                .filter(StateAttributes.shared_attrs == shared_attrs)
+                .scalar()
+            )
+        if attributes_id is not None:
+            self._cache_state_attributes_id(shared_attrs, attributes_id)
+        return attributes_id
+
+    def _link_state_attributes(self, dbstate):
+        """Move the attributes of a state to a shared state_attributes row."""
+        shared_attrs = dbstate.attributes
+        dbstate.attributes = None
+
+        pending_attributes = self._pending_state_attributes.get(shared_attrs)
+        if pending_attributes is not None:
+            dbstate.state_attributes = pending_attributes
+            return
+
+        attributes_id = self._shared_attributes_id(shared_attrs)
+        if attributes_id is not None:
+            dbstate.attributes_id = attributes_id
+            return
+
+        dbstate_attributes = StateAttributes.from_shared_attrs(shared_attrs)
+        dbstate.state_attributes = dbstate_attributes
+        self._pending_state_attributes[shared_attrs] = dbstate_attributes
+
+    def _cache_state_attributes_id(self, shared_attrs, attributes_id):
+        """Remember the id of a state_attributes row."""
+        if len(self._state_attributes_ids) >= STATE_ATTRIBUTES_ID_CACHE_SIZE:
+            self._state_attributes_ids = {}
+        self._state_attributes_ids[shared_attrs] = attributes_id
+
     def _send_keep_alive(self):
         try:
             _LOGGER.debug("Sending keepalive")
@@ -473,6 +714,7 @@ class Recorder(threading.Thread):
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
                 _LOGGER.exception("Error saving events: %s", err)
+                self._discard_bulk_inserts()
                 return
 
         _LOGGER.error(
@@ -482,6 +724,7 @@ class Recorder(threading.Thread):
         self._reopen_event_session()
 
     def _reopen_event_session(self):
+        self._discard_bulk_inserts()
         try:
             self.event_session.rollback()
         except Exception as err:  # pylint: disable=broad-except
@@ -503,8 +746,11 @@ class Recorder(threading.Thread):
 
     def _commit_event_session(self):
         self._commits_without_expire += 1
+        bulk_start = time.perf_counter()
 
         try:
+            if self._bulk_events:
+                self._flush_bulk_inserts()
             if self._pending_expunge:
                 self.event_session.flush()
                 for dbstate in self._pending_expunge:
@@ -521,12 +767,41 @@ class Recorder(threading.Thread):
             )
             self.event_session.rollback()
             self._old_states = {}
+            self._state_attributes_ids = {}
+            self._pending_state_attributes = {}
+            self._discard_bulk_inserts()
             raise
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
+            self._pending_state_attributes = {}
             raise
 
+        for shared_attrs, dbstate_attributes in self._pending_state_attributes.items():
+            self._cache_state_attributes_id(
+                shared_attrs, dbstate_attributes.attributes_id
+            )
+        self._pending_state_attributes = {}
+
+        if self._bulk_events:
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                rows = (
+                    len(self._bulk_events)
+                    + len(self._bulk_states)
+                    + len(self._bulk_state_attributes)
+                )
+                elapsed = time.perf_counter() - bulk_start
+                _LOGGER.debug(
+                    "Bulk inserted %d rows in %fs (%d rows/s), %d events queued",
+                    rows,
+                    elapsed,
+                    rows / elapsed if elapsed else rows,
+                    self.queue.qsize(),
+                )
+            self._bulk_events = []
+            self._bulk_states = []
+            self._bulk_state_attributes = []
+
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
         # do it after EXPIRE_AFTER_COMMITS commits
@@ -571,6 +846,10 @@ class Recorder(threading.Thread):
                 old_isolation = dbapi_connection.isolation_level
                 dbapi_connection.isolation_level = None
                 cursor = dbapi_connection.cursor()
+                if self.incremental_vacuum:
+                    # Only has an effect before the tables are created,
+                    # existing databases are switched by a repack
+                    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
                 cursor.execute("PRAGMA journal_mode=WAL")
                 cursor.close()
                 dbapi_connection.isolation_level = old_isolation
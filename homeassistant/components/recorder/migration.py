@@ -1,7 +1,8 @@
 """Schema migration helpers."""
+import json
 import logging
 
-from sqlalchemy import ForeignKeyConstraint, MetaData, Table, text
+from sqlalchemy import ForeignKeyConstraint, MetaData, Table, bindparam, select, text
 from sqlalchemy.engine import reflection
 from sqlalchemy.exc import (
     InternalError,
@@ -12,11 +13,21 @@ from sqlalchemy.exc import (
 from sqlalchemy.schema import AddConstraint, DropConstraint
 
 from .const import DOMAIN
-from .models import SCHEMA_VERSION, TABLE_STATES, Base, SchemaChanges
+from .models import (
+    SCHEMA_VERSION,
+    TABLE_STATES,
+    Base,
+    Events,
+    SchemaChanges,
+    event_entity_id,
+)
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Number of events read at once when filling in a new column
+BACKFILL_BATCH_SIZE = 10000
+
 
 def migrate_schema(instance):
     """Check if the schema needs to be upgraded."""
@@ -204,6 +215,48 @@ def _add_columns(engine, table_name, columns_def):
             )
 
 
+def _backfill_events_entity_id(engine):
+    """Fill in the entity_id column of existing events from their data."""
+    _LOGGER.warning(
+        "Filling in the entity_id of existing events. Note: this can take "
+        "several minutes on large databases and slow computers. Please "
+        "be patient!"
+    )
+    events = Events.__table__
+    update = (
+        events.update()
+        .where(events.c.event_id == bindparam("b_event_id"))
+        .values(entity_id=bindparam("b_entity_id"))
+    )
+    last_event_id = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select([events.c.event_id, events.c.event_type, events.c.event_data])
+                .where(events.c.event_id > last_event_id)
+                .where(events.c.event_data.contains('"entity_id": '))
+                .order_by(events.c.event_id)
+                .limit(BACKFILL_BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                return
+
+            values = []
+            for event_id, event_type, event_data in rows:
+                try:
+                    entity_id = event_entity_id(event_type, json.loads(event_data))
+                except (ValueError, AttributeError):
+                    # Invalid JSON or not an object
+                    continue
+                if entity_id is not None:
+                    values.append({"b_event_id": event_id, "b_entity_id": entity_id})
+
+            if values:
+                connection.execute(update, values)
+
+            last_event_id = rows[-1][0]
+
+
 def _update_states_table_with_foreign_key_options(engine):
     """Add the options to foreign key constraints."""
     inspector = reflection.Inspector.from_engine(engine)
@@ -321,6 +374,18 @@ def _apply_update(engine, new_version, old_version):
     elif new_version == 11:
         _create_index(engine, "states", "ix_states_old_state_id")
         _update_states_table_with_foreign_key_options(engine)
+    elif new_version == 12:
+        # The state_attributes table is created by create_all,
+        # existing rows keep their attributes in the states table
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 13:
+        # The statistics tables are created by create_all
+        pass
+    elif new_version == 14:
+        _add_columns(engine, "events", ["entity_id VARCHAR(255)"])
+        _backfill_events_entity_id(engine)
+        _create_index(engine, "events", "ix_events_entity_id_time_fired")
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
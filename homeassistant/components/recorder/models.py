@@ -1,11 +1,15 @@
 """Models for SQLAlchemy."""
+from datetime import timedelta
+import hashlib
 import json
 import logging
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -13,10 +17,16 @@ from sqlalchemy import (
     Text,
     distinct,
 )
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.declarative import declarative_base, declared_attr
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm.session import Session
 
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_SERVICE_DATA,
+    EVENT_CALL_SERVICE,
+    EVENT_STATE_CHANGED,
+)
 from homeassistant.core import Context, Event, EventOrigin, State, split_entity_id
 from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
@@ -25,7 +35,7 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 11
+SCHEMA_VERSION = 14
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,10 +43,35 @@ DB_TIMEZONE = "+00:00"
 
 TABLE_EVENTS = "events"
 TABLE_STATES = "states"
+TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
-
-ALL_TABLES = [TABLE_STATES, TABLE_EVENTS, TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES]
+TABLE_STATISTICS = "statistics"
+TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
+
+ALL_TABLES = [
+    TABLE_STATES,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_EVENTS,
+    TABLE_RECORDER_RUNS,
+    TABLE_SCHEMA_CHANGES,
+    TABLE_STATISTICS,
+    TABLE_STATISTICS_SHORT_TERM,
+]
+
+# Tables that exist in every schema version, the others
+# are only created when the database is migrated
+TABLES_TO_CHECK = [
+    TABLE_STATES,
+    TABLE_EVENTS,
+    TABLE_RECORDER_RUNS,
+    TABLE_SCHEMA_CHANGES,
+]
+
+# Max number of decoded shared attributes to keep in memory
+SHARED_ATTRS_CACHE_SIZE = 4096
+
+_SHARED_ATTRS_CACHE = {}
 
 
 class Events(Base):  # type: ignore
@@ -56,25 +91,35 @@ class Events(Base):  # type: ignore
     context_id = Column(String(36), index=True)
     context_user_id = Column(String(36), index=True)
     context_parent_id = Column(String(36), index=True)
+    entity_id = Column(String(255))
 
     __table_args__ = (
         # Used for fetching events at a specific time
         # see logbook
         Index("ix_events_event_type_time_fired", "event_type", "time_fired"),
+        # Used for fetching the events of an entity
+        # see logbook
+        Index("ix_events_entity_id_time_fired", "entity_id", "time_fired"),
     )
 
     @staticmethod
     def from_event(event, event_data=None):
         """Create an event database object from a native event."""
-        return Events(
-            event_type=event.event_type,
-            event_data=event_data or json.dumps(event.data, cls=JSONEncoder),
-            origin=str(event.origin.value),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-        )
+        return Events(**Events.values_from_event(event, event_data))
+
+    @staticmethod
+    def values_from_event(event, event_data=None):
+        """Return the column values of a native event."""
+        return {
+            "event_type": event.event_type,
+            "event_data": event_data or json.dumps(event.data, cls=JSONEncoder),
+            "origin": str(event.origin.value),
+            "time_fired": event.time_fired,
+            "context_id": event.context.id,
+            "context_user_id": event.context.user_id,
+            "context_parent_id": event.context.parent_id,
+            "entity_id": event_entity_id(event.event_type, event.data),
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to a natve HA Event."""
@@ -97,6 +142,29 @@ class Events(Base):  # type: ignore
             return None
 
 
+def event_entity_id(event_type, event_data):
+    """Return the entity_id to store in the events table for an event.
+
+    State changes are not included as the states table has their entity_id.
+    Service calls get the entity_id they target, so they can be found as the
+    context of the state changes they cause.
+    """
+    if event_type == EVENT_STATE_CHANGED:
+        return None
+    if event_type == EVENT_CALL_SERVICE:
+        event_data = event_data.get(ATTR_SERVICE_DATA)
+        if not isinstance(event_data, dict):
+            return None
+        entity_id = event_data.get(ATTR_ENTITY_ID)
+        if isinstance(entity_id, list) and len(entity_id) == 1:
+            entity_id = entity_id[0]
+    else:
+        entity_id = event_data.get(ATTR_ENTITY_ID)
+    if not isinstance(entity_id, str) or len(entity_id) > 255:
+        return None
+    return entity_id
+
+
 class States(Base):  # type: ignore
     """State change history."""
 
@@ -110,6 +178,9 @@ class States(Base):  # type: ignore
     entity_id = Column(String(255))
     state = Column(String(255))
     attributes = Column(Text)
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
     event_id = Column(
         Integer, ForeignKey("events.event_id", ondelete="CASCADE"), index=True
     )
@@ -121,6 +192,7 @@ class States(Base):  # type: ignore
     )
     event = relationship("Events", uselist=False)
     old_state = relationship("States", remote_side=[state_id])
+    state_attributes = relationship("StateAttributes", uselist=False)
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
@@ -131,34 +203,45 @@ class States(Base):  # type: ignore
     @staticmethod
     def from_event(event):
         """Create object from a state_changed event."""
+        return States(**States.values_from_event(event))
+
+    @staticmethod
+    def values_from_event(event):
+        """Return the column values of a state_changed event."""
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
-        dbstate = States(entity_id=entity_id)
-
         # State got deleted
         if state is None:
-            dbstate.state = ""
-            dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
-            dbstate.last_changed = event.time_fired
-            dbstate.last_updated = event.time_fired
-        else:
-            dbstate.domain = state.domain
-            dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
-            dbstate.last_changed = state.last_changed
-            dbstate.last_updated = state.last_updated
-
-        return dbstate
+            return {
+                "entity_id": entity_id,
+                "state": "",
+                "domain": split_entity_id(entity_id)[0],
+                "attributes": "{}",
+                "last_changed": event.time_fired,
+                "last_updated": event.time_fired,
+            }
+
+        return {
+            "entity_id": entity_id,
+            "state": state.state,
+            "domain": state.domain,
+            "attributes": json.dumps(dict(state.attributes), cls=JSONEncoder),
+            "last_changed": state.last_changed,
+            "last_updated": state.last_updated,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to an HA state object."""
         try:
+            if self.attributes is None and self.state_attributes is not None:
+                attributes = json.loads(self.state_attributes.shared_attrs)
+            else:
+                attributes = json.loads(self.attributes)
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                attributes,
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
                 # Join the events table on event_id to get the context instead
@@ -172,6 +255,88 @@ class States(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):  # type: ignore
+    """State attribute change history, shared between states."""
+
+    __table_args__ = {
+        "mysql_default_charset": "utf8mb4",
+        "mysql_collate": "utf8mb4_unicode_ci",
+    }
+    __tablename__ = TABLE_STATE_ATTRIBUTES
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def from_shared_attrs(shared_attrs):
+        """Create object from the json encoded attributes of a state."""
+        return StateAttributes(
+            hash=StateAttributes.hash_shared_attrs(shared_attrs),
+            shared_attrs=shared_attrs,
+        )
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return a signed 64 bit content hash of the json encoded attributes."""
+        return int.from_bytes(
+            hashlib.sha256(shared_attrs.encode("utf-8")).digest()[:8],
+            "big",
+            signed=True,
+        )
+
+
+class StatisticsBase:
+    """Rollup of the numeric states of an entity over a fixed period."""
+
+    duration: timedelta
+
+    id = Column(Integer, primary_key=True)
+    created = Column(DateTime(timezone=True), default=dt_util.utcnow)
+    entity_id = Column(String(255))
+    start = Column(DateTime(timezone=True))
+    mean = Column(Float)
+    min = Column(Float)
+    max = Column(Float)
+    sum = Column(Float)
+
+    @declared_attr
+    def __table_args__(cls):  # pylint: disable=no-self-argument
+        """Index statistics by entity and period start."""
+        return (
+            Index(
+                f"ix_{cls.__tablename__}_entity_id_start",
+                "entity_id",
+                "start",
+                unique=True,
+            ),
+        )
+
+    def as_dict(self):
+        """Return a JSON friendly dict of the statistic."""
+        return {
+            "entity_id": self.entity_id,
+            "start": process_timestamp_to_utc_isoformat(self.start),
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "sum": self.sum,
+        }
+
+
+class Statistics(Base, StatisticsBase):  # type: ignore
+    """Hourly statistics."""
+
+    __tablename__ = TABLE_STATISTICS
+    duration = timedelta(hours=1)
+
+
+class StatisticsShortTerm(Base, StatisticsBase):  # type: ignore
+    """Five minute statistics."""
+
+    __tablename__ = TABLE_STATISTICS_SHORT_TERM
+    duration = timedelta(minutes=5)
+
+
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
 
@@ -219,6 +384,21 @@ class SchemaChanges(Base):  # type: ignore
     changed = Column(DateTime(timezone=True), default=dt_util.utcnow)
 
 
+def decode_shared_attrs(attributes_hash, shared_attrs):
+    """Decode shared attributes json, caching the result by its content hash.
+
+    Each caller gets its own copy of the cached dict, so changing it does not
+    change the attributes of other states.
+    """
+    attributes = _SHARED_ATTRS_CACHE.get(attributes_hash)
+    if attributes is None:
+        attributes = json.loads(shared_attrs)
+        if len(_SHARED_ATTRS_CACHE) >= SHARED_ATTRS_CACHE_SIZE:
+            _SHARED_ATTRS_CACHE.clear()
+        _SHARED_ATTRS_CACHE[attributes_hash] = attributes
+    return dict(attributes)
+
+
 def process_timestamp(ts):
     """Process a timestamp into datetime object."""
     if ts is None:
@@ -7,71 +7,61 @@ from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
-from .util import execute, session_scope
+from .models import Events, RecorderRuns, StateAttributes, States, StatisticsShortTerm
+from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Rows deleted per table in one purge transaction, sqlite allows
+# at most 999 variables in a statement
+MAX_ROWS_TO_PURGE = 998
+
+# Pages freed by one incremental vacuum step, 4MB with the default page size
+INCREMENTAL_VACUUM_PAGES = 1024
+
+# Value of PRAGMA auto_vacuum when the database uses incremental vacuum
+SQLITE_AUTO_VACUUM_INCREMENTAL = 2
+
 
 def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     """Purge events and states older than purge_days ago.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Deletes at most MAX_ROWS_TO_PURGE states and events per call, so new
+    events keep being committed in between. Returns False until done.
     """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
     _LOGGER.debug("Purging states and events before target %s", purge_before)
 
     try:
         with session_scope(session=instance.get_session()) as session:
-            # Purge a max of 1 hour, based on the oldest states or events record
-            batch_purge_before = purge_before
-
-            query = session.query(States).order_by(States.last_updated.asc()).limit(1)
-            states = execute(query, to_native=True, validate_entity_ids=False)
-            if states:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    states[0].last_updated + timedelta(hours=1),
-                )
-
-            query = session.query(Events).order_by(Events.time_fired.asc()).limit(1)
-            events = execute(query, to_native=True)
-            if events:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    events[0].time_fired + timedelta(hours=1),
-                )
-
-            _LOGGER.debug("Purging states and events before %s", batch_purge_before)
+            state_ids = _select_state_ids_to_purge(session, purge_before)
+            if state_ids:
+                _purge_state_ids(session, state_ids)
 
-            deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
+            event_ids = _select_event_ids_to_purge(session, purge_before)
+            if event_ids:
+                _purge_event_ids(session, event_ids)
 
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < batch_purge_before)
-                .delete(synchronize_session=False)
+            statistic_ids = _select_short_term_statistic_ids_to_purge(
+                session, purge_before
             )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
-
-            # If states or events purging isn't processing the purge_before yet,
-            # return false, as we are not done yet.
-            if batch_purge_before != purge_before:
+            if statistic_ids:
+                _purge_short_term_statistic_ids(session, statistic_ids)
+
+            if MAX_ROWS_TO_PURGE in (
+                len(state_ids),
+                len(event_ids),
+                len(statistic_ids),
+            ):
                 _LOGGER.debug("Purging hasn't fully completed yet")
                 return False
 
-            # Recorder runs is small, no need to batch run it
-            deleted_rows = (
-                session.query(RecorderRuns)
-                .filter(RecorderRuns.start < purge_before)
-                .filter(RecorderRuns.run_id != instance.run_info.run_id)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
+            _purge_old_recorder_runs(instance, session, purge_before)
+            _purge_unused_attributes(instance, session)
+
+        if instance.engine.driver == "pysqlite" and instance.incremental_vacuum:
+            # The recorder frees the pages with incremental_vacuum
+            return True
 
         if repack:
             # Execute sqlite or postgresql vacuum command to free up space on disk
@@ -81,7 +71,9 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             # Optimize mysql / mariadb tables to free up space on disk
             elif instance.engine.driver in ("mysqldb", "pymysql"):
                 _LOGGER.debug("Optimizing SQL DB to free space")
-                instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+                instance.engine.execute(
+                    "OPTIMIZE TABLE states, state_attributes, events, recorder_runs"
+                )
 
     except OperationalError as err:
         # Retry when one of the following MySQL errors occurred:
@@ -101,3 +93,146 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s", err)
     return True
+
+
+def incremental_vacuum(instance, repack: bool) -> bool:
+    """Free the pages of purged rows a few at a time.
+
+    Runs as its own task after the rows have been purged, so the purge
+    does not run again for every step. Returns False while there are more
+    pages to free.
+    """
+    try:
+        with instance.engine.connect() as connection:
+            auto_vacuum = connection.execute("PRAGMA auto_vacuum").scalar()
+            if auto_vacuum != SQLITE_AUTO_VACUUM_INCREMENTAL:
+                if repack:
+                    # Switching an existing database needs one full vacuum
+                    _LOGGER.debug("Vacuuming SQL DB to enable incremental vacuum")
+                    connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                    connection.execute("VACUUM")
+                return True
+
+            # SQLite frees a single page each time the pragma is stepped and
+            # the driver only steps statements without result columns once
+            free_pages = connection.execute("PRAGMA freelist_count").scalar()
+            for _ in range(min(free_pages, INCREMENTAL_VACUUM_PAGES)):
+                connection.execute("PRAGMA incremental_vacuum")
+            free_pages = connection.execute("PRAGMA freelist_count").scalar()
+    except SQLAlchemyError as err:
+        _LOGGER.warning("Error vacuuming SQL DB: %s", err)
+        return True
+
+    _LOGGER.debug("Incremental vacuum done, %s free pages left", free_pages)
+    return not free_pages
+
+
+def _select_state_ids_to_purge(session, purge_before):
+    """Return the ids of the oldest states to purge."""
+    state_ids = [
+        state.state_id
+        for state in session.query(States.state_id)
+        .filter(States.last_updated < purge_before)
+        .order_by(States.last_updated)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+    _LOGGER.debug("Selected %s state ids to remove", len(state_ids))
+    return state_ids
+
+
+def _select_event_ids_to_purge(session, purge_before):
+    """Return the ids of the oldest events to purge."""
+    event_ids = [
+        event.event_id
+        for event in session.query(Events.event_id)
+        .filter(Events.time_fired < purge_before)
+        .order_by(Events.time_fired)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+    _LOGGER.debug("Selected %s event ids to remove", len(event_ids))
+    return event_ids
+
+
+def _select_short_term_statistic_ids_to_purge(session, purge_before):
+    """Return the ids of the oldest short term statistics to purge.
+
+    Long term statistics are kept when their states are purged.
+    """
+    statistic_ids = [
+        statistic.id
+        for statistic in session.query(StatisticsShortTerm.id)
+        .filter(StatisticsShortTerm.start < purge_before)
+        .order_by(StatisticsShortTerm.start)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+    _LOGGER.debug("Selected %s short term statistic ids to remove", len(statistic_ids))
+    return statistic_ids
+
+
+def _purge_state_ids(session, state_ids):
+    """Delete states by id."""
+    # Newer states still point to the purged ones
+    disconnected_rows = (
+        session.query(States)
+        .filter(States.old_state_id.in_(state_ids))
+        .update({"old_state_id": None}, synchronize_session=False)
+    )
+    _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
+
+    deleted_rows = (
+        session.query(States)
+        .filter(States.state_id.in_(state_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s states", deleted_rows)
+
+
+def _purge_event_ids(session, event_ids):
+    """Delete events by id."""
+    deleted_rows = (
+        session.query(Events)
+        .filter(Events.event_id.in_(event_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s events", deleted_rows)
+
+
+def _purge_short_term_statistic_ids(session, statistic_ids):
+    """Delete short term statistics by id."""
+    deleted_rows = (
+        session.query(StatisticsShortTerm)
+        .filter(StatisticsShortTerm.id.in_(statistic_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
+
+
+def _purge_old_recorder_runs(instance, session, purge_before):
+    """Purge all old recorder runs."""
+    # Recorder runs is small, no need to batch run it
+    deleted_rows = (
+        session.query(RecorderRuns)
+        .filter(RecorderRuns.start < purge_before)
+        .filter(RecorderRuns.run_id != instance.run_info.run_id)
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
+
+
+def _purge_unused_attributes(instance, session):
+    """Purge the shared attributes no longer used by any state."""
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(
+            ~StateAttributes.attributes_id.in_(
+                session.query(States.attributes_id)
+                .filter(States.attributes_id.isnot(None))
+                .distinct()
+            )
+        )
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s state_attributes", deleted_rows)
+    if deleted_rows:
+        # The recorder must not link new states to the deleted rows
+        instance._state_attributes_ids = {}  # pylint: disable=protected-access
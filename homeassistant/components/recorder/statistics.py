@@ -0,0 +1,183 @@
+"""Long term statistics for numeric sensors."""
+from datetime import timedelta
+from itertools import groupby
+import logging
+
+from sqlalchemy import func
+
+import homeassistant.util.dt as dt_util
+
+from .models import States, Statistics, StatisticsShortTerm, process_timestamp
+from .util import execute, session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+STATISTICS_DOMAINS = ("sensor",)
+
+STATISTIC_PERIODS = {
+    "hour": Statistics,
+    "5minute": StatisticsShortTerm,
+}
+
+
+def period_start(now, table):
+    """Return the start of the period of table that now falls into."""
+    period = table.duration.total_seconds()
+    timestamp = dt_util.as_timestamp(now)
+    return dt_util.utc_from_timestamp(timestamp - timestamp % period)
+
+
+def compile_missing_statistics(instance, now) -> None:
+    """Compile statistics for every period that closed since the last run."""
+    tables = [Statistics]
+    if instance.short_term_statistics:
+        tables.append(StatisticsShortTerm)
+
+    for table in tables:
+        last_closed_start = period_start(now, table) - table.duration
+        start = instance.statistics_compiled_until.get(table)
+        if start is None:
+            with session_scope(session=instance.get_session()) as session:
+                last_start = session.query(func.max(table.start)).scalar()
+            if last_start is None:
+                start = last_closed_start
+            else:
+                start = process_timestamp(last_start) + table.duration
+            # Raw states older than this have been purged
+            start = max(
+                start,
+                period_start(now - timedelta(days=instance.keep_days), table),
+            )
+
+        while start <= last_closed_start:
+            try:
+                compile_statistics(instance, table, start)
+            except Exception:  # pylint: disable=broad-except
+                # Move on so a period that cannot be compiled is not retried
+                _LOGGER.exception(
+                    "Error compiling %s for %s",
+                    table.__tablename__,
+                    start,
+                )
+            start += table.duration
+        instance.statistics_compiled_until[table] = start
+
+
+def compile_statistics(instance, table, start) -> None:
+    """Compile the statistics of the period of table starting at start."""
+    end = start + table.duration
+    _LOGGER.debug("Compiling %s statistics for %s-%s", table.__tablename__, start, end)
+
+    with session_scope(session=instance.get_session()) as session:
+        # The state of each entity when the period started, however long
+        # ago it last changed
+        last_updated = (
+            session.query(
+                States.entity_id,
+                func.max(States.last_updated).label("max_last_updated"),
+            )
+            .filter(States.domain.in_(STATISTICS_DOMAINS))
+            .filter(States.last_updated < start)
+            .group_by(States.entity_id)
+            .subquery()
+        )
+        initial_states = {
+            row.entity_id: row.state
+            for row in execute(
+                session.query(States.entity_id, States.state)
+                .join(
+                    last_updated,
+                    (States.entity_id == last_updated.c.entity_id)
+                    & (States.last_updated == last_updated.c.max_last_updated),
+                )
+                .order_by(States.state_id)
+            )
+        }
+
+        period_states = execute(
+            session.query(States.entity_id, States.state, States.last_updated)
+            .filter(States.domain.in_(STATISTICS_DOMAINS))
+            .filter(States.last_updated >= start)
+            .filter(States.last_updated < end)
+            .order_by(States.entity_id, States.last_updated)
+        )
+
+        changes = {
+            entity_id: [
+                (process_timestamp(row.last_updated), row.state) for row in rows
+            ]
+            for entity_id, rows in groupby(period_states, lambda row: row.entity_id)
+        }
+
+        for entity_id in set(initial_states).union(changes):
+            samples = changes.get(entity_id, [])
+            if entity_id in initial_states:
+                samples.insert(0, (start, initial_states[entity_id]))
+            statistic = _compile_entity_statistic(
+                samples, entity_id in initial_states, end
+            )
+            if statistic is None:
+                continue
+            session.add(table(entity_id=entity_id, start=start, **statistic))
+
+
+def _compile_entity_statistic(samples, has_initial_state, end):
+    """Return the time weighted mean, min, max and sum of the numeric samples.
+
+    Non numeric states (like unavailable) are left out of the mean.
+    The initial state only counts towards the mean, min and max.
+    """
+    weighted_total = 0.0
+    duration = 0.0
+    minimum = maximum = None
+    total = 0.0
+
+    for idx, (sample_time, state) in enumerate(samples):
+        try:
+            value = float(state)
+        except (TypeError, ValueError):
+            continue
+
+        next_time = samples[idx + 1][0] if idx + 1 < len(samples) else end
+        seconds = (next_time - sample_time).total_seconds()
+        weighted_total += value * seconds
+        duration += seconds
+        minimum = value if minimum is None else min(minimum, value)
+        maximum = value if maximum is None else max(maximum, value)
+        if idx or not has_initial_state:
+            total += value
+
+    if minimum is None:
+        return None
+
+    return {
+        "mean": weighted_total / duration if duration else minimum,
+        "min": minimum,
+        "max": maximum,
+        "sum": total,
+    }
+
+
+def statistics_during_period(
+    hass, start_time, end_time=None, entity_ids=None, period="hour"
+):
+    """Return statistics during UTC period start_time - end_time.
+
+    The result is a dict of entity_id to a list of statistic dicts.
+    """
+    table = STATISTIC_PERIODS[period]
+
+    with session_scope(hass=hass) as session:
+        query = session.query(table).filter(table.start >= start_time)
+        if end_time is not None:
+            query = query.filter(table.start < end_time)
+        if entity_ids is not None:
+            query = query.filter(table.entity_id.in_(entity_ids))
+        query = query.order_by(table.entity_id, table.start)
+
+        return {
+            entity_id: [statistic.as_dict() for statistic in statistics]
+            for entity_id, statistics in groupby(
+                execute(query), lambda statistic: statistic.entity_id
+            )
+        }
@@ -1,7 +1,8 @@
 """Support for statistics for sensor values."""
+from bisect import bisect_left, insort
 from collections import deque
 import logging
-import statistics
+import math
 
 import voluptuous as vol
 
@@ -97,8 +98,9 @@ class StatisticsSensor(Entity):
         self._max_age = max_age
         self._precision = precision
         self._unit_of_measurement = None
-        self.states = deque(maxlen=self._sampling_size)
-        self.ages = deque(maxlen=self._sampling_size)
+        self.states = deque()
+        self.ages = deque()
+        self._window = StatisticsWindow()
 
         self.count = 0
         self.mean = self.median = self.stdev = self.variance = None
@@ -153,7 +155,9 @@ class StatisticsSensor(Entity):
             if self.is_binary:
                 self.states.append(new_state.state)
             else:
-                self.states.append(float(new_state.state))
+                value = float(new_state.state)
+                self.states.append(value)
+                self._window.add(value)
 
             self.ages.append(new_state.last_updated)
         except ValueError:
@@ -210,7 +214,13 @@ class StatisticsSensor(Entity):
         return ICON
 
     def _purge_old(self):
-        """Remove states which are older than self._max_age."""
+        """Remove states beyond the sampling size or older than self._max_age."""
+        while len(self.states) > self._sampling_size:
+            self._remove_oldest()
+
+        if self._max_age is None:
+            return
+
         now = dt_util.utcnow()
 
         _LOGGER.debug(
@@ -227,8 +237,14 @@ class StatisticsSensor(Entity):
                 dt_util.as_local(self.ages[0]),
                 (now - self.ages[0]),
             )
-            self.ages.popleft()
-            self.states.popleft()
+            self._remove_oldest()
+
+    def _remove_oldest(self):
+        """Remove the oldest state."""
+        self.ages.popleft()
+        value = self.states.popleft()
+        if not self.is_binary:
+            self._window.remove(value)
 
     def _next_to_purge_timestamp(self):
         """Find the timestamp when the next purge would occur."""
@@ -242,30 +258,35 @@ class StatisticsSensor(Entity):
     async def async_update(self):
         """Get the latest data and updates the states."""
         _LOGGER.debug("%s: updating statistics", self.entity_id)
-        if self._max_age is not None:
-            self._purge_old()
+        self._purge_old()
 
         self.count = len(self.states)
 
         if not self.is_binary:
-            try:  # require only one data point
-                self.mean = round(statistics.mean(self.states), self._precision)
-                self.median = round(statistics.median(self.states), self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            window = self._window
+
+            if self.count:  # require only one data point
+                self.mean = round(window.mean, self._precision)
+                self.median = round(window.median, self._precision)
+            else:
+                _LOGGER.debug(
+                    "%s: mean requires at least one data point", self.entity_id
+                )
                 self.mean = self.median = STATE_UNKNOWN
 
-            try:  # require at least two data points
-                self.stdev = round(statistics.stdev(self.states), self._precision)
-                self.variance = round(statistics.variance(self.states), self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            if self.count > 1:  # require at least two data points
+                self.stdev = round(math.sqrt(window.variance), self._precision)
+                self.variance = round(window.variance, self._precision)
+            else:
+                _LOGGER.debug(
+                    "%s: variance requires at least two data points", self.entity_id
+                )
                 self.stdev = self.variance = STATE_UNKNOWN
 
             if self.states:
-                self.total = round(sum(self.states), self._precision)
-                self.min = round(min(self.states), self._precision)
-                self.max = round(max(self.states), self._precision)
+                self.total = round(window.total, self._precision)
+                self.min = round(window.min, self._precision)
+                self.max = round(window.max, self._precision)
 
                 self.min_age = self.ages[0]
                 self.max_age = self.ages[-1]
@@ -352,3 +373,80 @@ class StatisticsSensor(Entity):
         self.async_schedule_update_ha_state(True)
 
         _LOGGER.debug("%s: initializing from database completed", self.entity_id)
+
+
+class StatisticsWindow:
+    """Running statistics of values that are removed in the order they were added.
+
+    Adding and removing a value keeps the sum, mean and variance up to date
+    with Welford's algorithm and the values sorted for the median, min and
+    max. The running values are recalculated from scratch each time as many
+    values were removed as the window holds, to stop rounding errors from
+    adding up.
+    """
+
+    def __init__(self):
+        """Initialize an empty window."""
+        self._sorted = []
+        self._removed = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self._sum_squares = 0.0
+
+    def __len__(self):
+        """Return the number of values in the window."""
+        return len(self._sorted)
+
+    @property
+    def median(self):
+        """Return the median of the values."""
+        values = self._sorted
+        middle = len(values) // 2
+        if len(values) % 2:
+            return values[middle]
+        return (values[middle - 1] + values[middle]) / 2
+
+    @property
+    def min(self):
+        """Return the smallest value."""
+        return self._sorted[0]
+
+    @property
+    def max(self):
+        """Return the largest value."""
+        return self._sorted[-1]
+
+    @property
+    def variance(self):
+        """Return the sample variance of the values."""
+        return max(self._sum_squares, 0.0) / (len(self._sorted) - 1)
+
+    def add(self, value):
+        """Add a value to the window."""
+        insort(self._sorted, value)
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / len(self._sorted)
+        self._sum_squares += delta * (value - self.mean)
+
+    def remove(self, value):
+        """Remove a value that was added before from the window."""
+        values = self._sorted
+        del values[bisect_left(values, value)]
+        self._removed += 1
+        if self._removed >= len(values):
+            self._recalculate()
+            return
+
+        self.total -= value
+        delta = value - self.mean
+        self.mean -= delta / len(values)
+        self._sum_squares -= delta * (value - self.mean)
+
+    def _recalculate(self):
+        """Calculate the running values from scratch."""
+        values = self._sorted
+        self._removed = 0
+        self.total = math.fsum(values)
+        self.mean = self.total / len(values) if values else 0.0
+        self._sum_squares = math.fsum((value - self.mean) ** 2 for value in values)
@@ -20,21 +20,45 @@ import threading
 import time
 from types import MappingProxyType
 
+import voluptuous as vol
+
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
 
 from .const import (
     ATTR_ENDPOINTS,
+    ATTR_LOOKBACK,
     ATTR_STREAMS,
+    CONF_LOOKBACK_BUFFER_PATH,
+    CONF_LOOKBACK_BUFFER_SIZE,
     DOMAIN,
     MAX_SEGMENTS,
     OUTPUT_IDLE_TIMEOUT,
+    OUTPUT_LOOKBACK,
     STREAM_RESTART_INCREMENT,
     STREAM_RESTART_RESET_TIME,
 )
 from .core import PROVIDERS, IdleTimer
 from .hls import async_setup_hls
+from .lookback import async_remove_lookback, async_setup_lookback
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                # Size in MB of the lookback buffer kept on disk for each
+                # stream that is kept alive, 0 disables the buffer
+                vol.Optional(CONF_LOOKBACK_BUFFER_SIZE, default=0): vol.All(
+                    vol.Coerce(int), vol.Range(min=0)
+                ),
+                vol.Optional(CONF_LOOKBACK_BUFFER_PATH): cv.isdir,
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -85,12 +109,21 @@ async def async_setup(hass, config):
     # Setup Recorder
     async_setup_recorder(hass)
 
+    # Setup lookback buffers
+    conf = config.get(DOMAIN) or {}
+    await async_setup_lookback(
+        hass,
+        conf.get(CONF_LOOKBACK_BUFFER_SIZE, 0) * 1024 * 1024,
+        conf.get(CONF_LOOKBACK_BUFFER_PATH),
+    )
+
     @callback
     def shutdown(event):
         """Stop all stream workers."""
         for stream in hass.data[DOMAIN][ATTR_STREAMS]:
             stream.keepalive = False
             stream.stop()
+        async_remove_lookback(hass)
         _LOGGER.info("Stopped stream workers")
 
     hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, shutdown)
@@ -112,6 +145,8 @@ class Stream:
         self._thread_quit = threading.Event()
         self._outputs = {}
         self._fast_restart_once = False
+        # Latest video keyframe, set by the worker while it runs
+        self.keyframe = None
 
         if self.options is None:
             self.options = {}
@@ -158,11 +193,16 @@ class Stream:
 
     def check_idle(self):
         """Reset access token if all providers are idle."""
-        if all([p.idle for p in self._outputs.values()]):
+        # The lookback buffer is fed by the worker and is not a viewer
+        if all(p.idle for fmt, p in self._outputs.items() if fmt != OUTPUT_LOOKBACK):
             self.access_token = None
 
     def start(self):
         """Start a stream."""
+        # Streams that are kept alive keep a buffer on disk for recordings
+        if self.keepalive and ATTR_LOOKBACK in self.hass.data[DOMAIN]:
+            self.add_provider(OUTPUT_LOOKBACK)
+
         if self._thread is None or not self._thread.is_alive():
             if self._thread is not None:
                 # The thread must have crashed/exited. Join to clean up the
@@ -240,6 +280,13 @@ class Stream:
             self._thread = None
             _LOGGER.info("Stopped stream: %s", self.source)
 
+    async def async_get_image(self):
+        """Return the latest keyframe of the running stream as a JPEG image."""
+        keyframe = self.keyframe
+        if keyframe is None or self._thread is None or not self._thread.is_alive():
+            return None
+        return await self.hass.async_add_executor_job(keyframe.to_jpeg)
+
     async def async_record(self, video_path, duration=30, lookback=5):
         """Make a .mp4 recording from a provided stream."""
 
@@ -259,8 +306,13 @@ class Stream:
         self.start()
 
         # Take advantage of lookback
+        lookback_output = self.outputs.get(OUTPUT_LOOKBACK)
         hls = self.outputs.get("hls")
-        if lookback > 0 and hls:
+        if lookback > 0 and lookback_output and lookback_output.segments:
+            # Wait for latest segment, then add the lookback from disk
+            await lookback_output.recv()
+            recorder.prepend(await lookback_output.async_open_segments(lookback))
+        elif lookback > 0 and hls:
             num_segments = min(int(lookback // hls.target_duration), MAX_SEGMENTS)
             # Wait for latest segment, then add the lookback
             await hls.recv()
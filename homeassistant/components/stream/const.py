@@ -3,8 +3,13 @@ DOMAIN = "stream"
 
 ATTR_ENDPOINTS = "endpoints"
 ATTR_STREAMS = "streams"
+ATTR_LOOKBACK = "lookback"
+
+CONF_LOOKBACK_BUFFER_PATH = "lookback_buffer_path"
+CONF_LOOKBACK_BUFFER_SIZE = "lookback_buffer_size"
 
 OUTPUT_FORMATS = ["hls"]
+OUTPUT_LOOKBACK = "lookback"
 
 FORMAT_CONTENT_TYPE = {"hls": "application/vnd.apple.mpegurl"}
 
@@ -13,6 +18,10 @@ OUTPUT_IDLE_TIMEOUT = 300  # Idle timeout due to inactivity
 NUM_PLAYLIST_SEGMENTS = 3  # Number of segments to use in HLS playlist
 MAX_SEGMENTS = 4  # Max number of segments to keep around
 MIN_SEGMENT_DURATION = 1.5  # Each segment is at least this many seconds
+TARGET_PART_DURATION = 1.0  # Each LL-HLS part is at most this many seconds
+# A fragment is cut once it reaches this duration, leaving room for one frame
+# so parts stay within the advertised target duration
+PART_FRAGMENT_DURATION = 0.85 * TARGET_PART_DURATION
 
 PACKETS_TO_WAIT_FOR_AUDIO = 20  # Some streams have an audio stream with no audio
 MAX_TIMESTAMP_GAP = 10000  # seconds - anything from 10 to 50000 is probably reasonable
@@ -2,7 +2,7 @@
 import asyncio
 from collections import deque
 import io
-from typing import Any, Callable, List
+from typing import Any, Callable, List, Optional
 
 from aiohttp import web
 import attr
@@ -25,6 +25,20 @@ class StreamBuffer:
     output = attr.ib()  # type=av.OutputContainer
     vstream = attr.ib()  # type=av.VideoStream
     astream = attr.ib(default=None)  # type=Optional[av.AudioStream]
+    # The completed parts and the part being written to the segment
+    parts: list = attr.ib(factory=list)
+    part_start: int = attr.ib(default=0)
+    part_time: Optional[float] = attr.ib(default=None)
+    part_keyframe: bool = attr.ib(default=False)
+
+
+@attr.s
+class Part:
+    """Represent a part of a segment, one fragment of the fragmented mp4."""
+
+    duration: float = attr.ib()
+    has_keyframe: bool = attr.ib()
+    data: bytes = attr.ib()
 
 
 @attr.s
@@ -34,6 +48,17 @@ class Segment:
     sequence: int = attr.ib()
     segment: io.BytesIO = attr.ib()
     duration: float = attr.ib()
+    parts: List[Part] = attr.ib(factory=list)
+
+
+def fmp4_container_options(sequence: int) -> dict:
+    """Return the container options to mux a segment as a fragmented mp4."""
+    return {
+        # Removed skip_sidx - see https://github.com/home-assistant/core/pull/39970
+        "movflags": "frag_custom+empty_moov+default_base_moof+frag_discont",
+        "avoid_negative_ts": "make_non_negative",
+        "fragment_index": str(sequence),
+    }
 
 
 class IdleTimer:
@@ -158,6 +183,9 @@ class StreamOutput:
         self._cursor = segment.sequence
         return segment
 
+    def put_part(self, sequence: int, part: Part) -> None:
+        """Store a part of the segment being produced, when the output uses parts."""
+
     def put(self, segment: Segment) -> None:
         """Store output."""
         self._hass.loop.call_soon_threadsafe(self._async_put, segment)
@@ -189,7 +217,7 @@ class StreamView(HomeAssistantView):
     requires_auth = False
     platform = None
 
-    async def get(self, request, token, sequence=None):
+    async def get(self, request, token, sequence=None, part_num=None):
         """Start a GET request."""
         hass = request.app["hass"]
 
@@ -204,8 +232,8 @@ class StreamView(HomeAssistantView):
         # Start worker if not already started
         stream.start()
 
-        return await self.handle(request, stream, sequence)
+        return await self.handle(request, stream, sequence, part_num)
 
-    async def handle(self, request, stream, sequence):
+    async def handle(self, request, stream, sequence, part_num):
         """Handle the stream request."""
         raise NotImplementedError()
@@ -1,10 +1,13 @@
 """Utilities to help convert mp4s to fmp4s."""
 import io
+from typing import Dict, Iterator, Optional, Tuple
 
 
-def find_box(segment: io.BytesIO, target_type: bytes, box_start: int = 0) -> int:
+def find_box(
+    segment: io.BytesIO, target_type: bytes, box_start: Optional[int] = None
+) -> int:
     """Find location of first box (or sub_box if box_start provided) of given type."""
-    if box_start == 0:
+    if box_start is None:
         box_end = segment.seek(0, io.SEEK_END)
         segment.seek(0)
         index = 0
@@ -38,6 +41,70 @@ def get_m4s(segment: io.BytesIO, sequence: int) -> bytes:
     return segment.read(mfra_location - moof_location)
 
 
+def get_timescales(segment: io.BytesIO) -> Dict[int, int]:
+    """Get the timescale of each track in the moov box, keyed by track id."""
+    timescales = {}
+    moov_location = next(find_box(segment, b"moov"))
+    for trak_location in find_box(segment, b"trak", moov_location):
+        tkhd_location = next(find_box(segment, b"tkhd", trak_location))
+        mdia_location = next(find_box(segment, b"mdia", trak_location))
+        mdhd_location = next(find_box(segment, b"mdhd", mdia_location))
+        # The fields before track_ID and timescale depend on the box version
+        track_id = _read_versioned_field(segment, tkhd_location, 20, 28, 4)
+        timescales[track_id] = _read_versioned_field(segment, mdhd_location, 20, 28, 4)
+    return timescales
+
+
+def get_decode_times(fragment: bytes) -> Dict[int, int]:
+    """Get the first base media decode time of each track in fmp4 fragments."""
+    decode_times: Dict[int, int] = {}
+    for track_id, location, size in _find_decode_times(io.BytesIO(fragment)):
+        if track_id not in decode_times:
+            decode_times[track_id] = int.from_bytes(
+                fragment[location : location + size], byteorder="big"
+            )
+    return decode_times
+
+
+def shift_decode_times(fragment: bytes, shifts: Dict[int, int]) -> bytes:
+    """Move the base media decode times of fmp4 fragments back by a shift per track."""
+    data = bytearray(fragment)
+    for track_id, location, size in _find_decode_times(io.BytesIO(fragment)):
+        if track_id not in shifts:
+            continue
+        decode_time = int.from_bytes(data[location : location + size], byteorder="big")
+        data[location : location + size] = max(
+            decode_time - shifts[track_id], 0
+        ).to_bytes(size, byteorder="big")
+    return bytes(data)
+
+
+def _find_decode_times(fragment: io.BytesIO) -> Iterator[Tuple[int, int, int]]:
+    """Find the track id, location and size of each base media decode time."""
+    for moof_location in find_box(fragment, b"moof"):
+        for traf_location in find_box(fragment, b"traf", moof_location):
+            tfhd_location = next(find_box(fragment, b"tfhd", traf_location))
+            tfdt_location = next(find_box(fragment, b"tfdt", traf_location), None)
+            if tfdt_location is None:
+                continue
+            fragment.seek(tfhd_location + 12)
+            track_id = int.from_bytes(fragment.read(4), byteorder="big")
+            fragment.seek(tfdt_location + 8)
+            # A version 1 box stores the decode time in 64 bits
+            size = 8 if fragment.read(1)[0] == 1 else 4
+            yield track_id, tfdt_location + 12, size
+
+
+def _read_versioned_field(
+    segment: io.BytesIO, box_location: int, offset_v0: int, offset_v1: int, size: int
+) -> int:
+    """Read a field of a full box whose offset depends on the box version."""
+    segment.seek(box_location + 8)
+    version = segment.read(1)[0]
+    segment.seek(box_location + (offset_v1 if version == 1 else offset_v0))
+    return int.from_bytes(segment.read(size), byteorder="big")
+
+
 def get_codec_string(segment: io.BytesIO) -> str:
     """Get RFC 6381 codec string."""
     codecs = []
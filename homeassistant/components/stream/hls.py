@@ -1,13 +1,27 @@
 """Provide functionality to stream HLS."""
+import asyncio
 import io
-from typing import Callable
+from typing import Callable, List, Optional
 
 from aiohttp import web
-
-from homeassistant.core import callback
-
-from .const import FORMAT_CONTENT_TYPE, NUM_PLAYLIST_SEGMENTS
-from .core import PROVIDERS, StreamOutput, StreamView
+import async_timeout
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    FORMAT_CONTENT_TYPE,
+    NUM_PLAYLIST_SEGMENTS,
+    PART_FRAGMENT_DURATION,
+    TARGET_PART_DURATION,
+)
+from .core import (
+    PROVIDERS,
+    IdleTimer,
+    Part,
+    StreamOutput,
+    StreamView,
+    fmp4_container_options,
+)
 from .fmp4utils import get_codec_string, get_init, get_m4s
 
 
@@ -16,6 +30,7 @@ def async_setup_hls(hass):
     """Set up api endpoints."""
     hass.http.register_view(HlsPlaylistView())
     hass.http.register_view(HlsSegmentView())
+    hass.http.register_view(HlsPartView())
     hass.http.register_view(HlsInitView())
     hass.http.register_view(HlsMasterPlaylistView())
     return "/api/hls/{}/master_playlist.m3u8"
@@ -46,7 +61,7 @@ class HlsMasterPlaylistView(StreamView):
         ]
         return "\n".join(lines) + "\n"
 
-    async def handle(self, request, stream, sequence):
+    async def handle(self, request, stream, sequence, part_num):
         """Return m3u8 playlist."""
         track = stream.add_provider("hls")
         stream.start()
@@ -71,11 +86,27 @@ class HlsPlaylistView(StreamView):
         return [
             "#EXT-X-VERSION:7",
             f"#EXT-X-TARGETDURATION:{track.target_duration}",
+            f"#EXT-X-PART-INF:PART-TARGET={TARGET_PART_DURATION:.3f}",
+            "#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES,"
+            f"PART-HOLD-BACK={3 * TARGET_PART_DURATION:.3f}",
             '#EXT-X-MAP:URI="init.mp4"',
         ]
 
     @staticmethod
-    def render_playlist(track):
+    def render_parts(sequence, parts):
+        """Render the parts of a segment."""
+        lines = []
+        for part_num, part in enumerate(parts):
+            line = (
+                f"#EXT-X-PART:DURATION={part.duration:.3f},"
+                f'URI="./segment/{sequence}.{part_num}.m4s"'
+            )
+            if part.has_keyframe:
+                line += ",INDEPENDENT=YES"
+            lines.append(line)
+        return lines
+
+    def render_playlist(self, track):
         """Render playlist."""
         segments = track.segments[-NUM_PLAYLIST_SEGMENTS:]
 
@@ -86,6 +117,7 @@ class HlsPlaylistView(StreamView):
 
         for sequence in segments:
             segment = track.get_segment(sequence)
+            playlist.extend(self.render_parts(sequence, segment.parts))
             playlist.extend(
                 [
                     "#EXTINF:{:.04f},".format(float(segment.duration)),
@@ -93,6 +125,14 @@ class HlsPlaylistView(StreamView):
                 ]
             )
 
+        # The segment in progress is only available as parts
+        sequence = segments[-1] + 1
+        parts = track.get_parts(sequence) or []
+        playlist.extend(self.render_parts(sequence, parts))
+        playlist.append(
+            f'#EXT-X-PRELOAD-HINT:TYPE=PART,URI="./segment/{sequence}.{len(parts)}.m4s"'
+        )
+
         return playlist
 
     def render(self, track):
@@ -100,7 +140,7 @@ class HlsPlaylistView(StreamView):
         lines = ["#EXTM3U"] + self.render_preamble(track) + self.render_playlist(track)
         return "\n".join(lines) + "\n"
 
-    async def handle(self, request, stream, sequence):
+    async def handle(self, request, stream, sequence, part_num):
         """Return m3u8 playlist."""
         track = stream.add_provider("hls")
         stream.start()
@@ -108,6 +148,26 @@ class HlsPlaylistView(StreamView):
         if not track.segments:
             if not await track.recv():
                 return web.HTTPNotFound()
+
+        # Blocking playlist reload waits for the requested segment or part
+        if "_HLS_msn" in request.query:
+            try:
+                msn = int(request.query["_HLS_msn"])
+                part_num = (
+                    int(request.query["_HLS_part"])
+                    if "_HLS_part" in request.query
+                    else None
+                )
+            except ValueError:
+                return web.HTTPBadRequest()
+            if msn > track.segments[-1] + 2:
+                return web.HTTPBadRequest()
+            if not await track.async_wait_for(
+                lambda: track.has_part(msn, part_num),
+                3 * track.target_duration,
+            ):
+                return web.HTTPServiceUnavailable()
+
         headers = {"Content-Type": FORMAT_CONTENT_TYPE["hls"]}
         return web.Response(body=self.render(track).encode("utf-8"), headers=headers)
 
@@ -119,7 +179,7 @@ class HlsInitView(StreamView):
     name = "api:stream:hls:init"
     cors_allowed = True
 
-    async def handle(self, request, stream, sequence):
+    async def handle(self, request, stream, sequence, part_num):
         """Return init.mp4."""
         track = stream.add_provider("hls")
         segments = track.get_segment()
@@ -136,7 +196,7 @@ class HlsSegmentView(StreamView):
     name = "api:stream:hls:segment"
     cors_allowed = True
 
-    async def handle(self, request, stream, sequence):
+    async def handle(self, request, stream, sequence, part_num):
         """Return fmp4 segment."""
         track = stream.add_provider("hls")
         segment = track.get_segment(int(sequence))
@@ -149,10 +209,45 @@ class HlsSegmentView(StreamView):
         )
 
 
+class HlsPartView(StreamView):
+    """Stream view to serve a LL-HLS part of a segment."""
+
+    url = r"/api/hls/{token:[a-f0-9]+}/segment/{sequence:\d+}.{part_num:\d+}.m4s"
+    name = "api:stream:hls:part"
+    cors_allowed = True
+
+    async def handle(self, request, stream, sequence, part_num):
+        """Return fmp4 part, waiting for it when it is the next one."""
+        track = stream.add_provider("hls")
+        sequence = int(sequence)
+        part_num = int(part_num)
+
+        part = track.get_part(sequence, part_num)
+        if part is None and track.segments and sequence > track.segments[-1]:
+            # Preload hints reference the part that is being produced
+            await track.async_wait_for(
+                lambda: track.get_part(sequence, part_num) is not None,
+                3 * TARGET_PART_DURATION,
+            )
+            part = track.get_part(sequence, part_num)
+        if part is None:
+            return web.HTTPNotFound()
+
+        headers = {"Content-Type": "video/iso.segment"}
+        return web.Response(body=part.data, headers=headers)
+
+
 @PROVIDERS.register("hls")
 class HlsStreamOutput(StreamOutput):
     """Represents HLS Output formats."""
 
+    def __init__(self, hass: HomeAssistant, idle_timer: IdleTimer) -> None:
+        """Initialize HLS output."""
+        super().__init__(hass, idle_timer)
+        # The parts of the segment that is being produced
+        self._part_sequence = None
+        self._parts: List[Part] = []
+
     @property
     def name(self) -> str:
         """Return provider name."""
@@ -176,9 +271,74 @@ class HlsStreamOutput(StreamOutput):
     @property
     def container_options(self) -> Callable[[int], dict]:
         """Return Callable which takes a sequence number and returns container options."""
-        return lambda sequence: {
-            # Removed skip_sidx - see https://github.com/home-assistant/core/pull/39970
-            "movflags": "frag_custom+empty_moov+default_base_moof+frag_discont",
-            "avoid_negative_ts": "make_non_negative",
-            "fragment_index": str(sequence),
-        }
+
+        def container_options(sequence):
+            options = fmp4_container_options(sequence)
+            # Cut fragments by duration so they can be served as LL-HLS parts
+            options["movflags"] = "empty_moov+default_base_moof+frag_discont"
+            options["frag_duration"] = str(int(PART_FRAGMENT_DURATION * 1000000))
+            return options
+
+        return container_options
+
+    def get_parts(self, sequence: int) -> Optional[List[Part]]:
+        """Return the parts of a segment that are available."""
+        if sequence == self._part_sequence:
+            return self._parts
+        segment = self.get_segment(sequence)
+        return segment.parts if segment else None
+
+    def get_part(self, sequence: int, part_num: int) -> Optional[Part]:
+        """Return a part of a segment."""
+        parts = self.get_parts(sequence)
+        if parts is None or part_num >= len(parts):
+            return None
+        return parts[part_num]
+
+    def has_part(self, sequence: int, part_num: Optional[int]) -> bool:
+        """Return if the playlist contains a segment, or a part of it."""
+        if self._segments and sequence <= self._segments[-1].sequence:
+            return True
+        return (
+            part_num is not None
+            and sequence == self._part_sequence
+            and part_num < len(self._parts)
+        )
+
+    async def async_wait_for(self, condition: Callable[[], bool], timeout) -> bool:
+        """Wait until the output holds the data the condition checks for."""
+        try:
+            async with async_timeout.timeout(timeout):
+                while not condition():
+                    await self._event.wait()
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def put_part(self, sequence: int, part: Part) -> None:
+        """Store a part of the segment being produced."""
+        self._hass.loop.call_soon_threadsafe(self._async_put_part, sequence, part)
+
+    @callback
+    def _async_put_part(self, sequence: int, part: Part) -> None:
+        """Store a part from event loop."""
+        if sequence != self._part_sequence:
+            self._part_sequence = sequence
+            self._parts = []
+        self._parts.append(part)
+        self._event.set()
+        self._event.clear()
+
+    @callback
+    def _async_put(self, segment):
+        """Store a segment, which holds all of its parts, from event loop."""
+        if segment.sequence == self._part_sequence:
+            self._part_sequence = None
+            self._parts = []
+        super()._async_put(segment)
+
+    def cleanup(self):
+        """Handle cleanup."""
+        super().cleanup()
+        self._part_sequence = None
+        self._parts = []
@@ -0,0 +1,187 @@
+"""Provide a rolling buffer of stream segments on disk for recordings."""
+from collections import deque
+from contextlib import suppress
+from functools import partial
+import logging
+import os
+import shutil
+import tempfile
+from typing import Callable, List, Optional
+
+import attr
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import ATTR_LOOKBACK, DOMAIN, OUTPUT_LOOKBACK
+from .core import PROVIDERS, IdleTimer, Segment, StreamOutput, fmp4_container_options
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@attr.s
+class LookbackBuffer:
+    """Represent the configuration of the lookback buffers."""
+
+    path: str = attr.ib()
+    max_bytes: int = attr.ib()
+
+
+@attr.s
+class DiskSegment:
+    """Represent a segment stored in a lookback buffer."""
+
+    sequence: int = attr.ib()
+    path: str = attr.ib()
+    duration: float = attr.ib()
+    size: int = attr.ib()
+
+
+async def async_setup_lookback(
+    hass: HomeAssistant, max_bytes: int, path: Optional[str] = None
+) -> None:
+    """Set up the directory that holds the lookback buffers of all streams."""
+    if not max_bytes:
+        return
+
+    buffer_path = await hass.async_add_executor_job(
+        partial(tempfile.mkdtemp, prefix="lookback-", dir=path)
+    )
+    hass.data[DOMAIN][ATTR_LOOKBACK] = LookbackBuffer(buffer_path, max_bytes)
+
+
+@callback
+def async_remove_lookback(hass: HomeAssistant) -> None:
+    """Remove the lookback buffers of all streams."""
+    lookback = hass.data[DOMAIN].pop(ATTR_LOOKBACK, None)
+    if lookback is not None:
+        hass.async_add_executor_job(shutil.rmtree, lookback.path, True)
+
+
+@PROVIDERS.register(OUTPUT_LOOKBACK)
+class LookbackOutput(StreamOutput):
+    """Keep the latest segments of a stream on disk.
+
+    Segments are written to disk as they are produced, and the oldest ones are
+    removed once the buffer exceeds its size. The segments are kept as
+    fragmented mp4 so a recording can use them without remuxing.
+    """
+
+    def __init__(self, hass: HomeAssistant, idle_timer: IdleTimer) -> None:
+        """Initialize lookback output."""
+        super().__init__(hass, idle_timer)
+        lookback = hass.data[DOMAIN][ATTR_LOOKBACK]
+        self._base_path = lookback.path
+        self._max_bytes = lookback.max_bytes
+        # Only used from the worker thread
+        self._path = None
+        self._file_index = 0
+        # Only used from the event loop
+        self._segments = deque()
+        self._size = 0
+
+    @property
+    def name(self) -> str:
+        """Return provider name."""
+        return OUTPUT_LOOKBACK
+
+    @property
+    def format(self) -> str:
+        """Return container format."""
+        return "mp4"
+
+    @property
+    def audio_codecs(self) -> str:
+        """Return desired audio codecs."""
+        return {"aac", "mp3"}
+
+    @property
+    def video_codecs(self) -> tuple:
+        """Return desired video codecs."""
+        return {"hevc", "h264"}
+
+    @property
+    def container_options(self) -> Callable[[int], dict]:
+        """Return Callable which takes a sequence number and returns container options."""
+        return fmp4_container_options
+
+    def put(self, segment: Segment) -> None:
+        """Write the segment to disk from the worker thread."""
+        data = segment.segment.getvalue()
+        try:
+            if self._path is None:
+                self._path = tempfile.mkdtemp(dir=self._base_path)
+            self._file_index += 1
+            path = os.path.join(self._path, f"{self._file_index}.m4s")
+            with open(path, "wb") as segment_file:
+                segment_file.write(data)
+        except OSError as err:
+            _LOGGER.error("Unable to write lookback segment: %s", err)
+            return
+
+        self._hass.loop.call_soon_threadsafe(
+            self._async_put,
+            DiskSegment(segment.sequence, path, segment.duration, len(data)),
+        )
+
+    @callback
+    def _async_put(self, segment: DiskSegment) -> None:
+        """Add a segment written to disk and remove the oldest segments."""
+        self._idle_timer.start()
+        removed = []
+        if self._segments and segment.sequence <= self._segments[-1].sequence:
+            # The worker restarted, segments can no longer be joined
+            removed.extend(self._segments)
+            self._segments.clear()
+            self._size = 0
+
+        self._segments.append(segment)
+        self._size += segment.size
+        while self._size > self._max_bytes and len(self._segments) > 1:
+            oldest = self._segments.popleft()
+            self._size -= oldest.size
+            removed.append(oldest)
+
+        if removed:
+            self._hass.async_add_executor_job(
+                _remove_segments, [s.path for s in removed]
+            )
+        self._event.set()
+        self._event.clear()
+
+    async def async_open_segments(self, duration: float) -> List[Segment]:
+        """Open the latest segments that span the duration for a recording."""
+        segments = []
+        for segment in reversed(self._segments):
+            if duration <= 0:
+                break
+            segments.insert(0, segment)
+            duration -= segment.duration
+
+        return await self._hass.async_add_executor_job(_open_segments, segments)
+
+    def cleanup(self):
+        """Handle cleanup."""
+        super().cleanup()
+        self._segments = deque()
+        self._size = 0
+        if self._path is not None:
+            self._hass.async_add_executor_job(shutil.rmtree, self._path, True)
+
+
+def _open_segments(segments: List[DiskSegment]) -> List[Segment]:
+    """Open segments, skipping the ones removed from the buffer meanwhile."""
+    opened = []
+    for segment in segments:
+        try:
+            segment_file = open(segment.path, "rb")
+        except FileNotFoundError:
+            continue
+        opened.append(Segment(segment.sequence, segment_file, segment.duration))
+    return opened
+
+
+def _remove_segments(paths: List[str]) -> None:
+    """Remove segments from disk."""
+    for path in paths:
+        with suppress(FileNotFoundError):
+            os.remove(path)
@@ -1,14 +1,20 @@
 """Provide functionality to record stream."""
+import io
 import logging
 import os
 import threading
-from typing import List
-
-import av
+from typing import Callable, Dict, List
 
 from homeassistant.core import HomeAssistant, callback
 
-from .core import PROVIDERS, IdleTimer, Segment, StreamOutput
+from .core import PROVIDERS, IdleTimer, Segment, StreamOutput, fmp4_container_options
+from .fmp4utils import (
+    get_decode_times,
+    get_init,
+    get_m4s,
+    get_timescales,
+    shift_decode_times,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,54 +24,55 @@ def async_setup_recorder(hass):
     """Only here so Provider Registry works."""
 
 
-def recorder_save_worker(file_out: str, segments: List[Segment], container_format: str):
-    """Handle saving stream."""
+def recorder_save_worker(file_out: str, segments: List[Segment]):
+    """Handle saving stream.
+
+    The fragments of the fragmented mp4 segments are written one after another
+    behind the init section of the first segment, without remuxing them.
+    """
     if not os.path.exists(os.path.dirname(file_out)):
         os.makedirs(os.path.dirname(file_out), exist_ok=True)
 
-    first_pts = {"video": None, "audio": None}
-    output = av.open(file_out, "w", format=container_format)
-    output_v = None
-    output_a = None
-
-    # Get first_pts values from first segment
-    if len(segments) > 0:
-        segment = segments[0]
-        source = av.open(segment.segment, "r", format=container_format)
-        source_v = source.streams.video[0]
-        first_pts["video"] = source_v.start_time
-        if len(source.streams.audio) > 0:
-            source_a = source.streams.audio[0]
-            first_pts["audio"] = int(
-                source_v.start_time * source_v.time_base / source_a.time_base
-            )
-        source.close()
-
-    for segment in segments:
-        # Open segment
-        source = av.open(segment.segment, "r", format=container_format)
-        source_v = source.streams.video[0]
-        # Add output streams
-        if not output_v:
-            output_v = output.add_stream(template=source_v)
-            context = output_v.codec_context
-            context.flags |= "GLOBAL_HEADER"
-        if not output_a and len(source.streams.audio) > 0:
-            source_a = source.streams.audio[0]
-            output_a = output.add_stream(template=source_a)
-
-        # Remux video
-        for packet in source.demux():
-            if packet.dts is None:
-                continue
-            packet.pts -= first_pts[packet.stream.type]
-            packet.dts -= first_pts[packet.stream.type]
-            packet.stream = output_v if packet.stream.type == "video" else output_a
-            output.mux(packet)
-
-        source.close()
-
-    output.close()
+    try:
+        if not segments:
+            return
+
+        with open(file_out, "wb") as output:
+            first_segment = _read_segment(segments[0])
+            output.write(get_init(first_segment))
+            timescales = get_timescales(first_segment)
+            shifts = None
+
+            for segment in segments:
+                fragment = get_m4s(_read_segment(segment), segment.sequence)
+                if shifts is None:
+                    shifts = _get_shifts(timescales, get_decode_times(fragment))
+                output.write(shift_decode_times(fragment, shifts))
+    finally:
+        for segment in segments:
+            # Segments from the lookback buffer are files opened for the recording
+            if not isinstance(segment.segment, io.BytesIO):
+                segment.segment.close()
+
+
+def _read_segment(segment: Segment) -> io.BytesIO:
+    """Return a copy of a segment that is safe to read from this thread."""
+    if isinstance(segment.segment, io.BytesIO):
+        # The segment may be served over HLS at the same time
+        return io.BytesIO(segment.segment.getvalue())
+    return segment.segment
+
+
+def _get_shifts(timescales: Dict[int, int], decode_times: Dict[int, int]) -> dict:
+    """Return the decode time shift of each track to start the video at zero."""
+    if not decode_times:
+        return {}
+    # The video track is the first track
+    video_track = next(iter(timescales))
+    start = decode_times.get(video_track, 0) / timescales[video_track]
+    return {
+        track_id: int(start * timescale) for track_id, timescale in timescales.items()
+    }
 
 
 @PROVIDERS.register("recorder")
@@ -98,6 +105,11 @@ class RecorderOutput(StreamOutput):
         """Return desired video codecs."""
         return {"hevc", "h264"}
 
+    @property
+    def container_options(self) -> Callable[[int], dict]:
+        """Return Callable which takes a sequence number and returns container options."""
+        return fmp4_container_options
+
     def prepend(self, segments: List[Segment]) -> None:
         """Prepend segments to existing list."""
         own_segments = self.segments
@@ -110,7 +122,7 @@ class RecorderOutput(StreamOutput):
         thread = threading.Thread(
             name="recorder_save_worker",
             target=recorder_save_worker,
-            args=(self.video_path, self._segments, self.format),
+            args=(self.video_path, self._segments),
         )
         thread.start()
 
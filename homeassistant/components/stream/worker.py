@@ -1,5 +1,6 @@
 """Provides the worker thread needed for processing streams."""
 from collections import deque
+from fractions import Fraction
 import io
 import logging
 
@@ -12,11 +13,50 @@ from .const import (
     PACKETS_TO_WAIT_FOR_AUDIO,
     STREAM_TIMEOUT,
 )
-from .core import Segment, StreamBuffer
+from .core import Part, Segment, StreamBuffer
+from .fmp4utils import find_box
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class KeyFrame:
+    """A video keyframe of a stream that can be converted to a JPEG image."""
+
+    def __init__(self, packet, video_stream):
+        """Copy the keyframe data as muxing the packet consumes it."""
+        self._data = bytes(packet)
+        self._video_stream = video_stream
+        self._image = None
+
+    def to_jpeg(self):
+        """Decode the keyframe and encode it as a JPEG image."""
+        if self._image is not None:
+            return self._image
+
+        try:
+            codec_context = self._video_stream.codec_context
+            decoder = av.CodecContext.create(codec_context.name, "r")
+            if codec_context.extradata:
+                decoder.extradata = codec_context.extradata
+            frames = decoder.decode(av.Packet(self._data)) + decoder.decode(None)
+            if not frames:
+                return None
+
+            frame = frames[0].reformat(format="yuvj420p")
+            encoder = av.CodecContext.create("mjpeg", "w")
+            encoder.width = frame.width
+            encoder.height = frame.height
+            encoder.pix_fmt = "yuvj420p"
+            encoder.time_base = Fraction(1, 1)
+            packets = encoder.encode(frame) + encoder.encode(None)
+        except av.AVError as ex:
+            _LOGGER.debug("Unable to convert keyframe to an image: %s", str(ex))
+            return None
+
+        self._image = b"".join(bytes(packet) for packet in packets)
+        return self._image
+
+
 def create_stream_buffer(stream_output, video_stream, audio_stream, sequence):
     """Create a new StreamBuffer."""
 
@@ -43,6 +83,50 @@ def create_stream_buffer(stream_output, video_stream, audio_stream, sequence):
     return StreamBuffer(segment, output, vstream, astream)
 
 
+def flush_part(buffer, packet_time):
+    """Return the fragment written by the last mux as a part, if any.
+
+    Fragments are written as soon as a packet exceeds the fragment duration,
+    so new data in the segment is a complete fragment that ends at that packet.
+    """
+    position = buffer.segment.tell()
+    if not buffer.part_start:
+        # The first mux writes the init section
+        buffer.part_start = position
+        return None
+    if position == buffer.part_start:
+        return None
+
+    with buffer.segment.getbuffer() as data:
+        part = Part(
+            duration=packet_time - buffer.part_time,
+            has_keyframe=buffer.part_keyframe,
+            data=bytes(data[buffer.part_start : position]),
+        )
+    buffer.parts.append(part)
+    buffer.part_start = position
+    buffer.part_time = None
+    buffer.part_keyframe = False
+    return part
+
+
+def close_buffer(buffer, end_time):
+    """Close the segment and add the last fragment as its final part."""
+    buffer.output.close()
+    end = next(find_box(buffer.segment, b"mfra"), None)
+    if end is None:
+        end = buffer.segment.seek(0, io.SEEK_END)
+    if buffer.part_time is not None and end > buffer.part_start:
+        with buffer.segment.getbuffer() as data:
+            buffer.parts.append(
+                Part(
+                    duration=end_time - buffer.part_time,
+                    has_keyframe=buffer.part_keyframe,
+                    data=bytes(data[buffer.part_start : end]),
+                )
+            )
+
+
 def stream_worker(hass, stream, quit_event):
     """Handle consuming streams."""
 
@@ -175,20 +259,33 @@ def stream_worker(hass, stream, quit_event):
                 {video_stream: buffer.vstream, audio_stream: buffer.astream},
             )
 
+    def mux_packet(fmt, buffer, packet, packet_time, is_keyframe):
+        """Mux a packet and hand a flushed fragment over as a part."""
+        buffer.output.mux(packet)
+        part = flush_part(buffer, packet_time)
+        if part and stream.outputs.get(fmt):
+            stream.outputs[fmt].put_part(sequence, part)
+        if buffer.part_time is None:
+            buffer.part_time = packet_time
+        buffer.part_keyframe = buffer.part_keyframe or is_keyframe
+
     def mux_video_packet(packet):
+        packet_time = float(packet.dts * packet.time_base)
+        is_keyframe = packet.is_keyframe
         # mux packets to each buffer
-        for buffer, output_streams in outputs.values():
+        for fmt, (buffer, output_streams) in outputs.items():
             # Assign the packet to the new stream & mux
             packet.stream = output_streams[video_stream]
-            buffer.output.mux(packet)
+            mux_packet(fmt, buffer, packet, packet_time, is_keyframe)
 
     def mux_audio_packet(packet):
+        packet_time = float(packet.dts * packet.time_base)
         # almost the same as muxing video but add extra check
-        for buffer, output_streams in outputs.values():
+        for fmt, (buffer, output_streams) in outputs.items():
             # Assign the packet to the new stream & mux
             if output_streams.get(audio_stream):
                 packet.stream = output_streams[audio_stream]
-                buffer.output.mux(packet)
+                mux_packet(fmt, buffer, packet, packet_time, False)
 
     if not peek_first_pts():
         container.close()
@@ -231,17 +328,19 @@ def stream_worker(hass, stream, quit_event):
 
         # Check for end of segment
         if packet.stream == video_stream and packet.is_keyframe:
+            stream.keyframe = KeyFrame(packet, video_stream)
             segment_duration = (packet.pts - segment_start_pts) * packet.time_base
             if segment_duration >= MIN_SEGMENT_DURATION:
                 # Save segment to outputs
                 for fmt, (buffer, _) in outputs.items():
-                    buffer.output.close()
+                    close_buffer(buffer, float(packet.dts * packet.time_base))
                     if stream.outputs.get(fmt):
                         stream.outputs[fmt].put(
                             Segment(
                                 sequence,
                                 buffer.segment,
                                 segment_duration,
+                                buffer.parts,
                             ),
                         )
 
@@ -257,6 +356,7 @@ def stream_worker(hass, stream, quit_event):
             mux_audio_packet(packet)  # mutates packet timestamps
 
     # Close stream
+    stream.keyframe = None
     for buffer, _ in outputs.values():
         buffer.output.close()
     container.close()
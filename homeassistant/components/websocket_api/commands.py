@@ -19,7 +19,7 @@ from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.template import Template
 from homeassistant.loader import IntegrationNotFound, async_get_integration
 
-from . import const, decorators, messages
+from . import const, decorators, messages, state_changed
 
 # mypy: allow-untyped-calls, allow-untyped-defs
 
@@ -29,6 +29,7 @@ def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_unsubscribe_events)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_get_services)
@@ -40,6 +41,8 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
+    async_reg(hass, handle_supported_features)
+    async_reg(hass, handle_connection_stats)
 
 
 def pong_message(iden):
@@ -52,6 +55,7 @@ def pong_message(iden):
     {
         vol.Required("type"): "subscribe_events",
         vol.Optional("event_type", default=MATCH_ALL): str,
+        vol.Optional("entity_id"): cv.entity_ids,
     }
 )
 def handle_subscribe_events(hass, connection, msg):
@@ -66,16 +70,19 @@ def handle_subscribe_events(hass, connection, msg):
         raise Unauthorized
 
     if event_type == EVENT_STATE_CHANGED:
+        connection.subscriptions[msg["id"]] = state_changed.async_subscribe(
+            hass, connection, msg["id"], msg.get("entity_id")
+        )
 
-        @callback
-        def forward_events(event):
-            """Forward state changed events to websocket."""
-            if not connection.user.permissions.check_entity(
-                event.data["entity_id"], POLICY_READ
-            ):
-                return
-
-            connection.send_message(messages.cached_event_message(msg["id"], event))
+    elif "entity_id" in msg:
+        connection.send_message(
+            messages.error_message(
+                msg["id"],
+                const.ERR_INVALID_FORMAT,
+                "entity_id is only supported for state_changed events",
+            )
+        )
+        return
 
     else:
 
@@ -87,13 +94,67 @@ def handle_subscribe_events(hass, connection, msg):
 
             connection.send_message(messages.cached_event_message(msg["id"], event))
 
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        event_type, forward_events
-    )
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            event_type, forward_events
+        )
 
     connection.send_message(messages.result_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends the compact states of the entities, followed by the diffs of
+    their state changes.
+    """
+    entity_ids = msg.get("entity_ids")
+
+    connection.subscriptions[msg["id"]] = state_changed.async_subscribe(
+        hass,
+        connection,
+        msg["id"],
+        entity_ids,
+        messages.cached_state_diff_message,
+    )
+    connection.send_message(messages.result_message(msg["id"]))
+
+    if entity_ids is None:
+        states = hass.states.async_all()
+    else:
+        states = [
+            state
+            for state in (hass.states.get(entity_id) for entity_id in entity_ids)
+            if state is not None
+        ]
+
+    if not connection.user.permissions.access_all_entities(POLICY_READ):
+        entity_perm = connection.user.permissions.check_entity
+        states = [
+            state for state in states if entity_perm(state.entity_id, POLICY_READ)
+        ]
+
+    connection.send_message(
+        messages.message_to_json(
+            messages.event_message(
+                msg["id"],
+                {
+                    const.ENTITY_EVENT_ADD: {
+                        state.entity_id: messages.compressed_state(state)
+                        for state in states
+                    }
+                },
+            )
+        )
+    )
+
+
 @callback
 @decorators.websocket_command(
     {
@@ -416,3 +477,30 @@ async def handle_test_condition(hass, connection, msg):
     connection.send_result(
         msg["id"], {"result": check_condition(hass, msg.get("variables"))}
     )
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "supported_features",
+        vol.Required("features"): {str: int},
+    }
+)
+def handle_supported_features(hass, connection, msg):
+    """Handle setting the features supported by the client."""
+    connection.supported_features = msg["features"]
+    connection.send_result(msg["id"])
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "connection_stats"})
+@decorators.require_admin
+def handle_connection_stats(hass, connection, msg):
+    """Handle getting the write statistics of the connected clients."""
+    connection.send_result(
+        msg["id"],
+        [
+            write_stats()
+            for write_stats in hass.data.get(const.DATA_CONNECTION_STATS, {}).values()
+        ],
+    )
@@ -27,6 +27,7 @@ class ActiveConnection:
             self.refresh_token_id = None
 
         self.subscriptions: Dict[Hashable, Callable[[], Any]] = {}
+        self.supported_features: Dict[str, int] = {}
         self.last_id = 0
 
     def context(self, msg):
@@ -33,6 +33,21 @@ ERR_TEMPLATE_ERROR = "template_error"
 
 TYPE_RESULT = "result"
 
+# Keys of the compact states sent to subscribe_entities subscriptions
+COMPRESSED_STATE_STATE = "s"
+COMPRESSED_STATE_ATTRIBUTES = "a"
+COMPRESSED_STATE_CONTEXT = "c"
+COMPRESSED_STATE_LAST_CHANGED = "lc"
+COMPRESSED_STATE_LAST_UPDATED = "lu"
+
+# Kinds of subscribe_entities events
+ENTITY_EVENT_ADD = "a"
+ENTITY_EVENT_REMOVE = "r"
+ENTITY_EVENT_CHANGE = "c"
+
+# Features a client can enable with the supported_features command
+FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+
 # Define the possible errors that occur when connections are cancelled.
 # Originally, this was just asyncio.CancelledError, but issue #9546 showed
 # that futures.CancelledErrors can also occur in some situations.
@@ -45,4 +60,10 @@ SIGNAL_WEBSOCKET_DISCONNECTED = "websocket_disconnected"
 # Data used to store the current connection list
 DATA_CONNECTIONS = f"{DOMAIN}.connections"
 
+# Data used to store the write statistics of the current connections
+DATA_CONNECTION_STATS = f"{DOMAIN}.connection_stats"
+
+# Data used to store the shared state changed subscriptions
+DATA_STATE_CHANGED_SUBSCRIPTIONS = f"{DOMAIN}.state_changed_subscriptions"
+
 JSON_DUMP = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
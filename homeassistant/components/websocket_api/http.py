@@ -15,7 +15,9 @@ from homeassistant.helpers.event import async_call_later
 from .auth import AuthPhase, auth_required_message
 from .const import (
     CANCELLATION_ERRORS,
+    DATA_CONNECTION_STATS,
     DATA_CONNECTIONS,
+    FEATURE_COALESCE_MESSAGES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -61,24 +63,54 @@ class WebSocketHandler:
         self._to_write: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_MSG)
         self._handle_task = None
         self._writer_task = None
+        self._connection = None
         self._logger = WebSocketAdapter(_WS_LOGGER, {"connid": id(self)})
         self._peak_checker_unsub = None
+        self._messages_sent = 0
+        self._bytes_sent = 0
+        self._max_queue_size = 0
 
     async def _writer(self):
         """Write outgoing messages."""
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
-            while not self.wsock.closed:
-                message = await self._to_write.get()
+            to_write = self._to_write
+            closing = False
+            while not closing and not self.wsock.closed:
+                message = await to_write.get()
                 if message is None:
                     break
 
-                self._logger.debug("Sending %s", message)
-
-                if not isinstance(message, str):
-                    message = message_to_json(message)
+                messages = [message]
+                if (
+                    self._connection is not None
+                    and self._connection.supported_features.get(
+                        FEATURE_COALESCE_MESSAGES
+                    )
+                ):
+                    # Send everything that is ready as a single frame
+                    while not to_write.empty():
+                        message = to_write.get_nowait()
+                        if message is None:
+                            closing = True
+                            break
+                        messages.append(message)
+
+                self._logger.debug("Sending %s", messages)
+
+                messages = [
+                    message if isinstance(message, str) else message_to_json(message)
+                    for message in messages
+                ]
+
+                if len(messages) == 1:
+                    payload = messages[0]
+                else:
+                    payload = f"[{','.join(messages)}]"
 
-                await self.wsock.send_str(message)
+                await self.wsock.send_str(payload)
+                self._messages_sent += len(messages)
+                self._bytes_sent += len(payload.encode())
 
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub:
@@ -97,12 +129,18 @@ class WebSocketHandler:
             self._to_write.put_nowait(message)
         except asyncio.QueueFull:
             self._logger.error(
-                "Client exceeded max pending messages [2]: %s", MAX_PENDING_MSG
+                "Client exceeded max pending messages [2]: %s (%s)",
+                MAX_PENDING_MSG,
+                self._stats(),
             )
 
             self._cancel()
 
-        if self._to_write.qsize() < PENDING_MSG_PEAK:
+        queue_size = self._to_write.qsize()
+        if queue_size > self._max_queue_size:
+            self._max_queue_size = queue_size
+
+        if queue_size < PENDING_MSG_PEAK:
             if self._peak_checker_unsub:
                 self._peak_checker_unsub()
                 self._peak_checker_unsub = None
@@ -122,12 +160,36 @@ class WebSocketHandler:
             return
 
         self._logger.error(
-            "Client unable to keep up with pending messages. Stayed over %s for %s seconds",
+            "Client unable to keep up with pending messages. Stayed over %s for %s seconds (%s)",
             PENDING_MSG_PEAK,
             PENDING_MSG_PEAK_TIME,
+            self._stats(),
         )
         self._cancel()
 
+    @callback
+    def _write_stats(self):
+        """Return the write statistics of the connection."""
+        user = self._connection.user if self._connection is not None else None
+        return {
+            "connection_id": id(self),
+            "user_id": user.id if user is not None else None,
+            "queue_size": self._to_write.qsize(),
+            "max_queue_size": self._max_queue_size,
+            "messages_sent": self._messages_sent,
+            "bytes_sent": self._bytes_sent,
+        }
+
+    @callback
+    def _stats(self):
+        """Return the write statistics of the connection for logging."""
+        return (
+            f"queue size: {self._to_write.qsize()}, "
+            f"max queue size: {self._max_queue_size}, "
+            f"messages sent: {self._messages_sent}, "
+            f"bytes sent: {self._bytes_sent}"
+        )
+
     @callback
     def _cancel(self):
         """Cancel the connection."""
@@ -184,10 +246,13 @@ class WebSocketHandler:
                 raise Disconnect from err
 
             self._logger.debug("Received %s", msg_data)
-            connection = await auth.async_handle(msg_data)
+            connection = self._connection = await auth.async_handle(msg_data)
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
+            self.hass.data.setdefault(DATA_CONNECTION_STATS, {})[
+                id(self)
+            ] = self._write_stats
             self.hass.helpers.dispatcher.async_dispatcher_send(
                 SIGNAL_WEBSOCKET_CONNECTED
             )
@@ -237,12 +302,15 @@ class WebSocketHandler:
 
             finally:
                 if disconnect_warn is None:
-                    self._logger.debug("Disconnected")
+                    self._logger.debug("Disconnected (%s)", self._stats())
                 else:
-                    self._logger.warning("Disconnected: %s", disconnect_warn)
+                    self._logger.warning(
+                        "Disconnected: %s (%s)", disconnect_warn, self._stats()
+                    )
 
                 if connection is not None:
                     self.hass.data[DATA_CONNECTIONS] -= 1
+                    self.hass.data[DATA_CONNECTION_STATS].pop(id(self))
                 self.hass.helpers.dispatcher.async_dispatcher_send(
                     SIGNAL_WEBSOCKET_DISCONNECTED
                 )
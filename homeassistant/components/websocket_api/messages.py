@@ -6,7 +6,7 @@ from typing import Any, Dict
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -74,6 +74,78 @@ def _cached_event_message(event: Event) -> str:
     return message_to_json(event_message(IDEN_TEMPLATE, event))
 
 
+def cached_state_diff_message(iden: int, event: Event) -> str:
+    """Return a compact state diff message for a state changed event.
+
+    Serialize to json once per message, like cached_event_message.
+    """
+    return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+@lru_cache(maxsize=128)
+def _cached_state_diff_message(event: Event) -> str:
+    """Cache and serialize the state diff of the event to json."""
+    return message_to_json(event_message(IDEN_TEMPLATE, _state_diff_event(event)))
+
+
+def _state_diff_event(event: Event) -> Dict:
+    """Convert a state changed event to a compact state diff event."""
+    entity_id = event.data["entity_id"]
+    new_state = event.data["new_state"]
+    if new_state is None:
+        return {const.ENTITY_EVENT_REMOVE: [entity_id]}
+    old_state = event.data["old_state"]
+    if old_state is None:
+        return {const.ENTITY_EVENT_ADD: {entity_id: compressed_state(new_state)}}
+    return {const.ENTITY_EVENT_CHANGE: {entity_id: _state_diff(old_state, new_state)}}
+
+
+def compressed_state(state: State) -> Dict[str, Any]:
+    """Return a compact dict representation of a state."""
+    compressed = {
+        const.COMPRESSED_STATE_STATE: state.state,
+        const.COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        const.COMPRESSED_STATE_CONTEXT: state.context.id,
+        const.COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+    if state.last_changed != state.last_updated:
+        compressed[const.COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
+    return compressed
+
+
+def _state_diff(old_state: State, new_state: State) -> Dict[str, Dict[str, Any]]:
+    """Return the additions and removals needed to turn old_state into new_state."""
+    additions: Dict[str, Any] = {}
+    if old_state.state != new_state.state:
+        additions[const.COMPRESSED_STATE_STATE] = new_state.state
+    if old_state.last_changed != new_state.last_changed:
+        additions[
+            const.COMPRESSED_STATE_LAST_CHANGED
+        ] = new_state.last_changed.timestamp()
+    elif old_state.last_updated != new_state.last_updated:
+        additions[
+            const.COMPRESSED_STATE_LAST_UPDATED
+        ] = new_state.last_updated.timestamp()
+    if old_state.context.id != new_state.context.id:
+        additions[const.COMPRESSED_STATE_CONTEXT] = new_state.context.id
+
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    changed_attributes = {
+        key: value
+        for key, value in new_attributes.items()
+        if key not in old_attributes or old_attributes[key] != value
+    }
+    if changed_attributes:
+        additions[const.COMPRESSED_STATE_ATTRIBUTES] = changed_attributes
+
+    diff = {"+": additions}
+    removed_attributes = [key for key in old_attributes if key not in new_attributes]
+    if removed_attributes:
+        diff["-"] = {const.COMPRESSED_STATE_ATTRIBUTES: removed_attributes}
+    return diff
+
+
 def message_to_json(message: Any) -> str:
     """Serialize a websocket message to json."""
     try:
@@ -0,0 +1,144 @@
+"""Shared forwarding of state changed events to websocket subscriptions."""
+from typing import Callable, Dict, Optional, Tuple
+
+from homeassistant.auth.models import User
+from homeassistant.auth.permissions import AbstractPermissions
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
+
+from . import const, messages
+from .connection import ActiveConnection
+
+# mypy: allow-untyped-calls, allow-untyped-defs
+
+SubscriptionKey = Tuple[ActiveConnection, int]
+MessageFactory = Callable[[int, Event], str]
+
+
+@callback
+def async_subscribe(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    iden: int,
+    entity_ids: Optional[list] = None,
+    message_factory: MessageFactory = messages.cached_event_message,
+) -> Callable[[], None]:
+    """Subscribe a connection to state changed events."""
+    subscriptions = hass.data.get(const.DATA_STATE_CHANGED_SUBSCRIPTIONS)
+    if subscriptions is None:
+        subscriptions = hass.data[
+            const.DATA_STATE_CHANGED_SUBSCRIPTIONS
+        ] = StateChangedSubscriptions(hass)
+    return subscriptions.async_subscribe(connection, iden, entity_ids, message_factory)
+
+
+class StateChangedSubscriptions:
+    """Forward state changed events to all subscribed connections.
+
+    A single bus listener serves every subscription. The entity read
+    permission of each user is cached until the permissions of the user
+    or the entity registry change.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the subscriptions."""
+        self.hass = hass
+        self._all_entities: Dict[SubscriptionKey, MessageFactory] = {}
+        self._by_entity_id: Dict[str, Dict[SubscriptionKey, MessageFactory]] = {}
+        self._permissions: Dict[
+            str, Tuple[AbstractPermissions, bool, Dict[str, bool]]
+        ] = {}
+        self._unsub_listeners: Optional[Tuple[Callable, Callable]] = None
+
+    @callback
+    def async_subscribe(
+        self,
+        connection: ActiveConnection,
+        iden: int,
+        entity_ids: Optional[list] = None,
+        message_factory: MessageFactory = messages.cached_event_message,
+    ) -> Callable[[], None]:
+        """Add a subscription and return a function to remove it."""
+        key = (connection, iden)
+
+        if entity_ids is None:
+            self._all_entities[key] = message_factory
+        else:
+            # Each entity is removed once when unsubscribing
+            entity_ids = list(dict.fromkeys(entity_ids))
+            for entity_id in entity_ids:
+                self._by_entity_id.setdefault(entity_id, {})[key] = message_factory
+
+        if self._unsub_listeners is None:
+            self._unsub_listeners = (
+                self.hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_forward),
+                self.hass.bus.async_listen(
+                    EVENT_ENTITY_REGISTRY_UPDATED, self._async_clear_permissions
+                ),
+            )
+
+        @callback
+        def async_unsubscribe() -> None:
+            """Remove the subscription."""
+            if entity_ids is None:
+                del self._all_entities[key]
+            else:
+                for entity_id in entity_ids:
+                    subscriptions = self._by_entity_id[entity_id]
+                    del subscriptions[key]
+                    if not subscriptions:
+                        del self._by_entity_id[entity_id]
+
+            if self._unsub_listeners and not (self._all_entities or self._by_entity_id):
+                for unsub in self._unsub_listeners:
+                    unsub()
+                self._unsub_listeners = None
+                self._permissions.clear()
+
+        return async_unsubscribe
+
+    @callback
+    def _async_clear_permissions(self, event: Event) -> None:
+        """Forget the permissions as they can depend on the entity registry."""
+        self._permissions.clear()
+
+    @callback
+    def _async_can_read(self, user: User, entity_id: str) -> bool:
+        """Return if the user can read the entity."""
+        permissions = user.permissions
+        cached = self._permissions.get(user.id)
+        if cached is None or cached[0] is not permissions:
+            # Updating a user replaces the permissions object
+            cached = self._permissions[user.id] = (
+                permissions,
+                permissions.access_all_entities(POLICY_READ),
+                {},
+            )
+
+        _, read_all, entities = cached
+        if read_all:
+            return True
+
+        can_read = entities.get(entity_id)
+        if can_read is None:
+            can_read = entities[entity_id] = permissions.check_entity(
+                entity_id, POLICY_READ
+            )
+        return can_read
+
+    @callback
+    def _async_forward(self, event: Event) -> None:
+        """Forward a state changed event to the subscriptions."""
+        entity_id = event.data["entity_id"]
+        subscriptions = list(self._all_entities.items())
+        entity_subscriptions = self._by_entity_id.get(entity_id)
+        if entity_subscriptions:
+            subscriptions.extend(entity_subscriptions.items())
+
+        for (connection, iden), message_factory in subscriptions:
+            if not self._async_can_read(connection.user, entity_id):
+                continue
+            # The event is serialized once and shared by all subscriptions
+            connection.send_message(message_factory(iden, event))
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+from contextvars import ContextVar
 import functools
 import logging
 from types import MappingProxyType, MethodType
@@ -237,6 +238,7 @@ class ConfigEntry:
                 self.state = ENTRY_STATE_MIGRATION_ERROR
                 return
 
+        current_entry_token = current_entry.set(self)
         try:
             result = await component.async_setup_entry(hass, self)  # type: ignore
 
@@ -270,6 +272,8 @@ class ConfigEntry:
                 "Error setting up entry %s for %s", self.title, integration.domain
             )
             result = False
+        finally:
+            current_entry.reset(current_entry_token)
 
         # Only store setup result as state if it was not forwarded.
         if self.domain != integration.domain:
@@ -1211,6 +1215,11 @@ class EntityRegistryDisabledHandler:
         )
 
 
+current_entry: ContextVar[Optional[ConfigEntry]] = ContextVar(
+    "current_entry", default=None
+)
+
+
 async def support_entry_unload(hass: HomeAssistant, domain: str) -> bool:
     """Test if a domain supports entry unloading."""
     integration = await loader.async_get_integration(hass, domain)
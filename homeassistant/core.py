@@ -23,11 +23,13 @@ from typing import (
     Collection,
     Coroutine,
     Dict,
+    Hashable,
     Iterable,
     List,
     Mapping,
     Optional,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -662,6 +664,11 @@ class EventBus:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: Dict[str, List[HassJob]] = {}
+        # Listeners with an event data filter, indexed by event type and
+        # the key and value of the first item of their filter
+        self._filtered_listeners: Dict[
+            str, Dict[str, Dict[Hashable, List[Tuple[Dict[str, Any], HassJob]]]]
+        ] = {}
         self._hass = hass
 
     @callback
@@ -670,7 +677,12 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(self._listeners[key]) for key in self._listeners}
+        listeners = {key: len(self._listeners[key]) for key in self._listeners}
+        for event_type, index in self._filtered_listeners.items():
+            listeners[event_type] = listeners.get(event_type, 0) + sum(
+                len(jobs) for values in index.values() for jobs in values.values()
+            )
+        return listeners
 
     @property
     def listeners(self) -> Dict[str, int]:
@@ -714,12 +726,46 @@ class EventBus:
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
+        if self._filtered_listeners:
+            listeners = listeners + self._async_match_filtered_listeners(event)
+
         if not listeners:
             return
 
         for job in listeners:
             self._hass.async_add_hass_job(job, event)
 
+    @callback
+    def _async_match_filtered_listeners(self, event: Event) -> List[HassJob]:
+        """Return the filtered listeners whose event data filter matches."""
+        matched: List[HassJob] = []
+        indexes = [self._filtered_listeners.get(event.event_type)]
+        if event.event_type != EVENT_HOMEASSISTANT_CLOSE:
+            indexes.append(self._filtered_listeners.get(MATCH_ALL))
+
+        data = event.data
+        for index in indexes:
+            if not index:
+                continue
+            for key, values in index.items():
+                if key not in data:
+                    continue
+                try:
+                    candidates = values.get(data[key])
+                except TypeError:
+                    # Unhashable event data can never match a filter value
+                    continue
+                if not candidates:
+                    continue
+                for event_data_filter, job in candidates:
+                    if all(
+                        item_key in data and data[item_key] == value
+                        for item_key, value in event_data_filter.items()
+                    ):
+                        matched.append(job)
+
+        return matched
+
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -737,16 +783,59 @@ class EventBus:
         return remove_listener
 
     @callback
-    def async_listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
+    def async_listen(
+        self,
+        event_type: str,
+        listener: Callable,
+        event_data_filter: Optional[Mapping[str, Hashable]] = None,
+    ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
         To listen to all events specify the constant ``MATCH_ALL``
         as event_type.
 
+        When an event_data_filter is passed, the listener is only called
+        for events that have all of its keys with equal values. These
+        listeners are looked up in an index instead of being called for
+        every event of the type.
+
         This method must be run in the event loop.
         """
+        if event_data_filter:
+            return self._async_listen_filtered_job(
+                event_type, dict(event_data_filter), HassJob(listener)
+            )
         return self._async_listen_job(event_type, HassJob(listener))
 
+    @callback
+    def _async_listen_filtered_job(
+        self, event_type: str, event_data_filter: Dict[str, Any], hassjob: HassJob
+    ) -> CALLBACK_TYPE:
+        key, value = next(iter(event_data_filter.items()))
+        entry = (event_data_filter, hassjob)
+        self._filtered_listeners.setdefault(event_type, {}).setdefault(
+            key, {}
+        ).setdefault(value, []).append(entry)
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            try:
+                index = self._filtered_listeners[event_type]
+                jobs = index[key][value]
+                jobs.remove(entry)
+            except (KeyError, ValueError):
+                _LOGGER.exception("Unable to remove unknown job listener %s", hassjob)
+                return
+
+            if not jobs:
+                del index[key][value]
+                if not index[key]:
+                    del index[key]
+                    if not index:
+                        del self._filtered_listeners[event_type]
+
+        return remove_listener
+
     @callback
     def _async_listen_job(self, event_type: str, hassjob: HassJob) -> CALLBACK_TYPE:
         self._listeners.setdefault(event_type, []).append(hassjob)
@@ -976,6 +1065,7 @@ class StateMachine:
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: Dict[str, State] = {}
+        self._domain_index: Dict[str, Dict[str, State]] = {}
         self._reservations: Set[str] = set()
         self._bus = bus
         self._loop = loop
@@ -999,12 +1089,12 @@ class StateMachine:
             return list(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return list(self._domain_index.get(domain_filter.lower(), ()))
 
         return [
-            state.entity_id
-            for state in self._states.values()
-            if state.domain in domain_filter
+            entity_id
+            for domain in dict.fromkeys(domain_filter)
+            for entity_id in self._domain_index.get(domain, ())
         ]
 
     @callback
@@ -1019,10 +1109,11 @@ class StateMachine:
             return len(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return len(self._domain_index.get(domain_filter.lower(), ()))
 
-        return len(
-            [None for state in self._states.values() if state.domain in domain_filter]
+        return sum(
+            len(self._domain_index.get(domain, ()))
+            for domain in dict.fromkeys(domain_filter)
         )
 
     def all(self, domain_filter: Optional[Union[str, Iterable]] = None) -> List[State]:
@@ -1043,10 +1134,12 @@ class StateMachine:
             return list(self._states.values())
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return list(self._domain_index.get(domain_filter.lower(), {}).values())
 
         return [
-            state for state in self._states.values() if state.domain in domain_filter
+            state
+            for domain in dict.fromkeys(domain_filter)
+            for state in self._domain_index.get(domain, {}).values()
         ]
 
     def get(self, entity_id: str) -> Optional[State]:
@@ -1090,6 +1183,11 @@ class StateMachine:
         if old_state is None:
             return False
 
+        domain_states = self._domain_index[old_state.domain]
+        del domain_states[entity_id]
+        if not domain_states:
+            del self._domain_index[old_state.domain]
+
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1195,6 +1293,7 @@ class StateMachine:
             old_state is None,
         )
         self._states[entity_id] = state
+        self._domain_index.setdefault(state.domain, {})[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
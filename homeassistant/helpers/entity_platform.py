@@ -6,7 +6,17 @@ from contextvars import ContextVar
 from datetime import datetime, timedelta
 from logging import Logger
 from types import ModuleType
-from typing import TYPE_CHECKING, Callable, Coroutine, Dict, Iterable, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
 
 from homeassistant import config_entries
 from homeassistant.const import ATTR_RESTORED, DEVICE_DEFAULT_NAME
@@ -23,7 +33,8 @@ from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.util.async_ import run_callback_threadsafe
 
 from .entity_registry import DISABLED_INTEGRATION
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later
+from .polling import async_get_poll_scheduler
 
 if TYPE_CHECKING:
     from .entity import Entity
@@ -71,6 +82,12 @@ class EntityPlatform:
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: Optional[CALLBACK_TYPE] = None
         self._process_updates: Optional[asyncio.Lock] = None
+        self._batch_service_handlers: Dict[
+            str,
+            Callable[
+                [List[Entity], Dict[str, Any]], Awaitable[Optional[Iterable[Entity]]]
+            ],
+        ] = {}
 
         self.parallel_updates: Optional[asyncio.Semaphore] = None
 
@@ -86,6 +103,14 @@ class EntityPlatform:
         """Represent an EntityPlatform."""
         return f"<EntityPlatform domain={self.domain} platform_name={self.platform_name} config_entry={self.config_entry}>"
 
+    @property
+    def poll_key(self) -> str:
+        """Return the key of the polls of this platform in the poll scheduler."""
+        key = f"{self.domain}.{self.platform_name}"
+        if self.config_entry is not None:
+            key = f"{key}.{self.config_entry.entry_id}"
+        return key
+
     @callback
     def _get_parallel_updates_semaphore(
         self, entity_has_async_update: bool
@@ -335,8 +360,10 @@ class EntityPlatform:
         ):
             return
 
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass,
+        self._async_unsub_polling = async_get_poll_scheduler(
+            self.hass
+        ).async_track_poll(
+            self.poll_key,
             self._update_entity_states,
             self.scan_interval,
         )
@@ -590,6 +617,35 @@ class EntityPlatform:
             self.platform_name, name, handle_service, schema
         )
 
+    @callback
+    def async_register_batch_service_handler(
+        self,
+        name: str,
+        handler: Callable[
+            [List[Entity], Dict[str, Any]], Awaitable[Optional[Iterable[Entity]]]
+        ],
+    ) -> None:
+        """Register a handler that calls a service of the domain for many entities.
+
+        The handler is called once with all entities of this platform targeted by
+        a call of the service and the service data without the targeted entities,
+        so it can send a single group command. The call holds one slot of the
+        parallel updates of the platform, like a call of a single entity. It
+        returns the entities it did not handle, which are then called one by one.
+        """
+        self._batch_service_handlers[name] = handler
+
+    @callback
+    def async_get_batch_service_handler(
+        self, call: ServiceCall
+    ) -> Optional[
+        Callable[[List[Entity], Dict[str, Any]], Awaitable[Optional[Iterable[Entity]]]]
+    ]:
+        """Return the batch handler of this platform for a service call."""
+        if call.domain != self.domain:
+            return None
+        return self._batch_service_handlers.get(call.service)
+
     async def _update_entity_states(self, now: datetime) -> None:
         """Update the states of all the polling entities.
 
@@ -153,6 +153,10 @@ class EntityRegistry:
         self.hass = hass
         self.entities: Dict[str, RegistryEntry]
         self._index: Dict[Tuple[str, str, str], str] = {}
+        # Reverse indexes of id -> entity_id -> entry
+        self._device_index: Dict[str, Dict[str, RegistryEntry]] = {}
+        self._area_index: Dict[str, Dict[str, RegistryEntry]] = {}
+        self._config_entry_index: Dict[str, Dict[str, RegistryEntry]] = {}
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_modified
@@ -537,19 +541,14 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
+        for entity_id in list(self._config_entry_index.get(config_entry, ())):
             self.async_remove(entity_id)
 
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for entity_id, entry in self.entities.items():
-            if area_id == entry.area_id:
-                self._async_update_entity(entity_id, area_id=None)
+        for entity_id in list(self._area_index.get(area_id, ())):
+            self._async_update_entity(entity_id, area_id=None)
 
     def _register_entry(self, entry: RegistryEntry) -> None:
         self.entities[entry.entity_id] = entry
@@ -557,6 +556,9 @@ class EntityRegistry:
 
     def _add_index(self, entry: RegistryEntry) -> None:
         self._index[(entry.domain, entry.platform, entry.unique_id)] = entry.entity_id
+        _add_to_index(self._device_index, entry.device_id, entry)
+        _add_to_index(self._area_index, entry.area_id, entry)
+        _add_to_index(self._config_entry_index, entry.config_entry_id, entry)
 
     def _unregister_entry(self, entry: RegistryEntry) -> None:
         self._remove_index(entry)
@@ -564,9 +566,15 @@ class EntityRegistry:
 
     def _remove_index(self, entry: RegistryEntry) -> None:
         del self._index[(entry.domain, entry.platform, entry.unique_id)]
+        _remove_from_index(self._device_index, entry.device_id, entry)
+        _remove_from_index(self._area_index, entry.area_id, entry)
+        _remove_from_index(self._config_entry_index, entry.config_entry_id, entry)
 
     def _rebuild_index(self) -> None:
         self._index = {}
+        self._device_index = {}
+        self._area_index = {}
+        self._config_entry_index = {}
         for entry in self.entities.values():
             self._add_index(entry)
 
@@ -598,11 +606,11 @@ def async_entries_for_device(
     registry: EntityRegistry, device_id: str, include_disabled_entities: bool = False
 ) -> List[RegistryEntry]:
     """Return entries that match a device."""
+    # pylint: disable=protected-access
     return [
         entry
-        for entry in registry.entities.values()
-        if entry.device_id == device_id
-        and (not entry.disabled_by or include_disabled_entities)
+        for entry in registry._device_index.get(device_id, {}).values()
+        if not entry.disabled_by or include_disabled_entities
     ]
 
 
@@ -611,7 +619,8 @@ def async_entries_for_area(
     registry: EntityRegistry, area_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match an area."""
-    return [entry for entry in registry.entities.values() if entry.area_id == area_id]
+    # pylint: disable=protected-access
+    return list(registry._area_index.get(area_id, {}).values())
 
 
 @callback
@@ -619,11 +628,32 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a config entry."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
-    ]
+    # pylint: disable=protected-access
+    return list(registry._config_entry_index.get(config_entry_id, {}).values())
+
+
+def _add_to_index(
+    index: Dict[str, Dict[str, RegistryEntry]],
+    key: Optional[str],
+    entry: RegistryEntry,
+) -> None:
+    """Add an entry to a reverse index."""
+    if key is not None:
+        index.setdefault(key, {})[entry.entity_id] = entry
+
+
+def _remove_from_index(
+    index: Dict[str, Dict[str, RegistryEntry]],
+    key: Optional[str],
+    entry: RegistryEntry,
+) -> None:
+    """Remove an entry from a reverse index."""
+    if key is None:
+        return
+    entries = index[key]
+    del entries[entry.entity_id]
+    if not entries:
+        del index[key]
 
 
 async def _async_migrate(entities: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
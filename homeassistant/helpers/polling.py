@@ -0,0 +1,177 @@
+"""Helper to spread polling over the update interval."""
+import asyncio
+from datetime import datetime, timedelta
+import logging
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Optional
+import zlib
+
+import attr
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.singleton import singleton
+import homeassistant.util.dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_POLL_SCHEDULER = "poll_scheduler"
+
+# Number of blocking updates that are allowed to run in the executor at once
+MAX_EXECUTOR_UPDATES = 16
+
+
+@attr.s(slots=True)
+class PollStatistics:
+    """Statistics of the polls of a platform or coordinator."""
+
+    polls: int = attr.ib(default=0)
+    overruns: int = attr.ib(default=0)
+    last_duration: float = attr.ib(default=0)
+    max_duration: float = attr.ib(default=0)
+    total_duration: float = attr.ib(default=0)
+
+    @property
+    def average_duration(self) -> float:
+        """Return the average duration of a poll in seconds."""
+        if not self.polls:
+            return 0
+        return self.total_duration / self.polls
+
+
+class PollScheduler:
+    """Schedule polls at a stable offset in their interval.
+
+    Each poll key gets an offset in its interval that is derived from the key,
+    so platforms and coordinators with the same interval are spread over it
+    instead of all polling in the same second, also across restarts.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the poll scheduler."""
+        self.hass = hass
+        self.statistics: Dict[str, PollStatistics] = {}
+        self._executor_updates = asyncio.Semaphore(MAX_EXECUTOR_UPDATES)
+
+    @staticmethod
+    def poll_offset(key: str, interval: timedelta) -> float:
+        """Return the offset in seconds of the polls of a key in their interval."""
+        interval_ms = int(interval.total_seconds() * 1000)
+        if interval_ms <= 0:
+            return 0
+        return (zlib.crc32(key.encode()) % interval_ms) / 1000
+
+    def next_poll(
+        self,
+        key: str,
+        interval: timedelta,
+        after: datetime,
+        last_poll: Optional[datetime] = None,
+    ) -> datetime:
+        """Return the next poll of a key after a point in time.
+
+        The poll is at the first offset of the key after the point in time. When
+        the last poll, for example a first or requested refresh, was less than
+        half an interval before that offset, the poll moves to the offset after
+        it so an API does not get two requests in a row. The poll can then be up
+        to one and a half intervals after the last poll.
+        """
+        seconds = interval.total_seconds()
+        if seconds <= 0:
+            return after
+        timestamp = after.timestamp()
+        elapsed = (timestamp - self.poll_offset(key, interval)) % seconds
+        next_timestamp = timestamp - elapsed + seconds
+        if (
+            last_poll is not None
+            and next_timestamp - last_poll.timestamp() < seconds / 2
+        ):
+            next_timestamp += seconds
+        return dt_util.utc_from_timestamp(next_timestamp)
+
+    @callback
+    def async_track_poll(
+        self,
+        key: str,
+        action: Callable[[datetime], Awaitable[None]],
+        interval: timedelta,
+    ) -> CALLBACK_TYPE:
+        """Call an action every interval at the offset of the key."""
+        cancel_poll: Optional[CALLBACK_TYPE] = None
+        running = False
+
+        @callback
+        def schedule(after: datetime) -> None:
+            """Schedule the next poll."""
+            nonlocal cancel_poll
+            cancel_poll = async_track_point_in_utc_time(
+                self.hass, job, self.next_poll(key, interval, after)
+            )
+
+        async def poll(now: datetime) -> None:
+            """Schedule the next poll and run the action."""
+            nonlocal running
+            # Do not catch up on missed polls when the event loop was blocked
+            schedule(max(now, dt_util.utcnow()))
+
+            if running:
+                # The action decides how to handle overlapping polls
+                await action(now)
+                return
+
+            running = True
+            try:
+                await self.async_run_poll(key, interval, lambda: action(now))
+            finally:
+                running = False
+
+        job = HassJob(poll)
+        schedule(dt_util.utcnow())
+
+        @callback
+        def remove_poll() -> None:
+            """Stop polling."""
+            if cancel_poll is not None:
+                cancel_poll()
+
+        return remove_poll
+
+    async def async_run_poll(
+        self,
+        key: str,
+        interval: Optional[timedelta],
+        action: Callable[[], Awaitable[Any]],
+    ) -> None:
+        """Run a poll and record how long it took."""
+        start = monotonic()
+        try:
+            await action()
+        finally:
+            duration = monotonic() - start
+            stats = self.statistics.get(key)
+            if stats is None:
+                stats = self.statistics[key] = PollStatistics()
+            stats.polls += 1
+            stats.last_duration = duration
+            stats.max_duration = max(stats.max_duration, duration)
+            stats.total_duration += duration
+            if interval is not None and duration > interval.total_seconds():
+                stats.overruns += 1
+                _LOGGER.warning(
+                    "Poll of %s took %.3f seconds, longer than its interval of %s",
+                    key,
+                    duration,
+                    interval,
+                )
+
+    async def async_add_executor_update(self, update: Callable[[], Any]) -> None:
+        """Run a blocking update in the executor within the global budget."""
+        async with self._executor_updates:
+            await self.hass.async_add_executor_job(update)
+
+
+@singleton(DATA_POLL_SCHEDULER)
+@callback
+def async_get_poll_scheduler(hass: HomeAssistant) -> PollScheduler:
+    """Return the poll scheduler."""
+    return PollScheduler(hass)
@@ -352,24 +352,28 @@ async def async_extract_referenced_entity_ids(
         for area_id in area_lookup:
             if area_id not in area_reg.areas:
                 selected.missing_areas.add(area_id)
-                continue
 
-        # Find entities tied to an area
-        for entity_entry in ent_reg.entities.values():
-            if entity_entry.area_id in area_lookup:
+            # Find entities tied to an area
+            for entity_entry in entity_registry.async_entries_for_area(
+                ent_reg, area_id
+            ):
                 selected.indirectly_referenced.add(entity_entry.entity_id)
 
-        # Find devices for this area
-        for device_entry in dev_reg.devices.values():
-            if device_entry.area_id in area_lookup:
+            # Find devices for this area
+            for device_entry in device_registry.async_entries_for_area(
+                dev_reg, area_id
+            ):
                 picked_devices.add(device_entry.id)
 
     if not picked_devices:
         return selected
 
-    for entity_entry in ent_reg.entities.values():
-        if not entity_entry.area_id and entity_entry.device_id in picked_devices:
-            selected.indirectly_referenced.add(entity_entry.entity_id)
+    for device_id in picked_devices:
+        for entity_entry in entity_registry.async_entries_for_device(
+            ent_reg, device_id, include_disabled_entities=True
+        ):
+            if not entity_entry.area_id:
+                selected.indirectly_referenced.add(entity_entry.entity_id)
 
     return selected
 
@@ -475,6 +479,27 @@ def async_set_service_schema(
     hass.data[SERVICE_DESCRIPTION_CACHE][f"{domain}.{service}"] = description
 
 
+def _get_platform_entities(
+    platform: "EntityPlatform", entity_ids: Set[str]
+) -> List["Entity"]:
+    """Return the entities of a platform that are in a set of entity ids.
+
+    The entities are returned in the order they were added to the platform.
+    Looks up the entity ids in the entities of the platform when there are
+    fewer of them, so targeting a single entity does not scan large platforms.
+    """
+    entities = platform.entities
+    if len(entity_ids) < len(entities):
+        found = [entity_id for entity_id in entity_ids if entity_id in entities]
+        if len(found) < 2:
+            return [entities[entity_id] for entity_id in found]
+        # The set has no stable order, use the order of the platform
+        entity_ids = set(found)
+    return [
+        entity for entity_id, entity in entities.items() if entity_id in entity_ids
+    ]
+
+
 @bind_hass
 async def entity_service_call(
     hass: HomeAssistantType,
@@ -530,11 +555,7 @@ async def entity_service_call(
             else:
                 assert all_referenced is not None
                 entity_candidates.extend(
-                    [
-                        entity
-                        for entity in platform.entities.values()
-                        if entity.entity_id in all_referenced
-                    ]
+                    _get_platform_entities(platform, all_referenced)
                 )
 
     elif target_all_entities:
@@ -554,10 +575,7 @@ async def entity_service_call(
 
         for platform in platforms:
             platform_entities = []
-            for entity in platform.entities.values():
-
-                if entity.entity_id not in all_referenced:
-                    continue
+            for entity in _get_platform_entities(platform, all_referenced):
 
                 if not entity_perms(entity.entity_id, POLICY_CONTROL):
                     raise Unauthorized(
@@ -602,18 +620,47 @@ async def entity_service_call(
     if not entities:
         return
 
-    done, pending = await asyncio.wait(
-        [
+    batches, unbatched = _group_batch_entity_calls(call, entities)
+
+    def entity_call_tasks(to_call: List[Entity]) -> List[asyncio.Task]:
+        """Create the tasks that call the service for each entity."""
+        return [
             asyncio.create_task(
                 entity.async_request_call(
                     _handle_entity_call(hass, entity, func, data, call.context)
                 )
             )
-            for entity in entities
+            for entity in to_call
         ]
-    )
+
+    # The service call data without the targeted entities
+    batch_data = {
+        key: val
+        for key, val in call.data.items()
+        if key not in cv.ENTITY_SERVICE_FIELDS
+    }
+    batch_tasks = [
+        asyncio.create_task(_handle_batch_call(handler, batch, batch_data))
+        for handler, batch in batches
+    ]
+    call_tasks = batch_tasks + entity_call_tasks(unbatched)
+    _, pending = await asyncio.wait(call_tasks)
     assert not pending
-    for future in done:
+
+    # Entities the batch handlers left to be called one by one
+    unhandled = [
+        entity
+        for task in batch_tasks
+        if task.exception() is None
+        for entity in task.result() or ()
+    ]
+    if unhandled:
+        unhandled_tasks = entity_call_tasks(unhandled)
+        _, pending = await asyncio.wait(unhandled_tasks)
+        assert not pending
+        call_tasks.extend(unhandled_tasks)
+
+    for future in call_tasks:
         future.result()  # pop exception if have
 
     tasks = []
@@ -634,6 +681,48 @@ async def entity_service_call(
             future.result()  # pop exception if have
 
 
+def _group_batch_entity_calls(
+    call: ha.ServiceCall, entities: List[Entity]
+) -> Tuple[List[Tuple[Callable, List[Entity]]], List[Entity]]:
+    """Group the entities by the batch handler of their platform.
+
+    Returns the batches and the entities that have to be called one by one.
+    """
+    unbatched: List[Entity] = []
+    batches: Dict["EntityPlatform", Tuple[Callable, List[Entity]]] = {}
+
+    for entity in entities:
+        platform = entity.platform
+        handler = (
+            platform.async_get_batch_service_handler(call)
+            if platform is not None
+            else None
+        )
+        if handler is None:
+            unbatched.append(entity)
+            continue
+        entity.async_set_context(call.context)
+        batches.setdefault(platform, (handler, []))[1].append(entity)
+
+    return list(batches.values()), unbatched
+
+
+async def _handle_batch_call(
+    handler: Callable[
+        [List[Entity], Dict[str, Any]], Awaitable[Optional[Iterable[Entity]]]
+    ],
+    batch: List[Entity],
+    data: Dict[str, Any],
+) -> Optional[Iterable[Entity]]:
+    """Call a batch handler within the parallel updates of its platform."""
+    # The entities of a platform share the parallel updates semaphore
+    parallel_updates = batch[0].parallel_updates
+    if parallel_updates is None:
+        return await handler(batch, data)
+    async with parallel_updates:
+        return await handler(batch, data)
+
+
 async def _handle_entity_call(
     hass: HomeAssistantType,
     entity: Entity,
@@ -9,12 +9,14 @@ import urllib.error
 import aiohttp
 import requests
 
+from homeassistant import config_entries
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import CALLBACK_TYPE, Event, HassJob, HomeAssistant, callback
 from homeassistant.helpers import entity, event
 from homeassistant.util.dt import utcnow
 
 from .debounce import Debouncer
+from .polling import async_get_poll_scheduler
 
 REQUEST_REFRESH_DEFAULT_COOLDOWN = 10
 REQUEST_REFRESH_DEFAULT_IMMEDIATE = True
@@ -48,12 +50,20 @@ class DataUpdateCoordinator(Generic[T]):
         self.update_method = update_method
         self.update_interval = update_interval
 
+        # Coordinators of the config entries of an integration usually share
+        # their name, so they are told apart by the entry that sets them up
+        self.poll_key = name
+        entry = config_entries.current_entry.get()
+        if entry is not None:
+            self.poll_key = f"{name}.{entry.entry_id}"
+
         self.data: Optional[T] = None
 
         self._listeners: List[CALLBACK_TYPE] = []
         self._job = HassJob(self._handle_refresh_interval)
         self._unsub_refresh: Optional[CALLBACK_TYPE] = None
         self._request_refresh_task: Optional[asyncio.TimerHandle] = None
+        self._last_refresh: Optional[datetime] = None
         self.last_update_success = True
 
         if request_refresh_debouncer is None:
@@ -110,20 +120,24 @@ class DataUpdateCoordinator(Generic[T]):
             self._unsub_refresh()
             self._unsub_refresh = None
 
-        # We _floor_ utcnow to create a schedule on a rounded second,
-        # minimizing the time between the point and the real activation.
-        # That way we obtain a constant update frequency,
-        # as long as the update process takes less than a second
+        # Refreshes happen at a fixed offset in the update interval that is
+        # derived from the poll key, so coordinators with the same interval do
+        # not all refresh at once. That way we also obtain a constant update
+        # frequency, as long as the update takes less than half the interval.
         self._unsub_refresh = event.async_track_point_in_utc_time(
             self.hass,
             self._job,
-            utcnow().replace(microsecond=0) + self.update_interval,
+            async_get_poll_scheduler(self.hass).next_poll(
+                self.poll_key, self.update_interval, utcnow(), self._last_refresh
+            ),
         )
 
     async def _handle_refresh_interval(self, _now: datetime) -> None:
         """Handle a refresh interval occurrence."""
         self._unsub_refresh = None
-        await self.async_refresh()
+        await async_get_poll_scheduler(self.hass).async_run_poll(
+            self.poll_key, self.update_interval, self.async_refresh
+        )
 
     async def async_request_refresh(self) -> None:
         """Request a refresh.
@@ -188,6 +202,7 @@ class DataUpdateCoordinator(Generic[T]):
                 self.logger.info("Fetching %s data recovered", self.name)
 
         finally:
+            self._last_refresh = utcnow()
             self.logger.debug(
                 "Finished fetching %s data in %.3f seconds",
                 self.name,
@@ -210,6 +225,7 @@ class DataUpdateCoordinator(Generic[T]):
 
         self.data = data
         self.last_update_success = True
+        self._last_refresh = utcnow()
         self.logger.debug(
             "Manually updated %s data",
             self.name,
@@ -323,6 +323,153 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def mqtt_subscription_matching(hass):
+    """Match 100k MQTT messages against 10k subscriptions."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import mqtt
+
+    trie = mqtt.SubscriptionTrie()
+    job = core.HassJob(lambda msg: None)
+    for idx in range(10 ** 4):
+        trie.add(mqtt.Subscription(f"homeassistant/sensor/node{idx}/state", job))
+        if idx % 100 == 0:
+            trie.add(mqtt.Subscription(f"homeassistant/+/node{idx}/#", job))
+    trie.add(mqtt.Subscription("homeassistant/#", job))
+
+    topics = [f"homeassistant/sensor/node{idx}/state" for idx in range(10 ** 4)]
+    size = len(topics)
+    count = 10 ** 5
+
+    start = timer()
+
+    for i in range(count):
+        trie.matches(topics[i % size])
+
+    runtime = timer() - start
+    print(f"{count / runtime:.0f} messages per second")
+    return runtime
+
+
+@benchmark
+async def entity_service_call_large_domain(hass):
+    """Call an entity service targeting one entity of a large domain."""
+    # pylint: disable=import-outside-toplevel
+    import tempfile
+
+    from homeassistant.helpers import area_registry, device_registry, entity_registry
+    from homeassistant.helpers.entity import Entity
+    from homeassistant.helpers.entity_component import EntityComponent
+
+    entity_count = 1500
+    call_count = 10 ** 4
+
+    class BenchmarkEntity(Entity):
+        """Entity that handles the benchmark service."""
+
+        should_poll = False
+
+        def __init__(self, index):
+            """Initialize the entity."""
+            self.entity_id = f"light.benchmark_{index}"
+
+        async def async_benchmark(self):
+            """Handle the service."""
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        await asyncio.gather(
+            area_registry.async_load(hass),
+            device_registry.async_load(hass),
+            entity_registry.async_load(hass),
+        )
+        component = EntityComponent(logging.getLogger(__name__), "light", hass)
+        await component.async_add_entities(
+            [BenchmarkEntity(index) for index in range(entity_count)]
+        )
+    component.async_register_entity_service("benchmark", {}, "async_benchmark")
+
+    start = timer()
+
+    for index in range(call_count):
+        await hass.services.async_call(
+            "light",
+            "benchmark",
+            {"entity_id": f"light.benchmark_{index % entity_count}"},
+            blocking=True,
+        )
+
+    return timer() - start
+
+
+@benchmark
+async def stream_hls_latency(hass):
+    """Compare the latency of HLS segments and LL-HLS parts of a local video."""
+    # pylint: disable=import-outside-toplevel
+    import tempfile
+    import threading
+
+    import av
+
+    from homeassistant.components.stream.const import MAX_SEGMENTS, TARGET_PART_DURATION
+    from homeassistant.components.stream.hls import HlsStreamOutput
+    from homeassistant.components.stream.worker import stream_worker
+
+    fps = 24
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as video_file:
+        # Encode a 60 second video with a keyframe every 2 seconds
+        container = av.open(video_file.name, "w")
+        video = container.add_stream("libx264", rate=fps)
+        video.width = 640
+        video.height = 480
+        video.codec_context.gop_size = 2 * fps
+        for index in range(60 * fps):
+            frame = av.VideoFrame(640, 480, "yuv420p")
+            frame.pts = index
+            container.mux(video.encode(frame))
+        container.mux(video.encode())
+        container.close()
+
+        segments = []
+        parts = []
+
+        class Output(HlsStreamOutput):
+            """Collect the segments and parts produced by the worker."""
+
+            def put(self, segment):
+                segments.append(segment.duration)
+
+            def put_part(self, sequence, part):
+                parts.append(part.duration)
+
+        class Stream:
+            """Feed the local video to the worker."""
+
+            source = video_file.name
+            options = {}
+            keyframe = None
+            outputs = {"hls": Output(hass, None)}
+
+        start = timer()
+        await hass.async_add_executor_job(
+            stream_worker, hass, Stream(), threading.Event()
+        )
+        runtime = timer() - start
+
+    def average_latency(durations, hold_back):
+        """Return how long a frame takes on average to be played."""
+        # Frames are published at the end of their segment or part and
+        # players start that far from the end of the playlist
+        published = sum(duration ** 2 / 2 for duration in durations)
+        return published / sum(durations) + hold_back
+
+    segment_latency = average_latency(segments, (MAX_SEGMENTS - 1) * max(segments))
+    part_latency = average_latency(parts, 3 * TARGET_PART_DURATION)
+    print(f"{len(segments)} segments, {segment_latency:.2f}s average latency")
+    print(f"{len(parts)} parts, {part_latency:.2f}s average latency")
+    return runtime
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -345,6 +492,8 @@ def _create_state_changed_event_from_old_new(
             "entity_id"
             "domain"
             "attributes"
+            "shared_attrs"
+            "attributes_hash"
             "state_id",
             "old_state_id",
         ],
@@ -353,6 +502,8 @@ def _create_state_changed_event_from_old_new(
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
     row.attributes = attributes_json
+    row.shared_attrs = None
+    row.attributes_hash = None
     row.time_fired = event_time_fired
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
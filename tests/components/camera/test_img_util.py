@@ -0,0 +1,90 @@
+"""Test camera img_util module."""
+from unittest.mock import patch
+
+from homeassistant.components.camera import Image
+from homeassistant.components.camera.img_util import (
+    TurboJPEGSingleton,
+    scale_jpeg_camera_image,
+)
+
+from .common import EMPTY_8_6_JPEG, mock_turbo_jpeg
+
+EMPTY_16_12_JPEG = b"empty_16_12"
+
+
+def test_turbojpeg_singleton():
+    """Verify the instance always gives back the same."""
+    assert TurboJPEGSingleton.instance() == TurboJPEGSingleton.instance()
+
+
+def test_scale_jpeg_camera_image():
+    """Test we can scale a jpeg image."""
+
+    camera_image = Image("image/jpeg", EMPTY_16_12_JPEG)
+
+    turbo_jpeg = mock_turbo_jpeg(first_width=16, first_height=12)
+    with patch("turbojpeg.TurboJPEG", return_value=False):
+        TurboJPEGSingleton()
+        assert scale_jpeg_camera_image(camera_image, 16, 12) == camera_image.content
+
+    turbo_jpeg = mock_turbo_jpeg(first_width=16, first_height=12)
+    with patch("turbojpeg.TurboJPEG", return_value=turbo_jpeg):
+        TurboJPEGSingleton()
+        assert scale_jpeg_camera_image(camera_image, 16, 12) == EMPTY_16_12_JPEG
+
+    turbo_jpeg = mock_turbo_jpeg(
+        first_width=16, first_height=12, second_width=8, second_height=6
+    )
+    with patch("turbojpeg.TurboJPEG", return_value=turbo_jpeg):
+        TurboJPEGSingleton()
+        jpeg_bytes = scale_jpeg_camera_image(camera_image, 8, 6)
+
+    assert jpeg_bytes == EMPTY_8_6_JPEG
+
+
+def test_turbojpeg_load_failure():
+    """Handle libjpegturbo not being installed."""
+
+    with patch("turbojpeg.TurboJPEG", side_effect=Exception):
+        TurboJPEGSingleton()
+        assert TurboJPEGSingleton.instance() is False
+
+    with patch("turbojpeg.TurboJPEG"):
+        TurboJPEGSingleton()
+        assert TurboJPEGSingleton.instance()
+
+
+def test_scale_jpeg_camera_image_size_and_quality():
+    """Test scaling to a single dimension or only changing the quality."""
+    camera_image = Image("image/jpeg", EMPTY_16_12_JPEG)
+
+    turbo_jpeg = mock_turbo_jpeg(first_width=16, first_height=12)
+    with patch.object(TurboJPEGSingleton, "instance", return_value=turbo_jpeg):
+        assert scale_jpeg_camera_image(camera_image, height=4) == EMPTY_8_6_JPEG
+    turbo_jpeg.scale_with_quality.assert_called_once_with(
+        EMPTY_16_12_JPEG, scaling_factor=(3, 8), quality=75
+    )
+
+    turbo_jpeg = mock_turbo_jpeg(first_width=16, first_height=12)
+    with patch.object(TurboJPEGSingleton, "instance", return_value=turbo_jpeg):
+        assert scale_jpeg_camera_image(camera_image, quality=30) == EMPTY_8_6_JPEG
+    turbo_jpeg.scale_with_quality.assert_called_once_with(
+        EMPTY_16_12_JPEG, scaling_factor=(1, 1), quality=30
+    )
+
+
+def test_scale_jpeg_camera_image_above_largest_factor():
+    """Test the image is not scaled below a size close to its own."""
+    camera_image = Image("image/jpeg", EMPTY_16_12_JPEG)
+
+    turbo_jpeg = mock_turbo_jpeg(first_width=16, first_height=12)
+    with patch.object(TurboJPEGSingleton, "instance", return_value=turbo_jpeg):
+        assert scale_jpeg_camera_image(camera_image, width=15) == EMPTY_16_12_JPEG
+    turbo_jpeg.scale_with_quality.assert_not_called()
+
+    turbo_jpeg = mock_turbo_jpeg(first_width=16, first_height=12)
+    with patch.object(TurboJPEGSingleton, "instance", return_value=turbo_jpeg):
+        scale_jpeg_camera_image(camera_image, width=15, quality=50)
+    turbo_jpeg.scale_with_quality.assert_called_once_with(
+        EMPTY_16_12_JPEG, scaling_factor=(1, 1), quality=50
+    )
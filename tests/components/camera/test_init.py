@@ -2,7 +2,7 @@
 import asyncio
 import base64
 import io
-from unittest.mock import Mock, PropertyMock, mock_open, patch
+from unittest.mock import AsyncMock, Mock, PropertyMock, mock_open, patch
 
 import pytest
 
@@ -16,6 +16,7 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.setup import async_setup_component
 
 from tests.components.camera import common
+from tests.components.camera.common import EMPTY_8_6_JPEG, mock_turbo_jpeg
 
 
 @pytest.fixture(name="mock_camera")
@@ -316,6 +317,7 @@ async def test_preload_stream(hass, mock_stream):
         hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
         await hass.async_block_till_done()
         assert mock_create_stream.called
+        assert mock_create_stream.return_value.keepalive is True
 
 
 async def test_record_service_invalid_path(hass, mock_camera):
@@ -354,3 +356,125 @@ async def test_record_service(hass, mock_camera, mock_stream):
         # So long as we call stream.record, the rest should be covered
         # by those tests.
         assert mock_record.called
+
+
+async def test_get_image_shares_fetch(hass, image_mock_url):
+    """Test concurrent image requests share a single fetch."""
+    calls = 0
+    release = asyncio.Event()
+
+    async def mock_camera_image(self):
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return b"Test"
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        mock_camera_image,
+    ):
+        tasks = [
+            hass.async_create_task(camera.async_get_image(hass, "camera.demo_camera"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        images = await asyncio.gather(*tasks)
+        assert [image.content for image in images] == [b"Test"] * 3
+        assert calls == 1
+
+        # Without a max age every request after the fetch fetches again
+        await camera.async_get_image(hass, "camera.demo_camera")
+        assert calls == 2
+
+        common.mock_camera_prefs(
+            hass,
+            "camera.demo_camera",
+            {camera.const.PREF_SNAPSHOT_MAX_AGE: 60},
+        )
+        image = await camera.async_get_image(hass, "camera.demo_camera")
+        assert image.content == b"Test"
+        assert calls == 2
+
+
+async def test_get_image_from_stream(hass, image_mock_url):
+    """Test the image is taken from a running stream."""
+    demo_camera = hass.data[camera.DOMAIN].get_entity("camera.demo_camera")
+    demo_camera.stream = Mock(async_get_image=AsyncMock(return_value=b"Frame"))
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+    ) as mock_camera_image:
+        image = await camera.async_get_image(hass, "camera.demo_camera")
+
+    assert image.content == b"Frame"
+    assert not mock_camera_image.called
+
+    demo_camera.stream.async_get_image.return_value = None
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        return_value=b"Test",
+    ):
+        image = await camera.async_get_image(hass, "camera.demo_camera")
+
+    assert image.content == b"Test"
+
+
+async def test_camera_proxy_resized_image(hass, hass_client, mock_camera):
+    """Test the camera proxy resizes images and caches them per size."""
+    client = await hass_client()
+    turbo_jpeg = mock_turbo_jpeg(first_width=16, first_height=12)
+
+    with patch(
+        "homeassistant.components.camera.img_util.TurboJPEGSingleton.instance",
+        return_value=turbo_jpeg,
+    ):
+        resp = await client.get("/api/camera_proxy/camera.demo_camera?width=8")
+        assert resp.status == 200
+        assert await resp.read() == EMPTY_8_6_JPEG
+
+        resp = await client.get("/api/camera_proxy/camera.demo_camera?width=8")
+        assert resp.status == 200
+        assert await resp.read() == EMPTY_8_6_JPEG
+
+        resp = await client.get("/api/camera_proxy/camera.demo_camera")
+        assert resp.status == 200
+        assert await resp.read() == b"Test"
+
+    assert turbo_jpeg.decode_header.call_count == 1
+    turbo_jpeg.scale_with_quality.assert_called_once_with(
+        b"Test", scaling_factor=(1, 2), quality=75
+    )
+
+    resp = await client.get("/api/camera_proxy/camera.demo_camera?width=0")
+    assert resp.status == 400
+
+    resp = await client.get("/api/camera_proxy/camera.demo_camera?quality=101")
+    assert resp.status == 400
+
+
+async def test_websocket_camera_thumbnail_resized(hass, hass_ws_client, mock_camera):
+    """Test camera_thumbnail websocket command with a size."""
+    client = await hass_ws_client(hass)
+    turbo_jpeg = mock_turbo_jpeg(first_width=16, first_height=12)
+
+    with patch(
+        "homeassistant.components.camera.img_util.TurboJPEGSingleton.instance",
+        return_value=turbo_jpeg,
+    ):
+        await client.send_json(
+            {
+                "id": 5,
+                "type": "camera_thumbnail",
+                "entity_id": "camera.demo_camera",
+                "height": 3,
+                "quality": 50,
+            }
+        )
+        msg = await client.receive_json()
+
+    assert msg["success"]
+    assert msg["result"]["content"] == base64.b64encode(EMPTY_8_6_JPEG).decode("utf-8")
+    turbo_jpeg.scale_with_quality.assert_called_once_with(
+        b"Test", scaling_factor=(1, 4), quality=50
+    )
@@ -1008,3 +1008,89 @@ async def test_entity_ids_limit_via_api_with_skip_initial_state(hass, hass_clien
     assert len(response_json) == 2
     assert response_json[0][0]["entity_id"] == "light.kitchen"
     assert response_json[1][0]["entity_id"] == "light.cow"
+
+
+async def test_fetch_period_api_with_statistics(hass, hass_client):
+    """Test the fetch period view for history with statistics rollups."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    start = dt_util.utcnow() - timedelta(hours=1)
+
+    with patch(
+        "homeassistant.components.history.statistics_during_period",
+        return_value={
+            "sensor.power": [
+                {
+                    "entity_id": "sensor.power",
+                    "start": start.isoformat(),
+                    "mean": 1.5,
+                    "min": 1.0,
+                    "max": 2.0,
+                    "sum": 3.0,
+                }
+            ]
+        },
+    ) as statistics_during_period:
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}",
+            params={"statistics": "hour", "filter_entity_id": "sensor.power"},
+        )
+    assert response.status == 200
+    assert (await response.json())[0][0]["mean"] == 1.5
+    assert statistics_during_period.call_args[0][3] == ["sensor.power"]
+    assert statistics_during_period.call_args[0][4] == "hour"
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}", params={"statistics": "day"}
+    )
+    assert response.status == 400
+
+
+async def test_fetch_period_api_with_stream(hass, hass_client):
+    """Test the streamed fetch period view matches the buffered one."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    instance = hass.data[recorder.DATA_INSTANCE]
+    await hass.async_add_executor_job(instance.block_till_done)
+    client = await hass_client()
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("sensor.power", "1")
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    start = dt_util.utcnow()
+    for value in range(2, 6):
+        hass.states.async_set("sensor.power", str(value), {"unit": "W"})
+    hass.states.async_set("sensor.power", "5", {"unit": "kW"})
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    for query in ("", "&minimal_response", "&skip_initial_state"):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}?stream{query}"
+        )
+        assert response.status == 200
+        streamed = await response.json()
+
+        response = await client.get(f"/api/history/period/{start.isoformat()}?{query}")
+        assert response.status == 200
+        buffered = await response.json()
+
+        assert sorted(streamed, key=lambda states: states[0]["entity_id"]) == sorted(
+            buffered, key=lambda states: states[0]["entity_id"]
+        )
+
+    assert len(streamed) == 1
+    assert [state["state"] for state in streamed[0]] == ["2", "3", "4", "5"]
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"stream": "", "filter_entity_id": "switch.none"},
+    )
+    assert response.status == 200
+    assert await response.json() == []
@@ -10,7 +10,10 @@ import pytz
 
 from homeassistant import config as hass_config
 from homeassistant.components.history_stats import DOMAIN
-from homeassistant.components.history_stats.sensor import HistoryStatsSensor
+from homeassistant.components.history_stats.sensor import (
+    HistoryStatsSensor,
+    HistoryStatsTracker,
+)
 from homeassistant.const import SERVICE_RELOAD, STATE_UNKNOWN
 import homeassistant.core as ha
 from homeassistant.helpers.template import Template
@@ -174,6 +177,103 @@ class TestHistoryStatsSensor(unittest.TestCase):
         assert sensor3.state == 2
         assert sensor4.state == 50
 
+    def test_measure_incremental(self):
+        """Test the measure follows state changes without reloading history."""
+        t0 = dt_util.utcnow() - timedelta(minutes=40)
+        t1 = t0 + timedelta(minutes=20)
+
+        # Start     t0        t1        now
+        # |--20min--|--20min--|--20min--|
+        # |---off---|---on----|---off---|
+
+        fake_states = {
+            "binary_sensor.test_id": [
+                ha.State("binary_sensor.test_id", "on", last_changed=t0),
+                ha.State("binary_sensor.test_id", "off", last_changed=t1),
+            ]
+        }
+
+        start = Template("{{ as_timestamp(now()) - 3600 }}", self.hass)
+        end = Template("{{ now() }}", self.hass)
+
+        sensor = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "count", "Test"
+        )
+
+        with patch(
+            "homeassistant.components.history.state_changes_during_period",
+            return_value=fake_states,
+        ) as state_changes, patch(
+            "homeassistant.components.history.get_state", return_value=None
+        ):
+            sensor.update()
+            assert sensor.state == 1
+            assert round(sensor.value, 2) == 0.33
+
+            # Turned on 10 minutes ago
+            sensor._changes.append(
+                ((dt_util.utcnow() - timedelta(minutes=10)).timestamp(), True)
+            )
+            sensor.update()
+
+        assert len(state_changes.mock_calls) == 1
+        assert sensor.state == 2
+        assert round(sensor.value, 2) == 0.5
+
+    def test_measure_uncommitted_changes(self):
+        """Test queued changes missing from the loaded history are counted."""
+        t0 = dt_util.utcnow() - timedelta(minutes=40)
+        t1 = t0 + timedelta(minutes=20)
+
+        fake_states = {
+            "binary_sensor.test_id": [
+                ha.State("binary_sensor.test_id", "on", last_changed=t0),
+                ha.State("binary_sensor.test_id", "off", last_changed=t1),
+            ]
+        }
+
+        start = Template("{{ as_timestamp(now()) - 3600 }}", self.hass)
+        end = Template("{{ now() }}", self.hass)
+
+        sensor = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "count", "Test"
+        )
+
+        # Already in the history
+        sensor._changes.append((t1.timestamp(), False))
+        # Turned on 10 minutes ago, but not committed to the database yet
+        sensor._changes.append(
+            ((dt_util.utcnow() - timedelta(minutes=10)).timestamp(), True)
+        )
+
+        with patch(
+            "homeassistant.components.history.state_changes_during_period",
+            return_value=fake_states,
+        ), patch("homeassistant.components.history.get_state", return_value=None):
+            sensor.update()
+
+        assert sensor.state == 2
+        assert round(sensor.value, 2) == 0.5
+
+    def test_tracker_move_start(self):
+        """Test moving the start of the tracker forgets old changes."""
+        tracker = HistoryStatsTracker(0, False)
+        tracker.add_change(10, True)
+        tracker.add_change(20, False)
+        tracker.add_change(30, True)
+        assert tracker.count == 2
+        assert tracker.elapsed(40) == 20
+
+        tracker.move_start(15)
+        assert tracker.start == 15
+        assert tracker.count == 1
+        assert tracker.elapsed(40) == 15
+
+        tracker.move_start(35)
+        assert not tracker.has_changes
+        assert tracker.count == 0
+        assert tracker.elapsed(40) == 5
+
     def test_measure_multiple(self):
         """Test the history statistics sensor measure for multiple states."""
         t0 = dt_util.utcnow() - timedelta(minutes=40)
@@ -1,6 +1,7 @@
 """The tests for the InfluxDB component."""
 from dataclasses import dataclass
 import datetime
+import itertools
 from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
@@ -1789,3 +1790,100 @@ async def test_precision(
     assert write_api.call_count == 1
     assert write_api.call_args == get_mock_call(body, precision)
     write_api.reset_mock()
+
+
+@pytest.mark.parametrize(
+    "mock_client, config_ext, get_write_api, get_mock_call",
+    [
+        (
+            influxdb.DEFAULT_API_VERSION,
+            BASE_V1_CONFIG,
+            _get_write_api_mock_v1,
+            influxdb.DEFAULT_API_VERSION,
+        ),
+        (
+            influxdb.API_VERSION_2,
+            BASE_V2_CONFIG,
+            _get_write_api_mock_v2,
+            influxdb.API_VERSION_2,
+        ),
+    ],
+    indirect=["mock_client", "get_mock_call"],
+)
+async def test_event_listener_spool(
+    hass, mock_client, config_ext, get_write_api, get_mock_call, tmpdir
+):
+    """Test events are spooled while InfluxDB is down and replayed in order."""
+    config = {"spool": {"path": str(tmpdir), "replay_rate": 1}}
+    config.update(config_ext)
+    handler_method = await _setup(hass, mock_client, config, get_write_api)
+    instance = hass.data[influxdb.DOMAIN]
+
+    def make_state_event(value):
+        state = MagicMock(
+            state=value,
+            domain="fake",
+            entity_id="fake.entity",
+            object_id="entity",
+            attributes={},
+        )
+        return MagicMock(data={"new_state": state}, time_fired=12345)
+
+    def body(value):
+        return [
+            {
+                "measurement": "fake.entity",
+                "tags": {"domain": "fake", "entity_id": "entity"},
+                "time": 12345,
+                "fields": {"value": value},
+            }
+        ]
+
+    write_api = get_write_api(mock_client)
+    write_api.side_effect = IOError("foo")
+
+    monotonic_time = 0
+    with patch(f"{INFLUX_PATH}.time.monotonic", new=lambda: monotonic_time):
+        # Write fails, events are spooled without retrying
+        handler_method(make_state_event(1))
+        instance.block_till_done()
+        handler_method(make_state_event(2))
+        instance.block_till_done()
+        assert write_api.call_count == 1
+        assert instance.spool.size > 0
+        assert instance.spool.peek() == body(1)
+
+        # Events are replayed in order at the replay rate once InfluxDB is back
+        write_api.side_effect = None
+        monotonic_time = influxdb.RETRY_DELAY
+        handler_method(make_state_event(3))
+        instance.block_till_done()
+        assert write_api.call_args_list[1:] == [get_mock_call(body(1))]
+
+        monotonic_time += 0.5
+        handler_method(make_state_event(4))
+        instance.block_till_done()
+        assert write_api.call_count == 2
+
+        monotonic_time += 0.5
+        handler_method(make_state_event(5))
+        instance.block_till_done()
+        assert write_api.call_args_list[1:] == [
+            get_mock_call(body(1)),
+            get_mock_call(body(2)),
+        ]
+
+        monotonic_time += 60
+        handler_method(make_state_event(6))
+        instance.block_till_done()
+        assert write_api.call_count == 4
+
+    # The spool drains as fast as the replay rate allows
+    with patch(f"{INFLUX_PATH}.time.monotonic", new=itertools.count(100).__next__):
+        handler_method(make_state_event(7))
+        instance.block_till_done()
+    assert write_api.call_args_list[1:] == [
+        get_mock_call(body(value)) for value in range(1, 8)
+    ]
+    assert instance.spool.peek() is None
+    assert instance.spool.size == 0
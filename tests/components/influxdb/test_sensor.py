@@ -596,3 +596,21 @@ async def test_data_repository_not_found(
     assert (
         len([record for record in caplog.records if record.levelname == "ERROR"]) == 1
     )
+
+
+@pytest.mark.parametrize("mock_client", [DEFAULT_API_VERSION], indirect=True)
+async def test_spool_sensors(hass, mock_client, tmpdir):
+    """Test the size and lag of the spool are reported by sensors."""
+    config = {DOMAIN: {"spool": {"path": str(tmpdir)}}}
+    assert await async_setup_component(hass, DOMAIN, config)
+    await hass.async_block_till_done()
+
+    spool = hass.data[DOMAIN].spool
+    assert hass.states.get("sensor.influxdb_spool_size").state == "0.0"
+    assert hass.states.get("sensor.influxdb_spool_lag").state == "0"
+
+    with patch("homeassistant.components.influxdb.spool.time.time", return_value=0):
+        spool.append([{"measurement": "fake", "fields": {"value": 1}}])
+    spool.peek()
+    await hass.helpers.entity_component.async_update_entity("sensor.influxdb_spool_lag")
+    assert int(hass.states.get("sensor.influxdb_spool_lag").state) > 0
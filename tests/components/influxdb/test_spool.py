@@ -0,0 +1,69 @@
+"""The tests for the InfluxDB spool."""
+import os
+
+from homeassistant.components.influxdb.spool import InfluxSpool
+
+
+def _points(value):
+    """Return a batch of points with a value."""
+    return [{"measurement": "fake", "fields": {"value": value}}]
+
+
+def test_spool_replay_after_restart(tmpdir):
+    """Test batches are read in order, also after a restart."""
+    spool = InfluxSpool(str(tmpdir), 1024 * 1024)
+    assert spool.peek() is None
+
+    spool.append(_points(1))
+    spool.append(_points(2))
+    assert spool.peek() == _points(1)
+    spool.pop()
+    spool.append(_points(3))
+    spool.close()
+
+    # Batches that were not written yet are replayed from the start
+    spool = InfluxSpool(str(tmpdir), 1024 * 1024)
+    spool.append(_points(4))
+    values = []
+    while spool.peek() is not None:
+        values.append(spool.peek()[0]["fields"]["value"])
+        spool.pop()
+    assert values == [1, 2, 3, 4]
+
+    # The segments are removed once all batches are read
+    assert spool.size == 0
+    assert os.listdir(tmpdir) == []
+
+
+def test_spool_max_size(tmpdir):
+    """Test the oldest segments are removed when the spool is full."""
+    spool = InfluxSpool(str(tmpdir), 16 * 1024)
+    for value in range(500):
+        spool.append(_points(value))
+
+    assert spool.size <= 16 * 1024
+    oldest = spool.peek()[0]["fields"]["value"]
+    assert oldest > 0
+    assert spool.lag >= 0
+
+    values = []
+    while spool.peek() is not None:
+        values.append(spool.peek()[0]["fields"]["value"])
+        spool.pop()
+    assert values == list(range(oldest, 500))
+
+
+def test_spool_truncated_segment(tmpdir):
+    """Test a batch cut off by a crash is skipped."""
+    spool = InfluxSpool(str(tmpdir), 1024 * 1024)
+    spool.append(_points(1))
+    spool.close()
+    (segment,) = os.listdir(tmpdir)
+    with open(os.path.join(tmpdir, segment), "ab") as segment_file:
+        segment_file.write(b'{"time": 1, "poi')
+
+    spool = InfluxSpool(str(tmpdir), 1024 * 1024)
+    assert spool.peek() == _points(1)
+    spool.pop()
+    assert spool.peek() is None
+    assert os.listdir(tmpdir) == []
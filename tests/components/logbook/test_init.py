@@ -19,6 +19,7 @@ from homeassistant.const import (
     ATTR_FRIENDLY_NAME,
     ATTR_NAME,
     ATTR_SERVICE,
+    ATTR_SERVICE_DATA,
     CONF_DOMAINS,
     CONF_ENTITIES,
     CONF_EXCLUDE,
@@ -287,6 +288,8 @@ def create_state_changed_event_from_old_new(
             "entity_id"
             "domain"
             "attributes"
+            "shared_attrs"
+            "attributes_hash"
             "state_id",
             "old_state_id",
         ],
@@ -295,6 +298,8 @@ def create_state_changed_event_from_old_new(
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
     row.attributes = attributes_json
+    row.shared_attrs = None
+    row.attributes_hash = None
     row.time_fired = event_time_fired
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
@@ -1289,6 +1294,62 @@ async def test_logbook_entity_matches_only(hass, hass_client):
     assert json_dict[1]["context_user_id"] == "9400facee45711eaa9308bfd3d19e474"
 
 
+async def test_logbook_entity_matches_only_service_call_context(hass, hass_client):
+    """Test entity_matches_only keeps the service call that changed the entity."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    hass.states.async_set("switch.test_state", STATE_ON)
+    await hass.async_block_till_done()
+
+    switch_turn_off_context = ha.Context(
+        id="9c5bd62de45711eaaeb351041eec8dd9",
+        user_id="9400facee45711eaa9308bfd3d19e474",
+    )
+    hass.bus.async_fire(
+        EVENT_CALL_SERVICE,
+        {
+            ATTR_DOMAIN: "switch",
+            ATTR_SERVICE: "turn_off",
+            ATTR_SERVICE_DATA: {ATTR_ENTITY_ID: ["switch.test_state"]},
+        },
+        context=switch_turn_off_context,
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set(
+        "switch.test_state", STATE_OFF, context=switch_turn_off_context
+    )
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+
+    # Today time 00:00:00
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+
+    end_time = start + timedelta(hours=24)
+    response = await client.get(
+        f"/api/logbook/{start_date.isoformat()}?end_time={end_time}&entity=switch.test_state&entity_matches_only"
+    )
+    assert response.status == 200
+    json_dict = await response.json()
+
+    assert len(json_dict) == 1
+    assert json_dict[0]["entity_id"] == "switch.test_state"
+    assert json_dict[0]["context_event_type"] == "call_service"
+    assert json_dict[0]["context_domain"] == "switch"
+    assert json_dict[0]["context_service"] == "turn_off"
+    assert json_dict[0]["context_user_id"] == "9400facee45711eaa9308bfd3d19e474"
+
+
 async def test_logbook_entity_matches_only_multiple(hass, hass_client):
     """Test the logbook view with a multiple entities and entity_matches_only."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -1801,6 +1862,108 @@ async def test_empty_config(hass, hass_client):
     _assert_entry(entries[1], name="blu", entity_id=entity_id)
 
 
+async def test_event_stream(hass, hass_ws_client):
+    """Test the logbook event stream serves buffered and live entries."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    hass.states.async_set("switch.test", STATE_OFF)
+    hass.states.async_set("switch.test", STATE_ON)
+    hass.states.async_set("switch.other", STATE_OFF)
+    hass.states.async_set("switch.other", STATE_ON)
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client()
+    start_time = dt_util.utcnow() - timedelta(hours=1)
+    with patch.object(logbook, "_get_events", return_value=[]) as mock_get_events:
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "logbook/event_stream",
+                "start_time": start_time.isoformat(),
+                "entity_ids": ["switch.test"],
+            }
+        )
+        msg = await client.receive_json()
+        assert msg["id"] == 1
+        assert msg["success"]
+
+        msg = await client.receive_json()
+
+    # Only the period before the buffer comes from the database
+    assert mock_get_events.call_args[0][1] == start_time
+    assert (
+        mock_get_events.call_args[0][2]
+        == hass.data[logbook.DATA_LIVE_LOGBOOK].covered_since
+    )
+    assert msg["id"] == 1
+    assert msg["type"] == "event"
+    entries = msg["event"]["events"]
+    assert len(entries) == 1
+    _assert_entry(entries[0], name="test", entity_id="switch.test")
+    assert entries[0]["state"] == STATE_ON
+
+    hass.states.async_set("switch.other", STATE_OFF)
+    hass.states.async_set("switch.test", STATE_OFF)
+    msg = await client.receive_json()
+    entries = msg["event"]["events"]
+    assert len(entries) == 1
+    _assert_entry(entries[0], name="test", entity_id="switch.test")
+    assert entries[0]["state"] == STATE_OFF
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    msg = await client.receive_json()
+    assert msg["id"] == 2
+    assert msg["success"]
+
+
+async def test_event_stream_from_database(hass, hass_ws_client):
+    """Test the logbook event stream reads entries dropped from the buffer."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    with patch.object(logbook, "LIVE_BUFFER_SIZE", 1):
+        await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    hass.states.async_set("switch.test", STATE_OFF)
+    hass.states.async_set("switch.test", STATE_ON)
+    hass.states.async_set("switch.test", STATE_OFF)
+    await _async_commit_and_wait(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": (dt_util.utcnow() - timedelta(hours=1)).isoformat(),
+        }
+    )
+    msg = await client.receive_json()
+    assert msg["success"]
+
+    msg = await client.receive_json()
+    entries = msg["event"]["events"]
+    assert [entry["state"] for entry in entries] == [STATE_ON, STATE_OFF]
+
+    hass.states.async_set("switch.test", STATE_ON)
+    msg = await client.receive_json()
+    assert [entry["state"] for entry in msg["event"]["events"]] == [STATE_ON]
+
+
+async def test_event_stream_invalid_start_time(hass, hass_ws_client):
+    """Test the logbook event stream with an invalid start_time."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    client = await hass_ws_client()
+
+    await client.send_json(
+        {"id": 1, "type": "logbook/event_stream", "start_time": "invalid"}
+    )
+    msg = await client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == "invalid_start_time"
+
+
 async def _async_fetch_logbook(client):
 
     # Today time 00:00:00
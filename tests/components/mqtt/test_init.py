@@ -575,6 +575,42 @@ async def test_subscribe_special_characters(hass, mqtt_mock, calls, record_calls
     assert calls[0][0].payload == payload
 
 
+def test_subscription_trie():
+    """Test matching and removing subscriptions in the subscription trie."""
+    trie = mqtt.SubscriptionTrie()
+    subscriptions = [
+        mqtt.Subscription(topic, MagicMock())
+        for topic in ("a/b/c", "a/+/c", "a/#", "#", "+/b/c", "$SYS/#", "a/b/c")
+    ]
+    for subscription in subscriptions:
+        trie.add(subscription)
+
+    assert len(trie) == 7
+    assert trie.matches("a/b/c") == [
+        subscriptions[0],
+        subscriptions[1],
+        subscriptions[2],
+        subscriptions[3],
+        subscriptions[4],
+        subscriptions[6],
+    ]
+    assert trie.matches("a") == [subscriptions[2], subscriptions[3]]
+    assert trie.matches("$SYS/broker") == [subscriptions[5]]
+    assert trie.matches("b/c") == [subscriptions[3]]
+
+    trie.remove(subscriptions[0])
+    assert subscriptions[0] not in trie
+    assert trie.has_topic("a/b/c")
+    trie.remove(subscriptions[6])
+    assert not trie.has_topic("a/b/c")
+    assert trie.matches("a/b/c") == [
+        subscriptions[1],
+        subscriptions[2],
+        subscriptions[3],
+        subscriptions[4],
+    ]
+
+
 async def test_subscribe_same_topic(hass, mqtt_client_mock, mqtt_mock):
     """
     Test subscring to same topic twice and simulate retained messages.
@@ -364,3 +364,49 @@ async def test_filtered_denylist(hass, mock_client):
         was_called = mock_client.labels.call_count == 1
         assert test.should_pass == was_called
         mock_client.labels.reset_mock()
+
+
+async def test_view_collect_on_scrape(hass, hass_client):
+    """Test gauges are built from the states when the metrics are scraped."""
+    config = {prometheus.DOMAIN: {"namespace": "scrape", "collect_on_scrape": True}}
+    assert await async_setup_component(hass, prometheus.DOMAIN, config)
+    hass.states.async_set(
+        "sensor.outside", "15.6", {"unit_of_measurement": "°C", "friendly_name": "Out"}
+    )
+    await hass.async_block_till_done()
+    client = await hass_client()
+
+    resp = await client.get(prometheus.API_ENDPOINT)
+    assert resp.status == 200
+    body = (await resp.text()).split("\n")
+    assert (
+        'scrape_sensor_unit_c{domain="sensor",'
+        'entity="sensor.outside",'
+        'friendly_name="Out"} 15.6' in body
+    )
+    assert (
+        'scrape_state_change_total{domain="sensor",'
+        'entity="sensor.outside",'
+        'friendly_name="Out"} 1.0' in body
+    )
+
+    hass.states.async_set(
+        "sensor.outside", "17.0", {"unit_of_measurement": "°C", "friendly_name": "Out"}
+    )
+    hass.states.async_remove("sensor.outside")
+    hass.states.async_set("binary_sensor.door", "on")
+    await hass.async_block_till_done()
+
+    resp = await client.get(prometheus.API_ENDPOINT)
+    body = (await resp.text()).split("\n")
+    assert not [line for line in body if line.startswith("scrape_sensor_unit_c{")]
+    assert (
+        'scrape_binary_sensor_state{domain="binary_sensor",'
+        'entity="binary_sensor.door",'
+        'friendly_name="None"} 1.0' in body
+    )
+    assert (
+        'scrape_state_change_total{domain="sensor",'
+        'entity="sensor.outside",'
+        'friendly_name="Out"} 2.0' in body
+    )
@@ -14,7 +14,12 @@ from homeassistant.components.recorder import (
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import MATCH_ALL, STATE_LOCKED, STATE_UNLOCKED
 from homeassistant.core import Context, callback
@@ -325,6 +330,9 @@ def test_recorder_setup_failure():
             entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
             exclude_t=[],
             db_integrity_check=False,
+            bulk_insert=False,
+            incremental_vacuum=False,
+            short_term_statistics=False,
         )
         rec.start()
         rec.join()
@@ -432,6 +440,97 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_shares_state_attributes(hass_recorder):
+    """Test states with identical attributes share one state_attributes row."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {"friendly_name": "One"})
+    hass.states.set("test.one", "off", {"friendly_name": "One"})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "on", {"friendly_name": "One"})
+    hass.states.set("test.two", "on", {"friendly_name": "Two"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 4
+        assert all(state.attributes is None for state in states)
+        assert states[0].attributes_id == states[1].attributes_id
+        assert states[0].attributes_id == states[2].attributes_id
+        assert states[0].attributes_id != states[3].attributes_id
+        assert states[2].to_native().attributes == {"friendly_name": "One"}
+        assert states[3].to_native().attributes == {"friendly_name": "Two"}
+        assert session.query(StateAttributes).count() == 2
+
+
+def test_saving_bulk_insert(hass_recorder):
+    """Test saving states and events with bulk inserts."""
+    hass = hass_recorder({"bulk_insert": True})
+
+    hass.states.set("test.one", "on", {"friendly_name": "One"})
+    hass.states.set("test.two", "on", {})
+    hass.bus.fire("test_event", {"some": "data"})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", {"friendly_name": "One"})
+    hass.states.set("test.two", "off", {})
+    hass.states.remove("test.two")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 5
+
+        assert [state.entity_id for state in states] == [
+            "test.one",
+            "test.two",
+            "test.one",
+            "test.two",
+            "test.two",
+        ]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id is None
+        assert states[2].old_state_id == states[0].state_id
+        assert states[3].old_state_id == states[1].state_id
+        assert states[4].old_state_id == states[3].state_id
+        assert states[4].state is None
+        assert states[0].attributes_id == states[2].attributes_id
+        assert states[2].to_native().attributes == {"friendly_name": "One"}
+        assert session.query(StateAttributes).count() == 2
+
+        for state in states:
+            assert state.event.event_type == "state_changed"
+
+        db_event = session.query(Events).filter_by(event_type="test_event").one()
+        assert db_event.to_native().data == {"some": "data"}
+
+
+def test_saving_bulk_insert_with_exception(hass_recorder, caplog):
+    """Test bulk inserts are retried after a database error."""
+    hass = hass_recorder({"bulk_insert": True})
+
+    instance = hass.data[DATA_INSTANCE]
+    flush_bulk_inserts = instance._flush_bulk_inserts
+    failures = 1
+
+    def _fail_once():
+        nonlocal failures
+        if failures:
+            failures -= 1
+            raise OperationalError("insert the state", "fake params", "forced to fail")
+        flush_bulk_inserts()
+
+    with patch("time.sleep"), patch.object(
+        instance, "_flush_bulk_inserts", side_effect=_fail_once
+    ):
+        hass.states.set("test.one", "on", {})
+        wait_recording_done(hass)
+
+    assert "Error executing query" in caplog.text
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 1
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
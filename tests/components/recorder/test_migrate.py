@@ -3,7 +3,7 @@
 from unittest.mock import Mock, PropertyMock, call, patch
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select
 from sqlalchemy.exc import InternalError, OperationalError, ProgrammingError
 from sqlalchemy.pool import StaticPool
 
@@ -107,3 +107,51 @@ def test_forgiving_add_index_with_other_db_types(caplog, exception_type):
 
     assert "already exists on states" in caplog.text
     assert "continuing" in caplog.text
+
+
+def test_backfill_events_entity_id():
+    """Test the entity_id of existing events is filled in from their data."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    events = models.Events.__table__
+    engine.execute(
+        events.insert(),
+        [
+            {"event_type": "call_service", "event_data": '{"domain": "light"}'},
+            {
+                "event_type": "logbook_entry",
+                "event_data": '{"entity_id": "light.kitchen", "name": "Kitchen"}',
+            },
+            {
+                "event_type": "state_changed",
+                "event_data": '{"entity_id": "light.kitchen"}',
+            },
+            {"event_type": "custom", "event_data": '{"entity_id": "invalid'},
+            {"event_type": "custom", "event_data": '{"entity_id": "switch.ac"}'},
+            {
+                "event_type": "call_service",
+                "event_data": '{"domain": "light", "service_data": '
+                '{"entity_id": ["light.kitchen"]}}',
+            },
+            {
+                "event_type": "call_service",
+                "event_data": '{"domain": "light", "service_data": '
+                '{"entity_id": ["light.kitchen", "light.hall"]}}',
+            },
+        ],
+    )
+
+    with patch.object(migration, "BACKFILL_BATCH_SIZE", 2):
+        migration._backfill_events_entity_id(engine)
+
+    assert engine.execute(
+        select([events.c.event_type, events.c.entity_id]).order_by(events.c.event_id)
+    ).fetchall() == [
+        ("call_service", None),
+        ("logbook_entry", "light.kitchen"),
+        ("state_changed", None),
+        ("custom", None),
+        ("custom", "switch.ac"),
+        ("call_service", "light.kitchen"),
+        ("call_service", None),
+    ]
@@ -11,6 +11,7 @@ from homeassistant.components.recorder.models import (
     Events,
     RecorderRuns,
     States,
+    decode_shared_attrs,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
@@ -216,3 +217,13 @@ async def test_event_to_db_model():
     native = Events.from_event(event, event_data="{}").to_native()
     event.data = {}
     assert native == event
+
+
+def test_decode_shared_attrs():
+    """Test decoded shared attributes are cached but not shared."""
+    attributes = decode_shared_attrs("test_decode_shared_attrs", '{"brightness": 100}')
+    assert attributes == {"brightness": 100}
+    attributes["brightness"] = 50
+
+    # The cache is hit even when the json differs
+    assert decode_shared_attrs("test_decode_shared_attrs", "{}") == {"brightness": 100}
@@ -4,8 +4,15 @@ import json
 from unittest.mock import patch
 
 from homeassistant.components import recorder
+from homeassistant.components.recorder import purge
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    States,
+    Statistics,
+    StatisticsShortTerm,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
@@ -19,7 +26,9 @@ def test_purge_old_states(hass, hass_recorder):
     _add_test_states(hass)
 
     # make sure we start with 6 states
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass) as session, patch(
+        "homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2
+    ):
         states = session.query(States)
         assert states.count() == 6
 
@@ -42,7 +51,9 @@ def test_purge_old_events(hass, hass_recorder):
     hass = hass_recorder()
     _add_test_events(hass)
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass) as session, patch(
+        "homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2
+    ):
         events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
         assert events.count() == 6
 
@@ -77,6 +88,82 @@ def test_purge_old_recorder_runs(hass, hass_recorder):
         assert recorder_runs.count() == 1
 
 
+def test_purge_old_short_term_statistics(hass, hass_recorder):
+    """Test deleting old short term statistics keeps the long term ones."""
+    hass = hass_recorder()
+    wait_recording_done(hass)
+    now = dt_util.utcnow()
+    with session_scope(hass=hass) as session:
+        for days in (0, 5, 10):
+            start = now - timedelta(days=days)
+            for table in (Statistics, StatisticsShortTerm):
+                session.add(
+                    table(entity_id="sensor.test", start=start, mean=1.0, sum=1.0)
+                )
+
+    with session_scope(hass=hass) as session:
+        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
+        assert finished
+        assert session.query(StatisticsShortTerm).count() == 1
+        assert session.query(Statistics).count() == 3
+
+
+def test_purge_old_states_in_one_batch(hass, hass_recorder):
+    """Test purging finishes at once when the batch holds all old rows."""
+    hass = hass_recorder()
+    _add_test_states(hass)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        last_state = states.filter(States.state == "dontpurgeme").order_by(
+            States.state_id.desc()
+        )[0]
+        last_state.old_state_id = states.filter(States.state == "purgeme")[0].state_id
+
+    with session_scope(hass=hass) as session:
+        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
+        assert finished
+
+        states = session.query(States)
+        assert states.count() == 2
+        assert [state.old_state_id for state in states] == [None, None]
+
+
+def test_purge_incremental_vacuum(hass, hass_recorder):
+    """Test incremental vacuum frees pages instead of a full vacuum."""
+    hass = hass_recorder({"incremental_vacuum": True})
+    instance = hass.data[DATA_INSTANCE]
+    _add_test_states(hass)
+
+    assert instance.engine.execute("PRAGMA auto_vacuum").scalar() == 2
+
+    # Leave a few hundred free pages behind
+    instance.engine.execute("CREATE TABLE filler (data BLOB)")
+    for _ in range(200):
+        instance.engine.execute("INSERT INTO filler VALUES (zeroblob(4000))")
+    instance.engine.execute("DROP TABLE filler")
+    assert instance.engine.execute("PRAGMA freelist_count").scalar() > 100
+
+    with patch("homeassistant.components.recorder.purge._LOGGER") as mock_logger, patch(
+        "homeassistant.components.recorder.purge.INCREMENTAL_VACUUM_PAGES", 50
+    ), patch(
+        "homeassistant.components.recorder.purge._purge_unused_attributes",
+        wraps=purge._purge_unused_attributes,
+    ) as purge_unused_attributes:
+        hass.services.call("recorder", "purge", {"keep_days": 4, "repack": True})
+        hass.block_till_done()
+        # Each vacuum step is queued after the previous one
+        for _ in range(10):
+            instance.block_till_done()
+
+    messages = [call[1][0] for call in mock_logger.debug.mock_calls]
+    assert "Vacuuming SQL DB to free space" not in messages
+    assert messages.count("Incremental vacuum done, %s free pages left") > 1
+    assert instance.engine.execute("PRAGMA freelist_count").scalar() == 0
+    # The rows are not purged again for each vacuum step
+    assert purge_unused_attributes.call_count == 1
+
+
 def test_purge_method(hass, hass_recorder):
     """Test purge method."""
     hass = hass_recorder()
@@ -138,7 +225,7 @@ def test_purge_method(hass, hass_recorder):
             hass.data[DATA_INSTANCE].block_till_done()
             wait_recording_done(hass)
             assert (
-                mock_logger.debug.mock_calls[5][1][0]
+                mock_logger.debug.mock_calls[6][1][0]
                 == "Vacuuming SQL DB to free space"
             )
 
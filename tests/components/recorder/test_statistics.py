@@ -0,0 +1,153 @@
+"""Test long term statistics compiling."""
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder import statistics
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import (
+    States,
+    Statistics,
+    StatisticsShortTerm,
+)
+from homeassistant.components.recorder.statistics import (
+    compile_missing_statistics,
+    compile_statistics,
+    period_start,
+    statistics_during_period,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.util import dt as dt_util
+
+from .common import wait_recording_done
+
+START = dt_util.utc_from_timestamp(
+    dt_util.as_timestamp(dt_util.utcnow()) // 3600 * 3600
+)
+
+
+def _add_states(hass, entity_id, samples):
+    """Add states with a given last_updated."""
+    wait_recording_done(hass)
+    with session_scope(hass=hass) as session:
+        for timestamp, state in samples:
+            session.add(
+                States(
+                    entity_id=entity_id,
+                    domain=entity_id.split(".")[0],
+                    state=state,
+                    attributes="{}",
+                    last_changed=timestamp,
+                    last_updated=timestamp,
+                    created=timestamp,
+                )
+            )
+
+
+def test_period_start():
+    """Test the start of a period is aligned to the table duration."""
+    now = dt_util.parse_datetime("2021-03-01 12:34:56+00:00")
+    assert period_start(now, Statistics) == dt_util.parse_datetime(
+        "2021-03-01 12:00:00+00:00"
+    )
+    assert period_start(now, StatisticsShortTerm) == dt_util.parse_datetime(
+        "2021-03-01 12:30:00+00:00"
+    )
+
+
+def test_compile_statistics(hass_recorder):
+    """Test compiling the time weighted statistics of a period."""
+    hass = hass_recorder()
+    start = START - timedelta(hours=2)
+    _add_states(
+        hass,
+        "sensor.temperature",
+        [
+            (start - timedelta(minutes=30), "10"),
+            (start + timedelta(minutes=15), "20"),
+            (start + timedelta(minutes=30), "unavailable"),
+            (start + timedelta(minutes=45), "30"),
+        ],
+    )
+    _add_states(hass, "sensor.text", [(start + timedelta(minutes=5), "on")])
+    _add_states(hass, "light.kitchen", [(start + timedelta(minutes=5), "1")])
+
+    compile_statistics(hass.data[DATA_INSTANCE], Statistics, start)
+
+    stats = statistics_during_period(hass, start)
+    assert list(stats) == ["sensor.temperature"]
+    assert stats["sensor.temperature"] == [
+        {
+            "entity_id": "sensor.temperature",
+            "start": start.isoformat(),
+            "mean": pytest.approx(20.0),
+            "min": 10.0,
+            "max": 30.0,
+            "sum": 50.0,
+        }
+    ]
+    assert statistics_during_period(hass, start, period="5minute") == {}
+
+
+def test_compile_missing_statistics(hass_recorder):
+    """Test every closed period is compiled once."""
+    hass = hass_recorder({"short_term_statistics": True})
+    instance = hass.data[DATA_INSTANCE]
+    start = START - timedelta(hours=3)
+    _add_states(hass, "sensor.power", [(start, "100")])
+    compile_statistics(instance, Statistics, start)
+
+    compile_missing_statistics(instance, START)
+    compile_missing_statistics(instance, START + timedelta(minutes=5))
+
+    hourly = statistics_during_period(hass, start)["sensor.power"]
+    assert [stat["start"] for stat in hourly] == [
+        start.isoformat(),
+        (start + timedelta(hours=1)).isoformat(),
+        (start + timedelta(hours=2)).isoformat(),
+    ]
+    assert [stat["mean"] for stat in hourly] == [100.0, 100.0, 100.0]
+    assert [stat["sum"] for stat in hourly] == [100.0, 0.0, 0.0]
+
+    short_term = statistics_during_period(hass, START, period="5minute")
+    assert [stat["start"] for stat in short_term["sensor.power"]] == [START.isoformat()]
+
+
+def test_compile_statistics_unchanged_for_days(hass_recorder):
+    """Test the initial state of a period can be older than a day."""
+    hass = hass_recorder()
+    start = START - timedelta(hours=1)
+    _add_states(hass, "sensor.power", [(start - timedelta(days=3), "100")])
+
+    compile_statistics(hass.data[DATA_INSTANCE], Statistics, start)
+
+    stats = statistics_during_period(hass, start)["sensor.power"]
+    assert [stat["mean"] for stat in stats] == [100.0]
+
+
+def test_compile_missing_statistics_error(hass_recorder, caplog):
+    """Test a period that fails to compile is logged and skipped."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    start = START - timedelta(hours=2)
+    _add_states(hass, "sensor.power", [(start - timedelta(minutes=30), "100")])
+    compile_statistics(instance, Statistics, start - timedelta(hours=1))
+    instance.statistics_compiled_until.clear()
+    failing_start = start
+
+    def compile_or_fail(instance, table, start):
+        if start == failing_start:
+            raise ValueError("Broken period")
+        compile_statistics(instance, table, start)
+
+    with patch.object(statistics, "compile_statistics", compile_or_fail):
+        compile_missing_statistics(instance, START)
+
+    assert f"Error compiling statistics for {failing_start}" in caplog.text
+    assert "Broken period" in caplog.text
+    assert instance.statistics_compiled_until[Statistics] == START
+    stats = statistics_during_period(hass, start)["sensor.power"]
+    assert [stat["start"] for stat in stats] == [
+        (start + timedelta(hours=1)).isoformat()
+    ]
@@ -1,6 +1,7 @@
 """The test for the statistics sensor platform."""
 from datetime import datetime, timedelta
 from os import path
+import random
 import statistics
 import unittest
 from unittest.mock import patch
@@ -9,7 +10,11 @@ import pytest
 
 from homeassistant import config as hass_config
 from homeassistant.components import recorder
-from homeassistant.components.statistics.sensor import DOMAIN, StatisticsSensor
+from homeassistant.components.statistics.sensor import (
+    DOMAIN,
+    StatisticsSensor,
+    StatisticsWindow,
+)
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
     SERVICE_RELOAD,
@@ -498,5 +503,33 @@ async def test_reload(hass):
     assert hass.states.get("sensor.cputest")
 
 
+def test_statistics_window():
+    """Test the running statistics match the ones calculated from scratch."""
+    rand = random.Random(0)
+    window = StatisticsWindow()
+    values = []
+
+    for _ in range(500):
+        value = round(rand.uniform(-50, 50), 1)
+        window.add(value)
+        values.append(value)
+        if len(values) > 25:
+            window.remove(values.pop(0))
+
+        assert len(window) == len(values)
+        assert window.min == min(values)
+        assert window.max == max(values)
+        assert window.median == statistics.median(values)
+        assert window.total == pytest.approx(sum(values))
+        assert window.mean == pytest.approx(statistics.mean(values))
+        if len(values) > 1:
+            assert window.variance == pytest.approx(statistics.variance(values))
+
+    while values:
+        window.remove(values.pop(0))
+    assert len(window) == 0
+    assert window.total == 0
+
+
 def _get_fixtures_base_path():
     return path.dirname(path.dirname(path.dirname(__file__)))
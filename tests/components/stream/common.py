@@ -90,3 +90,45 @@ def generate_h264_video(container_format="mp4", audio_codec=None):
     output.seek(0)
 
     return output
+
+
+def _box(box_type, payload):
+    """Return an mp4 box."""
+    return (len(payload) + 8).to_bytes(4, byteorder="big") + box_type + payload
+
+
+def _full_box(box_type, version, payload):
+    """Return an mp4 full box."""
+    return _box(box_type, bytes([version, 0, 0, 0]) + payload)
+
+
+def generate_fmp4_segment(sequence, decode_times, timescales=(90000, 8000)):
+    """Generate a fragmented mp4 segment with an empty sample per track."""
+    traks = b"".join(
+        _box(
+            b"trak",
+            _full_box(b"tkhd", 0, bytes(8) + track_id.to_bytes(4, "big") + bytes(68))
+            + _box(
+                b"mdia",
+                _full_box(
+                    b"mdhd", 0, bytes(8) + timescale.to_bytes(4, "big") + bytes(8)
+                ),
+            ),
+        )
+        for track_id, timescale in enumerate(timescales, start=1)
+    )
+    trafs = b"".join(
+        _box(
+            b"traf",
+            _full_box(b"tfhd", 0, track_id.to_bytes(4, "big"))
+            + _full_box(b"tfdt", 1, decode_time.to_bytes(8, "big")),
+        )
+        for track_id, decode_time in enumerate(decode_times, start=1)
+    )
+    return io.BytesIO(
+        _box(b"ftyp", b"iso5" + bytes(4))
+        + _box(b"moov", traks)
+        + _box(b"moof", _full_box(b"mfhd", 0, sequence.to_bytes(4, "big")) + trafs)
+        + _box(b"mdat", bytes(16))
+        + _box(b"mfra", bytes(8))
+    )
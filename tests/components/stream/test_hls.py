@@ -1,4 +1,5 @@
 """The tests for hls streams."""
+import asyncio
 from datetime import timedelta
 from unittest.mock import patch
 from urllib.parse import urlparse
@@ -6,12 +7,13 @@ from urllib.parse import urlparse
 import av
 
 from homeassistant.components.stream import create_stream
+from homeassistant.components.stream.core import Part, Segment
 from homeassistant.const import HTTP_NOT_FOUND
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
 
 from tests.common import async_fire_time_changed
-from tests.components.stream.common import generate_h264_video
+from tests.components.stream.common import generate_fmp4_segment, generate_h264_video
 
 
 async def test_hls_stream(hass, hass_client, stream_worker_sync):
@@ -176,3 +178,66 @@ async def test_stream_keepalive(hass):
 
     # Stop stream, if it hasn't quit already
     stream.stop()
+
+
+async def test_ll_hls_playlist(hass, hass_client):
+    """Test the playlist lists the parts of segments and blocks for new parts."""
+    await async_setup_component(hass, "stream", {"stream": {}})
+    stream = create_stream(hass, "rtsp://example.local")
+    track = stream.add_provider("hls")
+    url = urlparse(stream.endpoint_url("hls")).path
+    playlist_url = url.replace("master_playlist", "playlist")
+    segment_url = "/".join(url.split("/")[:-1]) + "/segment"
+    http_client = await hass_client()
+
+    track.put(
+        Segment(
+            1,
+            generate_fmp4_segment(1, (0, 0)),
+            2,
+            [Part(1, True, b"part_1_0"), Part(1, False, b"part_1_1")],
+        )
+    )
+    track.put_part(2, Part(0.5, True, b"part_2_0"))
+    await hass.async_block_till_done()
+
+    with patch("homeassistant.components.stream.threading.Thread"):
+        playlist_response = await http_client.get(playlist_url)
+        assert playlist_response.status == 200
+        playlist = (await playlist_response.text()).splitlines()
+        assert playlist[-6:] == [
+            '#EXT-X-PART:DURATION=1.000,URI="./segment/1.0.m4s",INDEPENDENT=YES',
+            '#EXT-X-PART:DURATION=1.000,URI="./segment/1.1.m4s"',
+            "#EXTINF:2.0000,",
+            "./segment/1.m4s",
+            '#EXT-X-PART:DURATION=0.500,URI="./segment/2.0.m4s",INDEPENDENT=YES',
+            '#EXT-X-PRELOAD-HINT:TYPE=PART,URI="./segment/2.1.m4s"',
+        ]
+
+        part_response = await http_client.get(f"{segment_url}/1.1.m4s")
+        assert await part_response.read() == b"part_1_1"
+        part_response = await http_client.get(f"{segment_url}/2.0.m4s")
+        assert await part_response.read() == b"part_2_0"
+
+        # Blocking playlist reload and preload hint wait for the next part
+        playlist_request = hass.async_create_task(
+            http_client.get(f"{playlist_url}?_HLS_msn=2&_HLS_part=1")
+        )
+        part_request = hass.async_create_task(http_client.get(f"{segment_url}/2.1.m4s"))
+        await asyncio.sleep(0.1)
+        assert not playlist_request.done()
+        assert not part_request.done()
+
+        track.put_part(2, Part(0.5, False, b"part_2_1"))
+        playlist_response = await playlist_request
+        assert playlist_response.status == 200
+        assert (await playlist_response.text()).splitlines()[-1] == (
+            '#EXT-X-PRELOAD-HINT:TYPE=PART,URI="./segment/2.2.m4s"'
+        )
+        part_response = await part_request
+        assert await part_response.read() == b"part_2_1"
+
+        playlist_response = await http_client.get(f"{playlist_url}?_HLS_msn=4")
+        assert playlist_response.status == 400
+
+    stream.stop()
@@ -0,0 +1,146 @@
+"""The tests for the stream lookback buffer."""
+import asyncio
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.stream import create_stream
+from homeassistant.components.stream.const import ATTR_LOOKBACK, DOMAIN, OUTPUT_LOOKBACK
+from homeassistant.components.stream.core import Segment
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.setup import async_setup_component
+
+SEGMENT_SIZE = 400 * 1024
+
+
+@pytest.fixture(name="lookback_path")
+async def lookback_path_fixture(hass, tmpdir):
+    """Set up stream with a lookback buffer of 1 MB."""
+    assert await async_setup_component(
+        hass,
+        "stream",
+        {
+            "stream": {
+                "lookback_buffer_size": 1,
+                "lookback_buffer_path": str(tmpdir),
+            }
+        },
+    )
+    return hass.data[DOMAIN][ATTR_LOOKBACK].path
+
+
+async def _async_put(hass, output, sequence, duration=1.5):
+    """Put a segment from a worker thread and wait until it is stored."""
+    data = bytes([sequence]) * SEGMENT_SIZE
+    await hass.async_add_executor_job(
+        output.put, Segment(sequence, io.BytesIO(data), duration)
+    )
+    await hass.async_block_till_done()
+
+
+async def test_lookback_buffer(hass, lookback_path):
+    """Test segments are kept on disk up to the buffer size."""
+    stream = create_stream(hass, "rtsp://example.local")
+    output = stream.add_provider(OUTPUT_LOOKBACK)
+
+    for sequence in (1, 2, 3):
+        await _async_put(hass, output, sequence)
+
+    assert output.segments == [2, 3]
+    (stream_path,) = os.listdir(lookback_path)
+    assert sorted(os.listdir(os.path.join(lookback_path, stream_path))) == [
+        "2.m4s",
+        "3.m4s",
+    ]
+
+    segments = await output.async_open_segments(2)
+    assert [segment.sequence for segment in segments] == [2, 3]
+    assert segments[1].segment.read() == bytes([3]) * SEGMENT_SIZE
+    for segment in segments:
+        segment.segment.close()
+
+    # A restarted worker starts over with a new sequence
+    await _async_put(hass, output, 1)
+    assert output.segments == [1]
+
+    stream.remove_provider(output)
+    await hass.async_block_till_done()
+    assert os.listdir(lookback_path) == []
+
+
+async def test_lookback_buffer_keepalive(hass, lookback_path):
+    """Test only streams that are kept alive have a lookback buffer."""
+    stream = create_stream(hass, "rtsp://example.local")
+
+    with patch("homeassistant.components.stream.threading.Thread"):
+        stream.start()
+        assert OUTPUT_LOOKBACK not in stream.outputs
+
+        stream.keepalive = True
+        stream.start()
+        assert OUTPUT_LOOKBACK in stream.outputs
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    assert not os.path.exists(lookback_path)
+
+
+async def test_lookback_buffer_not_a_viewer(hass, lookback_path):
+    """Test the access token expires while the lookback buffer is fed."""
+    stream = create_stream(hass, "rtsp://example.local")
+    stream.keepalive = True
+    hls = stream.add_provider("hls")
+    lookback = stream.add_provider(OUTPUT_LOOKBACK)
+    stream.endpoint_url("hls")
+    assert stream.access_token
+
+    lookback._idle_timer.start()
+    hls._idle_timer.fire()
+    assert stream.access_token is None
+
+    lookback._idle_timer.clear()
+    stream.remove_provider(lookback)
+    stream.remove_provider(hls)
+    await hass.async_block_till_done()
+
+
+async def test_lookback_buffer_disabled(hass):
+    """Test there is no lookback buffer by default."""
+    assert await async_setup_component(hass, "stream", {"stream": {}})
+    stream = create_stream(hass, "rtsp://example.local")
+    stream.keepalive = True
+
+    with patch("homeassistant.components.stream.threading.Thread"):
+        stream.start()
+
+    assert ATTR_LOOKBACK not in hass.data[DOMAIN]
+    assert OUTPUT_LOOKBACK not in stream.outputs
+
+
+async def test_record_lookback_from_disk(hass, lookback_path):
+    """Test a recording starts with the segments of the lookback buffer."""
+    stream = create_stream(hass, "rtsp://example.local")
+    stream.keepalive = True
+
+    with patch("homeassistant.components.stream.threading.Thread"):
+        stream.start()
+        output = stream.outputs[OUTPUT_LOOKBACK]
+        await _async_put(hass, output, 1)
+
+        with patch.object(hass.config, "is_allowed_path", return_value=True):
+            record = asyncio.ensure_future(
+                stream.async_record("/example/path", lookback=3)
+            )
+            await asyncio.sleep(0)
+            assert not record.done()
+
+            # The recording waits for the segment in progress
+            await _async_put(hass, output, 2)
+            await record
+
+    recorder = stream.outputs["recorder"]
+    assert recorder.segments == [1, 2]
+    for segment in recorder.get_segment():
+        segment.segment.close()
@@ -10,13 +10,18 @@ import pytest
 
 from homeassistant.components.stream import create_stream
 from homeassistant.components.stream.core import Segment
+from homeassistant.components.stream.fmp4utils import (
+    get_decode_times,
+    get_init,
+    get_m4s,
+)
 from homeassistant.components.stream.recorder import recorder_save_worker
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
 
 from tests.common import async_fire_time_changed
-from tests.components.stream.common import generate_h264_video
+from tests.components.stream.common import generate_fmp4_segment, generate_h264_video
 
 TEST_TIMEOUT = 10
 
@@ -168,16 +173,26 @@ async def test_record_path_not_allowed(hass, hass_client):
 
 
 async def test_recorder_save(tmpdir):
-    """Test recorder save."""
+    """Test recorder save joins the fragments of the segments."""
     # Setup
-    source = generate_h264_video()
+    first = generate_fmp4_segment(1, (900000, 80000))
+    second = generate_fmp4_segment(2, (1080000, 96000))
     filename = f"{tmpdir}/test.mp4"
 
     # Run
-    recorder_save_worker(filename, [Segment(1, source, 4)], "mp4")
+    recorder_save_worker(filename, [Segment(1, first, 2), Segment(2, second, 2)])
 
     # Assert
     assert os.path.exists(filename)
+    with open(filename, "rb") as output:
+        data = output.read()
+    assert data.startswith(get_init(first))
+    assert data.count(b"moof") == 2
+    assert b"mfra" not in data
+    fragments = data[len(get_init(first)) :]
+    assert get_decode_times(fragments) == {1: 0, 2: 0}
+    second_fragment = fragments[len(get_m4s(first, 1)) :]
+    assert get_decode_times(second_fragment) == {1: 180000, 2: 16000}
 
 
 async def test_record_stream_audio(
@@ -17,7 +17,7 @@ import fractions
 import io
 import math
 import threading
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import av
 
@@ -27,7 +27,15 @@ from homeassistant.components.stream.const import (
     MIN_SEGMENT_DURATION,
     PACKETS_TO_WAIT_FOR_AUDIO,
 )
-from homeassistant.components.stream.worker import stream_worker
+from homeassistant.components.stream.core import Part, StreamBuffer
+from homeassistant.components.stream.worker import (
+    KeyFrame,
+    close_buffer,
+    flush_part,
+    stream_worker,
+)
+
+from tests.components.stream.common import generate_h264_video
 
 STREAM_SOURCE = "some-stream-source"
 # Formats here are arbitrary, not exercised by tests
@@ -95,6 +103,9 @@ class PacketSequence:
             stream = VIDEO_STREAM
             is_keyframe = True
 
+            def __bytes__(self):
+                return b""
+
         return FakePacket()
 
 
@@ -545,3 +556,48 @@ async def test_update_stream_source(hass):
 
         # Ccleanup
         stream.stop()
+
+
+def test_keyframe_to_jpeg():
+    """Test a video keyframe is converted to a JPEG image."""
+    container = av.open(generate_h264_video())
+    video_stream = container.streams.video[0]
+    packet = next(
+        packet for packet in container.demux(video_stream) if packet.is_keyframe
+    )
+    keyframe = KeyFrame(packet, video_stream)
+    container.close()
+
+    image = keyframe.to_jpeg()
+    assert image.startswith(b"\xff\xd8")
+    assert keyframe.to_jpeg() is image
+
+
+def test_flush_parts():
+    """Test fragments written to a segment are handed over as parts."""
+    init = b"\x00\x00\x00\x0cftypiso5"
+    fragment = b"\x00\x00\x00\x08moof\x00\x00\x00\x08mdat"
+    segment = io.BytesIO()
+    buffer = StreamBuffer(segment, Mock(), None)
+
+    # The first mux writes the init section
+    segment.write(init)
+    assert flush_part(buffer, 0) is None
+    buffer.part_time = 0
+    buffer.part_keyframe = True
+
+    assert flush_part(buffer, 0.5) is None
+
+    # A fragment is written once a packet exceeds the fragment duration
+    segment.write(fragment)
+    part = flush_part(buffer, 1)
+    assert part == Part(1, True, fragment)
+    assert buffer.part_time is None
+    buffer.part_time = 1
+
+    # Closing writes the last fragment and the mfra box
+    buffer.output.close.side_effect = lambda: segment.write(
+        fragment + b"\x00\x00\x00\x08mfra"
+    )
+    close_buffer(buffer, 1.5)
+    assert buffer.parts == [part, Part(0.5, False, fragment)]
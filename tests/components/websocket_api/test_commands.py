@@ -507,6 +507,176 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["event_type"] == "state_changed"
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
+    hass_admin_user.mock_policy({"entities": {"entity_ids": {"light.other": True}}})
+
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.other", "on")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"]["data"]["entity_id"] == "light.other"
+
+
+async def test_subscribe_state_changed_shares_listener(hass, websocket_client):
+    """Test state_changed subscriptions share one listener and filter entities."""
+    listeners = hass.bus.async_listeners().get("state_changed", 0)
+
+    await websocket_client.send_json(
+        {"id": 5, "type": "subscribe_events", "event_type": "state_changed"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    await websocket_client.send_json(
+        {
+            "id": 6,
+            "type": "subscribe_events",
+            "event_type": "state_changed",
+            "entity_id": ["light.kitchen"],
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    assert hass.bus.async_listeners()["state_changed"] == listeners + 1
+
+    hass.states.async_set("light.living_room", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["event"]["data"]["entity_id"] == "light.living_room"
+
+    hass.states.async_set("light.kitchen", "on")
+    msgs = [await websocket_client.receive_json() for _ in range(2)]
+    assert sorted(msg["id"] for msg in msgs) == [5, 6]
+    assert msgs[0]["event"] == msgs[1]["event"]
+
+    for iden, subscription in ((7, 5), (8, 6)):
+        await websocket_client.send_json(
+            {"id": iden, "type": "unsubscribe_events", "subscription": subscription}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+
+    assert hass.bus.async_listeners().get("state_changed", 0) == listeners
+
+
+async def test_subscribe_entities(hass, websocket_client, hass_admin_user):
+    """Test subscribe_entities sends compact states and diffs."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy(
+        {"entities": {"entity_ids": {"light.permitted": True, "light.other": True}}}
+    )
+    hass.states.async_set("light.permitted", "off", {"color": "red", "size": 1})
+    hass.states.async_set("light.not_permitted", "off")
+    state = hass.states.get("light.permitted")
+
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.permitted", "light.not_permitted", "light.other"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "s": "off",
+                "a": {"color": "red", "size": 1},
+                "c": state.context.id,
+                "lc": state.last_changed.timestamp(),
+            }
+        }
+    }
+
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set("light.unrelated", "on")
+    hass.states.async_set("light.permitted", "off", {"color": "blue"})
+    state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "lu": state.last_updated.timestamp(),
+                    "c": state.context.id,
+                    "a": {"color": "blue"},
+                },
+                "-": {"a": ["size"]},
+            }
+        }
+    }
+
+    hass.states.async_set("light.other", "on")
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.other"]
+    assert msg["event"]["a"]["light.other"]["s"] == "on"
+
+    hass.states.async_remove("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["success"]
+
+
+async def test_subscribe_state_changed_duplicate_entity_ids(hass, websocket_client):
+    """Test a state_changed subscription can repeat an entity_id."""
+    listeners = hass.bus.async_listeners().get("state_changed", 0)
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_events",
+            "event_type": "state_changed",
+            "entity_id": ["light.kitchen", "light.kitchen"],
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    hass.states.async_set("light.kitchen", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["event"]["data"]["entity_id"] == "light.kitchen"
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "unsubscribe_events", "subscription": 5}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    assert hass.bus.async_listeners().get("state_changed", 0) == listeners
+
+
+async def test_subscribe_events_entity_id_requires_state_changed(
+    hass, websocket_client
+):
+    """Test entity_id is only accepted for state_changed subscriptions."""
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_events",
+            "event_type": "test_event",
+            "entity_id": "light.kitchen",
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_INVALID_FORMAT
+
 
 async def test_render_template_renders_template(hass, websocket_client):
     """Test simple template is rendered and updated."""
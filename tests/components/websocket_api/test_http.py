@@ -1,5 +1,6 @@
 """Test Websocket API http module."""
 from datetime import timedelta
+import json
 from unittest.mock import patch
 
 from aiohttp import WSMsgType
@@ -80,3 +81,58 @@ async def test_non_json_message(hass, websocket_client, caplog):
         f"Unable to serialize to JSON. Bad data found at $.result[0](state: test_domain.entity).attributes.bad={bad_data}(<class 'object'>"
         in caplog.text
     )
+
+
+async def test_coalesce_messages(hass, websocket_client):
+    """Test ready messages are sent as one frame when coalescing is enabled."""
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["success"]
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+
+    msgs = await websocket_client.receive_json()
+    assert [msg["event"]["data"]["idx"] for msg in msgs] == [0, 1, 2]
+
+    await websocket_client.send_json({"id": 7, "type": "ping"})
+    msg = await websocket_client.receive_json()
+    assert msg == {"id": 7, "type": "pong"}
+
+
+async def test_connection_stats(hass, websocket_client, hass_admin_user):
+    """Test the write statistics of the connected clients."""
+    await websocket_client.send_json({"id": 5, "type": "connection_stats"})
+    payload = await websocket_client.receive_str()
+    msg = json.loads(payload)
+    assert msg["id"] == 5
+    assert msg["success"]
+    assert len(msg["result"]) == 1
+    stats = msg["result"][0]
+    assert stats["user_id"] == hass_admin_user.id
+    # The auth required and auth ok messages
+    assert stats["messages_sent"] == 2
+    assert stats["max_queue_size"] >= 1
+
+    await websocket_client.send_json({"id": 6, "type": "connection_stats"})
+    msg = await websocket_client.receive_json()
+    assert msg["result"][0]["messages_sent"] == 3
+    assert msg["result"][0]["bytes_sent"] == stats["bytes_sent"] + len(payload.encode())
+
+    await websocket_client.close()
+    await hass.async_block_till_done()
+    assert hass.data[const.DATA_CONNECTION_STATS] == {}
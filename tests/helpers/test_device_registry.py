@@ -359,6 +359,26 @@ async def test_removing_area_id(registry):
     assert entry_w_area != entry_wo_area
 
 
+async def test_entries_for_area(registry):
+    """Test the area lookup follows device changes."""
+    entry = registry.async_get_or_create(
+        config_entry_id="123",
+        connections={(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+        identifiers={("bridgeid", "0123")},
+    )
+    assert device_registry.async_entries_for_area(registry, "12345A") == []
+
+    entry = registry.async_update_device(entry.id, area_id="12345A")
+    assert device_registry.async_entries_for_area(registry, "12345A") == [entry]
+
+    entry = registry.async_update_device(entry.id, area_id="12345B")
+    assert device_registry.async_entries_for_area(registry, "12345A") == []
+    assert device_registry.async_entries_for_area(registry, "12345B") == [entry]
+
+    registry.async_remove_device(entry.id)
+    assert device_registry.async_entries_for_area(registry, "12345B") == []
+
+
 async def test_deleted_device_removing_area_id(registry):
     """Make sure we can clear area id of deleted device."""
     entry = registry.async_get_or_create(
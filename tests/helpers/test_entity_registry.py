@@ -815,3 +815,44 @@ async def test_disabled_entities_excluded_from_entity_list(hass, registry):
         registry, device_entry.id, include_disabled_entities=True
     )
     assert entries == [entry1, entry2]
+
+
+async def test_entries_indexes_follow_updates(hass, registry):
+    """Test the device, area and config entry lookups follow entry changes."""
+    config_entry = MockConfigEntry(domain="light")
+    entry = registry.async_get_or_create(
+        "light",
+        "hue",
+        "5678",
+        config_entry=config_entry,
+        device_id="mock-dev-id",
+    )
+    other = registry.async_get_or_create("light", "hue", "1234")
+
+    assert entity_registry.async_entries_for_device(registry, "mock-dev-id") == [entry]
+    assert entity_registry.async_entries_for_config_entry(
+        registry, config_entry.entry_id
+    ) == [entry]
+    assert entity_registry.async_entries_for_area(registry, "kitchen") == []
+
+    entry = registry.async_update_entity(
+        entry.entity_id, area_id="kitchen", new_entity_id="light.kitchen"
+    )
+    other = registry.async_update_entity(other.entity_id, area_id="kitchen")
+    assert entity_registry.async_entries_for_area(registry, "kitchen") == [
+        entry,
+        other,
+    ]
+    assert entity_registry.async_entries_for_device(registry, "mock-dev-id") == [entry]
+
+    registry.async_clear_area_id("kitchen")
+    assert entity_registry.async_entries_for_area(registry, "kitchen") == []
+    assert registry.async_get("light.kitchen").area_id is None
+
+    registry.async_clear_config_entry(config_entry.entry_id)
+    assert entity_registry.async_entries_for_device(registry, "mock-dev-id") == []
+    assert (
+        entity_registry.async_entries_for_config_entry(registry, config_entry.entry_id)
+        == []
+    )
+    assert registry.async_is_registered(other.entity_id)
@@ -0,0 +1,112 @@
+"""Tests for the poll scheduler."""
+import asyncio
+from datetime import timedelta
+import threading
+import time
+
+from homeassistant.helpers import polling
+from homeassistant.util import dt as dt_util
+
+from tests.common import async_fire_time_changed
+
+
+async def test_next_poll(hass):
+    """Test polls are spread over the interval at a stable offset."""
+    scheduler = polling.async_get_poll_scheduler(hass)
+    assert polling.async_get_poll_scheduler(hass) is scheduler
+
+    interval = timedelta(seconds=30)
+    keys = [f"sensor.platform_{index}" for index in range(20)]
+    offsets = {scheduler.poll_offset(key, interval) for key in keys}
+    assert len(offsets) > 1
+    assert all(0 <= offset < 30 for offset in offsets)
+    assert scheduler.poll_offset(keys[0], interval) == scheduler.poll_offset(
+        keys[0], interval
+    )
+
+    now = dt_util.utcnow()
+    for key in keys:
+        point = scheduler.next_poll(key, interval, now)
+        assert now < point <= now + interval
+        assert scheduler.next_poll(key, interval, point) == point + interval
+
+        # A refresh less than half an interval before the offset skips it
+        last_poll = point - interval / 4
+        assert (
+            scheduler.next_poll(key, interval, last_poll, last_poll) == point + interval
+        )
+        last_poll = point - interval * 3 / 4
+        assert scheduler.next_poll(key, interval, last_poll, last_poll) == point
+
+    assert scheduler.next_poll(keys[0], timedelta(0), now) == now
+
+
+async def test_track_poll(hass):
+    """Test tracking polls and their statistics."""
+    scheduler = polling.async_get_poll_scheduler(hass)
+    interval = timedelta(seconds=10)
+    calls = []
+
+    async def poll(now):
+        calls.append(now)
+
+    remove = scheduler.async_track_poll("light.test", poll, interval)
+
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + interval)
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    async_fire_time_changed(hass, now + interval * 2)
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+    stats = scheduler.statistics["light.test"]
+    assert stats.polls == 2
+    assert stats.overruns == 0
+    assert stats.max_duration >= stats.last_duration
+    assert stats.average_duration == stats.total_duration / 2
+
+    remove()
+    async_fire_time_changed(hass, now + interval * 3)
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+
+async def test_run_poll_overrun(hass, caplog):
+    """Test polls that take longer than the interval are counted."""
+    scheduler = polling.async_get_poll_scheduler(hass)
+
+    async def poll():
+        await asyncio.sleep(0.01)
+
+    await scheduler.async_run_poll("test", timedelta(seconds=0.001), poll)
+    await scheduler.async_run_poll("test", None, poll)
+
+    stats = scheduler.statistics["test"]
+    assert stats.polls == 2
+    assert stats.overruns == 1
+    assert "Poll of test took" in caplog.text
+
+
+async def test_executor_update_budget(hass, monkeypatch):
+    """Test blocking updates are limited to the executor budget."""
+    monkeypatch.setattr(polling, "MAX_EXECUTOR_UPDATES", 2)
+    scheduler = polling.PollScheduler(hass)
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def update():
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    await asyncio.gather(
+        *(scheduler.async_add_executor_update(update) for _ in range(6))
+    )
+    assert max_running == 2
@@ -1,4 +1,5 @@
 """Test service helpers."""
+import asyncio
 from collections import OrderedDict
 from copy import deepcopy
 import unittest
@@ -29,6 +30,7 @@ from homeassistant.setup import async_setup_component
 
 from tests.common import (
     MockEntity,
+    MockEntityPlatform,
     get_test_home_assistant,
     mock_device_registry,
     mock_registry,
@@ -468,6 +470,139 @@ async def test_call_with_sync_attr(hass, mock_entities):
     assert mock_method.mock_calls[0][2] == {}
 
 
+async def test_call_few_entities_of_large_platform(hass, caplog):
+    """Test targeting fewer entities than a platform has keeps its order."""
+    platform = MockEntityPlatform(hass, domain="light")
+    entities = [
+        MockEntity(entity_id=f"light.light_{idx}", should_poll=False)
+        for idx in range(6)
+    ]
+    await platform.async_add_entities(entities)
+    test_service_mock = AsyncMock(return_value=None)
+
+    await service.entity_service_call(
+        hass,
+        [platform],
+        test_service_mock,
+        ha.ServiceCall(
+            "light",
+            "turn_on",
+            {"entity_id": ["light.light_4", "light.missing", "light.light_1"]},
+        ),
+    )
+
+    assert [call[1][0] for call in test_service_mock.mock_calls] == [
+        entities[1],
+        entities[4],
+    ]
+    assert "Unable to find referenced entities light.missing" in caplog.text
+
+
+async def test_call_with_batch_handler(hass):
+    """Test a platform handles the entities of a call at once."""
+    platform = MockEntityPlatform(hass, domain="light")
+    entities = [
+        MockEntity(entity_id=f"light.{name}", should_poll=False)
+        for name in ("kitchen", "bedroom", "bathroom")
+    ]
+    await platform.async_add_entities(entities)
+
+    async def batch_handler(batch, data):
+        """Handle all entities except the bathroom."""
+        assert data == {"brightness": 100}
+        return [entity for entity in batch if entity.entity_id == "light.bathroom"]
+
+    batch_handler_mock = AsyncMock(side_effect=batch_handler)
+    platform.async_register_batch_service_handler("turn_on", batch_handler_mock)
+    test_service_mock = AsyncMock(return_value=None)
+    context = ha.Context()
+
+    await service.entity_service_call(
+        hass,
+        [platform],
+        test_service_mock,
+        ha.ServiceCall(
+            "light",
+            "turn_on",
+            {"entity_id": ["light.kitchen", "light.bathroom"], "brightness": 100},
+            context,
+        ),
+    )
+
+    assert batch_handler_mock.call_count == 1
+    assert {entity.entity_id for entity in batch_handler_mock.mock_calls[0][1][0]} == {
+        "light.kitchen",
+        "light.bathroom",
+    }
+    assert entities[0]._context is context
+    assert test_service_mock.call_count == 1
+    assert test_service_mock.mock_calls[0][1][0] is entities[2]
+
+    # Other services are called for each entity
+    await service.entity_service_call(
+        hass,
+        [platform],
+        test_service_mock,
+        ha.ServiceCall("light", "turn_off", {"entity_id": ["light.kitchen"]}),
+    )
+    assert batch_handler_mock.call_count == 1
+    assert test_service_mock.call_count == 2
+
+
+async def test_call_with_batch_handler_parallel_updates(hass):
+    """Test a batch handler takes a slot of the parallel updates."""
+    platform = MockEntityPlatform(hass, domain="light")
+    entity = MockEntity(entity_id="light.kitchen", should_poll=False)
+    await platform.async_add_entities([entity])
+    parallel_updates = asyncio.Semaphore(1)
+    entity.parallel_updates = parallel_updates
+
+    async def batch_handler(batch, data):
+        """Check the semaphore is held."""
+        assert parallel_updates.locked()
+
+    batch_handler_mock = AsyncMock(side_effect=batch_handler)
+    platform.async_register_batch_service_handler("turn_on", batch_handler_mock)
+
+    await service.entity_service_call(
+        hass,
+        [platform],
+        AsyncMock(return_value=None),
+        ha.ServiceCall("light", "turn_on", {"entity_id": ["light.kitchen"]}),
+    )
+
+    assert batch_handler_mock.call_count == 1
+    assert not parallel_updates.locked()
+
+
+async def test_call_with_failing_batch_handler(hass):
+    """Test a failing batch handler does not stop the other entities."""
+    batch_platform = MockEntityPlatform(hass, domain="light", platform_name="batch")
+    batch_entity = MockEntity(entity_id="light.kitchen", should_poll=False)
+    await batch_platform.async_add_entities([batch_entity])
+    other_platform = MockEntityPlatform(hass, domain="light", platform_name="other")
+    other_entity = MockEntity(entity_id="light.bedroom", should_poll=False)
+    await other_platform.async_add_entities([other_entity])
+
+    batch_handler_mock = AsyncMock(side_effect=exceptions.HomeAssistantError("Failed"))
+    batch_platform.async_register_batch_service_handler("turn_on", batch_handler_mock)
+    test_service_mock = AsyncMock(return_value=None)
+
+    with pytest.raises(exceptions.HomeAssistantError):
+        await service.entity_service_call(
+            hass,
+            [batch_platform, other_platform],
+            test_service_mock,
+            ha.ServiceCall(
+                "light", "turn_on", {"entity_id": ["light.kitchen", "light.bedroom"]}
+            ),
+        )
+
+    assert batch_handler_mock.call_count == 1
+    assert test_service_mock.call_count == 1
+    assert test_service_mock.mock_calls[0][1][0] is other_entity
+
+
 async def test_call_context_user_not_exist(hass):
     """Check we don't allow deleted users to do things."""
     with pytest.raises(exceptions.UnknownUser) as err:
@@ -9,12 +9,20 @@ import aiohttp
 import pytest
 import requests
 
+from homeassistant import config_entries
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import CoreState
 from homeassistant.helpers import update_coordinator
+from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
-from tests.common import async_fire_time_changed
+from tests.common import (
+    MockConfigEntry,
+    MockModule,
+    async_fire_time_changed,
+    mock_entity_platform,
+    mock_integration,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -160,7 +168,7 @@ async def test_refresh_no_update_method(crd):
 async def test_update_interval(hass, crd):
     """Test update interval works."""
     # Test we don't update without subscriber
-    async_fire_time_changed(hass, utcnow() + crd.update_interval)
+    async_fire_time_changed(hass, utcnow() + crd.update_interval * 2)
     await hass.async_block_till_done()
     assert crd.data is None
 
@@ -169,24 +177,65 @@ async def test_update_interval(hass, crd):
     crd.async_add_listener(update_callback)
 
     # Test twice we update with subscriber
-    async_fire_time_changed(hass, utcnow() + crd.update_interval)
+    async_fire_time_changed(hass, utcnow() + crd.update_interval * 2)
     await hass.async_block_till_done()
     assert crd.data == 1
 
-    async_fire_time_changed(hass, utcnow() + crd.update_interval)
+    async_fire_time_changed(hass, utcnow() + crd.update_interval * 2)
     await hass.async_block_till_done()
     assert crd.data == 2
 
     # Test removing listener
     crd.async_remove_listener(update_callback)
 
-    async_fire_time_changed(hass, utcnow() + crd.update_interval)
+    async_fire_time_changed(hass, utcnow() + crd.update_interval * 2)
     await hass.async_block_till_done()
 
     # Test we stop updating after we lose last subscriber
     assert crd.data == 2
 
 
+async def test_update_interval_after_refresh(hass, crd):
+    """Test a refresh is not followed by another one right away."""
+    crd.async_add_listener(Mock())
+
+    await crd.async_refresh()
+    assert crd.data == 1
+
+    async_fire_time_changed(hass, utcnow() + crd.update_interval * 0.49)
+    await hass.async_block_till_done()
+    assert crd.data == 1
+
+    async_fire_time_changed(hass, utcnow() + crd.update_interval * 2)
+    await hass.async_block_till_done()
+    assert crd.data == 2
+
+
+async def test_poll_key_per_config_entry(hass):
+    """Test coordinators of config entries are told apart by their entry."""
+    coordinators = []
+
+    async def async_setup_entry(hass, entry):
+        """Set up a coordinator for a config entry."""
+        coordinators.append(get_crd(hass, DEFAULT_UPDATE_INTERVAL))
+        return True
+
+    mock_integration(hass, MockModule("comp", async_setup_entry=async_setup_entry))
+    mock_entity_platform(hass, "config_flow.comp", None)
+    entries = [MockConfigEntry(domain="comp") for _ in range(2)]
+    for entry in entries:
+        entry.add_to_hass(hass)
+
+    with patch.dict(config_entries.HANDLERS, {"comp": config_entries.ConfigFlow}):
+        assert await async_setup_component(hass, "comp", {})
+        await hass.async_block_till_done()
+
+    assert sorted(crd.poll_key for crd in coordinators) == sorted(
+        f"test.{entry.entry_id}" for entry in entries
+    )
+    assert get_crd(hass, DEFAULT_UPDATE_INTERVAL).poll_key == "test"
+
+
 async def test_update_interval_not_present(hass, crd_without_update_interval):
     """Test update never happens with no update interval."""
     crd = crd_without_update_interval
@@ -297,7 +346,7 @@ async def test_stop_refresh_on_ha_stop(hass, crd):
     update_interval = crd.update_interval
 
     # Test we update with subscriber
-    async_fire_time_changed(hass, utcnow() + update_interval)
+    async_fire_time_changed(hass, utcnow() + update_interval * 2)
     await hass.async_block_till_done()
     assert crd.data == 1
 
@@ -307,6 +356,6 @@ async def test_stop_refresh_on_ha_stop(hass, crd):
     await hass.async_block_till_done()
 
     # Make sure no update with subscriber after stop event
-    async_fire_time_changed(hass, utcnow() + update_interval)
+    async_fire_time_changed(hass, utcnow() + update_interval * 2)
     await hass.async_block_till_done()
     assert crd.data == 1
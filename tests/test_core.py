@@ -495,6 +495,51 @@ async def test_eventbus_coroutine_event_listener(hass):
     assert len(coroutine_calls) == 1
 
 
+async def test_eventbus_filtered_listener(hass):
+    """Test listeners with an event data filter."""
+    calls = []
+    all_calls = []
+
+    @ha.callback
+    def listener(event):
+        calls.append(event)
+
+    @ha.callback
+    def all_listener(event):
+        all_calls.append(event)
+
+    unsub = hass.bus.async_listen(
+        "test_event", listener, {"device_id": "abc", "command": "on"}
+    )
+    unsub_all = hass.bus.async_listen(MATCH_ALL, all_listener, {"device_id": "abc"})
+    assert hass.bus.async_listeners()["test_event"] == 1
+
+    hass.bus.async_fire("test_event", {"device_id": "abc", "command": "off"})
+    hass.bus.async_fire("test_event", {"device_id": "def", "command": "on"})
+    hass.bus.async_fire("test_event", {"command": "on"})
+    hass.bus.async_fire("test_event", {"device_id": ["abc"], "command": "on"})
+    hass.bus.async_fire("test_event", {"device_id": "abc", "command": "on", "x": 1})
+    hass.bus.async_fire("other_event", {"device_id": "abc", "command": "on"})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert calls[0].data["x"] == 1
+    assert [event.event_type for event in all_calls] == [
+        "test_event",
+        "test_event",
+        "other_event",
+    ]
+
+    unsub()
+    unsub_all()
+    assert "test_event" not in hass.bus.async_listeners()
+
+    hass.bus.async_fire("test_event", {"device_id": "abc", "command": "on"})
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+    assert len(all_calls) == 3
+
+
 def test_state_init():
     """Test state.init."""
     with pytest.raises(InvalidEntityFormatError):
@@ -1451,6 +1496,36 @@ async def test_async_entity_ids_count(hass):
     assert hass.states.async_entity_ids_count("light") == 3
 
 
+async def test_domain_filter_after_update_and_remove(hass):
+    """Test domain filters follow updates and removals in a stable order."""
+
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.link", "on")
+    hass.states.async_set("light.frog", "on")
+
+    hass.states.async_set("light.bowl", "off")
+    assert hass.states.async_entity_ids("light") == ["light.bowl", "light.frog"]
+    assert hass.states.async_all("LIGHT")[0].state == "off"
+    assert hass.states.async_entity_ids(("switch", "light")) == [
+        "switch.link",
+        "light.bowl",
+        "light.frog",
+    ]
+    assert hass.states.async_entity_ids_count(["light", "switch"]) == 3
+    assert hass.states.async_entity_ids(["light", "light"]) == [
+        "light.bowl",
+        "light.frog",
+    ]
+    assert len(hass.states.async_all(["light", "switch", "light"])) == 3
+    assert hass.states.async_entity_ids_count(["switch", "switch"]) == 1
+
+    hass.states.async_remove("light.bowl")
+    hass.states.async_remove("switch.link")
+    assert hass.states.async_entity_ids("light") == ["light.frog"]
+    assert hass.states.async_all("switch") == []
+    assert hass.states.async_entity_ids_count("switch") == 0
+
+
 async def test_hassjob_forbid_coroutine():
     """Test hassjob forbids coroutines."""
 